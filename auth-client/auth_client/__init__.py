@@ -0,0 +1,24 @@
+from auth_client.exceptions import (
+    HeaderNotProvidedError,
+    KeySetUnavailableError,
+    TokenDecodeError,
+    TokenExpiredError,
+    TokenRevokedError,
+    TokenVerificationError,
+)
+from auth_client.keys import KeySetCache
+from auth_client.revocations import RevocationList
+from auth_client.verifier import AccessTokenPayload, TokenVerifier
+
+__all__ = [
+    "AccessTokenPayload",
+    "HeaderNotProvidedError",
+    "KeySetCache",
+    "KeySetUnavailableError",
+    "RevocationList",
+    "TokenDecodeError",
+    "TokenExpiredError",
+    "TokenRevokedError",
+    "TokenVerificationError",
+    "TokenVerifier",
+]
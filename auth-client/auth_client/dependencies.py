@@ -0,0 +1,41 @@
+"""FastAPI integration; needs the ``fastapi`` extra."""
+from fastapi.security import APIKeyHeader
+from starlette import status
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from auth_client.exceptions import HeaderNotProvidedError, TokenVerificationError
+from auth_client.verifier import AccessTokenPayload, TokenVerifier
+
+ACCESS_TOKEN_HEADER = "X-Access-Token"
+
+
+class AccessTokenHeader(APIKeyHeader):
+    """Dependency returning the verified payload of the access token header.
+
+    The local counterpart of the service's ``get_user_by_access_token`` for routes that only need to
+    know who is calling. Role checks and user details still need the service: tokens carry only the
+    user uuid (``sub``) and the expiry.
+
+        verifier = TokenVerifier.from_url("http://auth:8000")
+        app.add_exception_handler(TokenVerificationError, token_verification_error_handler)
+
+        @app.get("/orders")
+        async def orders(token: AccessTokenPayload = Depends(AccessTokenHeader(verifier))): ...
+    """
+
+    def __init__(self, verifier: TokenVerifier, name: str = ACCESS_TOKEN_HEADER) -> None:
+        super().__init__(name=name, scheme_name=name)
+        self._verifier = verifier
+
+    async def __call__(self, request: Request) -> AccessTokenPayload:  # type: ignore[override]
+        access_token = request.headers.get(self.model.name)
+        if not access_token:
+            raise HeaderNotProvidedError(header=self.model.name)
+
+        return await self._verifier.decode_access_token(access_token)
+
+
+async def token_verification_error_handler(_: Request, exc: TokenVerificationError) -> JSONResponse:
+    """Answers rejected tokens with the status and body the auth service uses."""
+    return JSONResponse(status_code=status.HTTP_401_UNAUTHORIZED, content={"error": exc.message})
@@ -0,0 +1,34 @@
+import typing
+
+
+class TokenVerificationError(Exception):
+    """The token was not accepted; ``message`` is the error body the auth service returns for it."""
+
+    message: str
+
+    def __str__(self) -> str:
+        return self.message
+
+
+class TokenExpiredError(TokenVerificationError):
+    message = "Token is expired"
+
+
+class TokenRevokedError(TokenVerificationError):
+    """The user signed out, or was deactivated or deleted, after the token was issued."""
+
+    message = "Token is revoked"
+
+
+class TokenDecodeError(TokenVerificationError):
+    def __init__(self, error: typing.Any) -> None:
+        self.message = f"Token decode error: {error}"
+
+
+class HeaderNotProvidedError(TokenVerificationError):
+    def __init__(self, header: str) -> None:
+        self.message = f"Header {header} is not provided"
+
+
+class KeySetUnavailableError(Exception):
+    """The key set could not be fetched and no earlier copy is cached."""
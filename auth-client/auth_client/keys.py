@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import time
+import typing
+
+import httpx
+
+from auth_client.exceptions import KeySetUnavailableError
+
+logger = logging.getLogger(__name__)
+
+Jwk = dict[str, typing.Any]
+
+
+class KeySetCache:
+    """Public keys of the auth service by ``kid``, fetched from its ``/api/v1/auth/jwks`` endpoint.
+
+    The set is refetched once it is ``max_age_seconds`` old, and early when a token names a key that is
+    not in it, which is how a key rotation shows up. Early refetches are at most one per
+    ``min_refresh_interval_seconds``, so tokens with made-up key ids cannot turn into a request each.
+    Concurrent callers share one fetch. When a fetch fails the cached keys stay in use.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str,
+        http_client: httpx.AsyncClient | None = None,
+        max_age_seconds: float = 300.0,
+        min_refresh_interval_seconds: float = 10.0,
+    ) -> None:
+        self._jwks_url = jwks_url
+        self._http_client = http_client or httpx.AsyncClient(timeout=5.0)
+        self._max_age_seconds = max_age_seconds
+        self._min_refresh_interval_seconds = min_refresh_interval_seconds
+
+        self._keys: dict[str, Jwk] = {}
+        self._checked_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def get_key(self, kid: str | None) -> Jwk | None:
+        """The key with ``kid``, or all keys as a JWK set for tokens without ``kid``."""
+        await self._refresh(min_age_seconds=self._max_age_seconds)
+
+        if kid is None:
+            return {"keys": list(self._keys.values())} if self._keys else None
+
+        if kid not in self._keys:
+            await self._refresh(min_age_seconds=self._min_refresh_interval_seconds)
+
+        return self._keys.get(kid)
+
+    async def _refresh(self, min_age_seconds: float) -> None:
+        if not self._is_older_than(min_age_seconds):
+            return
+
+        async with self._lock:
+            # Another caller may have refreshed while this one waited for the lock
+            if not self._is_older_than(min_age_seconds):
+                return
+
+            try:
+                response = await self._http_client.get(self._jwks_url)
+                response.raise_for_status()
+                keys = {key["kid"]: key for key in response.json()["keys"]}
+
+            except (httpx.HTTPError, KeyError, ValueError) as e:
+                if not self._keys:
+                    raise KeySetUnavailableError(str(e)) from e
+
+                logger.warning("Key set refresh failed, keeping the cached keys: %s", e)
+                # Retry after the short interval instead of on every request
+                self._checked_at = time.monotonic() - self._max_age_seconds + self._min_refresh_interval_seconds
+                return
+
+            self._keys = keys
+            self._checked_at = time.monotonic()
+
+    def _is_older_than(self, seconds: float) -> bool:
+        return self._checked_at is None or time.monotonic() - self._checked_at >= seconds
+
+    async def close(self) -> None:
+        await self._http_client.aclose()
@@ -0,0 +1,117 @@
+import asyncio
+import json
+import logging
+import time
+import typing
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_EVENTS_PATH = "/api/v1/auth/revocation-events"
+ACCESS_TOKEN_HEADER = "X-Access-Token"
+# The first stream offset: the service then replays every event it still keeps
+FIRST_EVENT_ID = "0-0"
+
+
+class RevocationList:
+    """Users whose access tokens were revoked, kept current from the service's ``/api/v1/auth/revocation-events``.
+
+    A token is revoked when its ``sub`` has an event and it expires at or before the event's ``expires_at``,
+    that is when it was issued before the sign-out, deactivation or deletion. Entries are dropped once every
+    such token has expired. The stream needs an admin access token, taken from ``get_access_token`` on each
+    (re)connect. The first connection replays the events the stream keeps, which is one access token lifetime,
+    so tokens revoked before the start are rejected too. Dropped connections resume from the last event id.
+
+    Expiries are whole seconds and tokens carry no issue time, so a token issued in the same second as
+    the event that revoked its user's tokens is rejected as well.
+
+        revocations = RevocationList.from_url("http://auth:8000", get_access_token=get_service_token)
+        revocations.start()
+        verifier = TokenVerifier.from_url("http://auth:8000", revocations=revocations)
+    """
+
+    def __init__(
+        self,
+        events_url: str,
+        get_access_token: typing.Callable[[], typing.Awaitable[str]],
+        http_client: httpx.AsyncClient | None = None,
+        reconnect_delay_seconds: float = 1.0,
+    ) -> None:
+        self._events_url = events_url
+        self._get_access_token = get_access_token
+        # No read timeout: the service sends keep-alive comments, and a stuck connection is closed by the proxy
+        self._http_client = http_client or httpx.AsyncClient(timeout=httpx.Timeout(5.0, read=None))
+        self._reconnect_delay_seconds = reconnect_delay_seconds
+
+        self._revoked_until: dict[str, int] = {}
+        self._last_event_id: str | None = None
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def from_url(cls, base_url: str, **options: typing.Any) -> "RevocationList":
+        return cls(events_url=base_url.rstrip("/") + REVOCATION_EVENTS_PATH, **options)
+
+    @property
+    def last_event_id(self) -> str | None:
+        return self._last_event_id
+
+    def is_revoked(self, sub: str, exp: int) -> bool:
+        expires_at = self._revoked_until.get(sub)
+        return expires_at is not None and exp <= expires_at
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.follow())
+
+    async def follow(self) -> None:
+        """Follows the stream until cancelled, reconnecting after errors."""
+        while True:
+            try:
+                await self._follow_once()
+
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning("Revocation event stream interrupted: %s", e)
+
+            await asyncio.sleep(self._reconnect_delay_seconds)
+
+    async def _follow_once(self) -> None:
+        headers = {
+            ACCESS_TOKEN_HEADER: await self._get_access_token(),
+            "Accept": "text/event-stream",
+            "Last-Event-ID": self._last_event_id or FIRST_EVENT_ID,
+        }
+
+        async with self._http_client.stream("GET", self._events_url, headers=headers) as response:
+            response.raise_for_status()
+
+            event_id, data = None, []
+            async for line in response.aiter_lines():
+                if line:
+                    field, _, value = line.partition(":")
+                    if field == "id":
+                        event_id = value.strip()
+                    elif field == "data":
+                        data.append(value.strip())
+                    continue
+
+                # A blank line ends an event; comments (keep-alives) have neither field
+                if event_id is not None and data:
+                    self._apply(json.loads("\n".join(data)))
+                    self._last_event_id = event_id
+                event_id, data = None, []
+
+    def _apply(self, event: dict[str, typing.Any]) -> None:
+        now = int(time.time())
+        sub, expires_at = str(event["user_uuid"]), int(event["expires_at"])
+        self._revoked_until[sub] = max(expires_at, self._revoked_until.get(sub, 0))
+
+        self._revoked_until = {sub: until for sub, until in self._revoked_until.items() if until >= now}
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        await self._http_client.aclose()
@@ -0,0 +1,254 @@
+import asyncio
+import base64
+import json
+import time
+import typing
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import Depends, FastAPI
+from jose import jwt
+
+from auth_client import (
+    AccessTokenPayload,
+    KeySetCache,
+    RevocationList,
+    TokenDecodeError,
+    TokenExpiredError,
+    TokenRevokedError,
+    TokenVerificationError,
+    TokenVerifier,
+)
+from auth_client.dependencies import AccessTokenHeader, token_verification_error_handler
+
+JWKS_URL = "http://auth/api/v1/auth/jwks"
+REVOCATION_EVENTS_URL = "http://auth/api/v1/auth/revocation-events"
+
+
+class SigningKey:
+    def __init__(self, kid: str) -> None:
+        self.kid = kid
+        self._key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    def sign(self, sub: str = "user", expires_in: int = 60, kid: str | None = None) -> str:
+        private_key = self._key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        ).decode()
+        return jwt.encode(
+            {"sub": sub, "exp": int(time.time()) + expires_in},
+            private_key,
+            algorithm="RS256",
+            headers={"kid": kid or self.kid},
+        )
+
+    @property
+    def jwk(self) -> dict[str, str]:
+        public_numbers = self._key.public_key().public_numbers()
+        return {
+            "kty": "RSA",
+            "use": "sig",
+            "alg": "RS256",
+            "kid": self.kid,
+            "n": _encode_integer(public_numbers.n),
+            "e": _encode_integer(public_numbers.e),
+        }
+
+
+def _encode_integer(value: int) -> str:
+    return base64.urlsafe_b64encode(value.to_bytes((value.bit_length() + 7) // 8, "big")).rstrip(b"=").decode()
+
+
+class JwksServer:
+    def __init__(self, *keys: SigningKey) -> None:
+        self.keys = list(keys)
+        self.requests = 0
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        return httpx.Response(200, json={"keys": [key.jwk for key in self.keys]})
+
+    def get_verifier(self, **key_set_options: typing.Any) -> TokenVerifier:
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+        return TokenVerifier(key_set=KeySetCache(JWKS_URL, http_client=http_client, **key_set_options))
+
+
+@pytest.mark.asyncio
+async def test__token_verifier__success_and_errors_like_the_service() -> None:
+    signing_key = SigningKey(kid="first")
+    verifier = JwksServer(signing_key).get_verifier()
+
+    assert await verifier.decode_access_token(signing_key.sign(sub="user-uuid")) == AccessTokenPayload(
+        sub="user-uuid", exp=pytest.approx(int(time.time()) + 60, abs=2)
+    )
+
+    with pytest.raises(TokenExpiredError) as expired_error:
+        await verifier.decode_access_token(signing_key.sign(expires_in=-60))
+    with pytest.raises(TokenDecodeError) as decode_error:
+        await verifier.decode_access_token("not-a-token")
+
+    assert expired_error.value.message == "Token is expired"
+    assert decode_error.value.message == "Token decode error: Not enough segments"
+
+
+@pytest.mark.asyncio
+async def test__token_verifier__refetches_key_set_on_unknown_kid_once_per_interval() -> None:
+    first_key, second_key = SigningKey(kid="first"), SigningKey(kid="second")
+    jwks_server = JwksServer(first_key)
+    verifier = jwks_server.get_verifier(min_refresh_interval_seconds=0)
+
+    await verifier.decode_access_token(first_key.sign())
+    # Key rotation: the service signs with a key published after the cache was filled
+    jwks_server.keys.append(second_key)
+    await verifier.decode_access_token(second_key.sign())
+
+    assert jwks_server.requests == 2
+
+    throttled_jwks_server = JwksServer(first_key)
+    throttled_verifier = throttled_jwks_server.get_verifier(min_refresh_interval_seconds=60)
+    await throttled_verifier.decode_access_token(first_key.sign())
+    for _ in range(3):
+        with pytest.raises(TokenDecodeError):
+            await throttled_verifier.decode_access_token(first_key.sign(kid="made-up"))
+
+    assert throttled_jwks_server.requests == 1
+
+
+@pytest.mark.asyncio
+async def test__access_token_header__same_responses_as_the_service() -> None:
+    signing_key = SigningKey(kid="first")
+    access_token = AccessTokenHeader(JwksServer(signing_key).get_verifier())
+
+    app = FastAPI()
+    app.add_exception_handler(TokenVerificationError, token_verification_error_handler)
+
+    @app.get("/me")
+    async def me(token: AccessTokenPayload = Depends(access_token)) -> dict[str, str]:
+        return {"sub": token.sub}
+
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/me", headers={"X-Access-Token": signing_key.sign(sub="user-uuid")})
+        missing_header_response = await client.get("/me")
+        expired_response = await client.get("/me", headers={"X-Access-Token": signing_key.sign(expires_in=-60)})
+
+    assert response.json() == {"sub": "user-uuid"}
+    assert missing_header_response.status_code == expired_response.status_code == 401
+    assert missing_header_response.json() == {"error": "Header X-Access-Token is not provided"}
+    assert expired_response.json() == {"error": "Token is expired"}
+
+
+class RevocationEventServer:
+    """Serves one batch of events per connection, then closes it like a dropped stream."""
+
+    def __init__(self, *batches: list[tuple[str, dict]]) -> None:
+        self.batches = list(batches)
+        self.last_event_ids: list[str | None] = []
+        self.done = asyncio.Event()
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.last_event_ids.append(request.headers.get("Last-Event-ID"))
+        if not self.batches:
+            self.done.set()
+            return httpx.Response(503)
+
+        body = ": keep-alive\n\n" + "".join(
+            f"id: {event_id}\nevent: revocation\ndata: {json.dumps(event)}\n\n"
+            for event_id, event in self.batches.pop(0)
+        )
+        return httpx.Response(200, headers={"Content-Type": "text/event-stream"}, content=body.encode())
+
+
+def _revocation_event(user_uuid: str, expires_in: int = 60) -> dict:
+    now = int(time.time())
+    return {
+        "user_uuid": user_uuid,
+        "session_uuids": [],
+        "reason": "sign_out",
+        "not_before": now,
+        "expires_at": now + expires_in,
+    }
+
+
+@pytest.mark.asyncio
+async def test__revocation_list__resumes_from_last_event_and_rejects_earlier_tokens() -> None:
+    signing_key = SigningKey(kid="first")
+    early_token = signing_key.sign(sub="signed-out")
+    event_server = RevocationEventServer(
+        [("1-0", _revocation_event("signed-out")), ("2-0", _revocation_event("expired", expires_in=-1))],
+        [("3-0", _revocation_event("deleted"))],
+    )
+
+    async def get_access_token() -> str:
+        return "admin-token"
+
+    revocations = RevocationList(
+        REVOCATION_EVENTS_URL,
+        get_access_token=get_access_token,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(event_server.handle)),
+        reconnect_delay_seconds=0,
+    )
+    verifier = TokenVerifier(
+        key_set=KeySetCache(
+            JWKS_URL, http_client=httpx.AsyncClient(transport=httpx.MockTransport(JwksServer(signing_key).handle))
+        ),
+        revocations=revocations,
+    )
+    revocations.start()
+    await asyncio.wait_for(event_server.done.wait(), timeout=5)
+
+    assert event_server.last_event_ids[:3] == ["0-0", "2-0", "3-0"]
+    assert revocations.last_event_id == "3-0"
+    with pytest.raises(TokenRevokedError):
+        await verifier.decode_access_token(early_token)
+    # Signing in again after the event issues a token that outlives it
+    assert await verifier.decode_access_token(signing_key.sign(sub="signed-out", expires_in=120))
+    assert await verifier.decode_access_token(signing_key.sign(sub="expired"))
+
+    await verifier.close()
+
+
+@pytest.mark.asyncio
+async def test__revocation_list__applies_events_published_before_start() -> None:
+    signing_key = SigningKey(kid="first")
+    token = signing_key.sign(sub="signed-out")
+    published_event = ("1-0", _revocation_event("signed-out"))
+    last_event_ids = []
+    reconnected = asyncio.Event()
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        last_event_ids.append(request.headers.get("Last-Event-ID"))
+        if len(last_event_ids) > 1:
+            reconnected.set()
+            return httpx.Response(503)
+
+        # Like the service: the stream starts from now unless an earlier offset is asked for
+        events = [published_event] if last_event_ids[0] == "0-0" else []
+        body = "".join(f"id: {event_id}\ndata: {json.dumps(event)}\n\n" for event_id, event in events)
+        return httpx.Response(200, headers={"Content-Type": "text/event-stream"}, content=body.encode())
+
+    async def get_access_token() -> str:
+        return "admin-token"
+
+    revocations = RevocationList(
+        REVOCATION_EVENTS_URL,
+        get_access_token=get_access_token,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handle)),
+        reconnect_delay_seconds=0,
+    )
+    verifier = TokenVerifier(
+        key_set=KeySetCache(
+            JWKS_URL, http_client=httpx.AsyncClient(transport=httpx.MockTransport(JwksServer(signing_key).handle))
+        ),
+        revocations=revocations,
+    )
+    revocations.start()
+    await asyncio.wait_for(reconnected.wait(), timeout=5)
+
+    assert last_event_ids[:2] == ["0-0", "1-0"]
+    with pytest.raises(TokenRevokedError):
+        await verifier.decode_access_token(token)
+
+    await verifier.close()
@@ -0,0 +1,138 @@
+"""Answers the token validation endpoints, the busiest routes of the service, before the router.
+
+``/auth/validate-access`` and ``/auth/validate-refresh`` only check a signature against the public key.
+Here they skip routing, dependency resolution and the exception middleware, and the payload is
+written straight to ``send``. Status codes and bodies are the same as those of the endpoints and of
+``message_exception_handler``; CORS headers come from the CORS middleware around this one. Opaque refresh
+tokens need the full app, which looks them up in Postgres, and are passed on unchanged. Access token
+validations carry the same caching headers as the endpoint, and a matching ``If-None-Match`` is answered
+with ``304`` here too.
+"""
+import dataclasses
+import typing
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from api.v1.auth import validate_access_token, validate_refresh_token
+from enums import HeaderKeyEnum
+from exceptions import HeaderIsNotProvidedException, MessageException
+from schemas.auth import AccessTokenPayloadSchema, RefreshTokenPayloadSchema
+from services.auth import is_opaque_refresh_token
+from services.token import TokenVerifier, get_token_verifier
+from settings import Settings
+from utils.http_cache import get_cache_headers, get_etag, is_etag_matched
+
+ExceptionHandler = typing.Callable[[Request, MessageException], typing.Awaitable[Response]]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class FastPathRoute:
+    route: APIRoute
+    header: HeaderKeyEnum
+    is_cacheable: bool
+    # Returns None when the request has to go through the app after all
+    validate: typing.Callable[[TokenVerifier, str], typing.Awaitable[BaseModel | None]]
+
+
+class TokenValidationMiddleware:
+    """Serves ``GET`` requests to the token validation routes found in ``routes``.
+
+    The token verifier is resolved through ``dependency_overrides_provider`` like a dependency of the
+    endpoints, so overrides such as the in-memory repositories apply here too.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        routes: typing.Sequence[BaseRoute],
+        dependency_overrides_provider: FastAPI,
+        exception_handler: ExceptionHandler,
+        settings: Settings,
+    ) -> None:
+        self.app = app
+        self._dependency_overrides_provider = dependency_overrides_provider
+        self._exception_handler = exception_handler
+        self._settings = settings
+
+        validators = {
+            validate_access_token: (HeaderKeyEnum.ACCESS_TOKEN, True, self._validate_access_token),
+            validate_refresh_token: (HeaderKeyEnum.REFRESH_TOKEN, False, self._validate_refresh_token),
+        }
+        self._routes = {
+            route.path: FastPathRoute(route, *validators[route.endpoint])
+            for route in routes
+            if isinstance(route, APIRoute) and route.endpoint in validators
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        fast_path_route = self._routes.get(scope["path"]) if scope["type"] == "http" else None
+        if fast_path_route is None or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        header_key = fast_path_route.header.value.lower().encode()
+        token = if_none_match = None
+        for key, value in scope["headers"]:
+            if key == header_key and token is None:
+                token = value.decode("latin-1")
+            elif key == b"if-none-match" and if_none_match is None:
+                if_none_match = value.decode("latin-1")
+
+        # Lets the outer middlewares label the request by its route template
+        scope["route"] = fast_path_route.route
+
+        try:
+            if not token:
+                raise HeaderIsNotProvidedException(header=fast_path_route.header.value)
+
+            get_verifier = self._dependency_overrides_provider.dependency_overrides.get(
+                get_token_verifier, get_token_verifier
+            )
+            token_payload = await fast_path_route.validate(await get_verifier(), token)
+
+        except MessageException as exc:
+            response = await self._exception_handler(Request(scope), exc)
+            await response(scope, receive, send)
+            return
+
+        if token_payload is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = []
+        if fast_path_route.is_cacheable:
+            etag = get_etag(token)
+            headers = [
+                (key.lower().encode(), value.encode())
+                for key, value in get_cache_headers(etag, expires_at=token_payload.exp).items()  # type: ignore
+            ]
+            if is_etag_matched(if_none_match, etag):
+                await send({"type": "http.response.start", "status": 304, "headers": headers})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+        body = token_payload.__pydantic_serializer__.to_json(token_payload)
+        headers += [(b"content-length", str(len(body)).encode()), (b"content-type", b"application/json")]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    async def _validate_access_token(token_verifier: TokenVerifier, token: str) -> AccessTokenPayloadSchema:
+        return await token_verifier.decode_access_token(token=token)
+
+    async def _validate_refresh_token(
+        self,
+        token_verifier: TokenVerifier,
+        token: str,
+    ) -> RefreshTokenPayloadSchema | None:
+        if is_opaque_refresh_token(token, settings=self._settings):
+            return None
+
+        payload = await token_verifier.decode_token(token)
+        return RefreshTokenPayloadSchema.model_validate(payload)
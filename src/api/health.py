@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, status
+
+from enums import HealthStatusEnum
+from schemas.health import LivenessOutputSchema, ReadinessOutputSchema
+from services.health import HealthService, get_health_service
+from utils.responses import PydanticResponse
+
+router = APIRouter()
+
+
+@router.get(
+    "/live",
+    description="The process is up and serving requests",
+    status_code=status.HTTP_200_OK,
+    response_model=LivenessOutputSchema,
+)
+async def live() -> PydanticResponse:
+    return PydanticResponse(LivenessOutputSchema(), status_code=status.HTTP_200_OK)
+
+
+@router.get(
+    "/ready",
+    description="Postgres, Redis and the token keys are reachable and the connection pools are not saturated",
+    status_code=status.HTTP_200_OK,
+    response_model=ReadinessOutputSchema,
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ReadinessOutputSchema}},
+)
+async def ready(
+    health_service: HealthService = Depends(get_health_service),
+) -> PydanticResponse:
+    readiness = await health_service.get_readiness()
+
+    status_code = status.HTTP_200_OK if readiness.status == HealthStatusEnum.OK else status.HTTP_503_SERVICE_UNAVAILABLE
+    return PydanticResponse(readiness, status_code=status_code)
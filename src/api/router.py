@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from api import health
 from api.v1 import auth as auth_v1
 from api.v1 import users as users_v1
 
@@ -9,3 +10,6 @@ v1_router.include_router(users_v1.router, prefix="/users", tags=["users"])
 
 api_router = APIRouter(prefix="/api")
 api_router.include_router(v1_router)
+
+health_router = APIRouter(prefix="/health", tags=["health"])
+health_router.include_router(health.router)
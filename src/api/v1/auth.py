@@ -1,6 +1,13 @@
-from fastapi import APIRouter, Depends, status
+import typing
+
+from fastapi import APIRouter, Depends, Header, Security, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import Response
 
 from db.models import User
+from db.postgres import get_session
+from enums import UserRolesEnum
 from schemas.auth import (
     AccessTokenOutputSchema,
     AccessTokenPayloadSchema,
@@ -9,13 +16,21 @@ from schemas.auth import (
     SignUpInputSchema,
     TokenPairOutputSchema,
 )
+from schemas.jwt import JwksOutputSchema
+from schemas.revocation import RevocationEventSchema
 from schemas.user import UserOutputSchema
 from services.auth import (
     AuthService,
     access_token_scheme,
+    get_auth_service,
+    get_user_by_access_token,
     get_user_by_refresh_token,
     refresh_token_scheme,
 )
+from services.revocation import RevocationService, get_revocation_stream_service
+from services.token import TokenVerifier, get_token_verifier
+from utils.http_cache import get_cached_response, get_etag
+from utils.responses import PydanticResponse
 
 router = APIRouter()
 
@@ -24,51 +39,77 @@ router = APIRouter()
     "/sign-in",
     description="Create token pair by username and password",
     status_code=status.HTTP_201_CREATED,
+    response_model=TokenPairOutputSchema,
 )
 async def sign_in(
     request_data: SignInInputSchema,
-    auth_service: AuthService = Depends(),
-) -> TokenPairOutputSchema:
+    auth_service: AuthService = Depends(get_auth_service),
+) -> PydanticResponse:
     token_pair = await auth_service.authenticate_user_and_create_token_pair(credentials=request_data)
 
-    return token_pair
+    return PydanticResponse(token_pair, status_code=status.HTTP_201_CREATED)
 
 
 @router.post(
     "/access",
     status_code=status.HTTP_201_CREATED,
+    response_model=AccessTokenOutputSchema,
 )
-def recreate_access_token(
+async def recreate_access_token(
     user: User = Depends(get_user_by_refresh_token),
-    auth_service: AuthService = Depends(),
-) -> AccessTokenOutputSchema:
+    auth_service: AuthService = Depends(get_auth_service),
+) -> PydanticResponse:
     access_token = auth_service.create_access_token(user=user)
 
-    return access_token
+    return PydanticResponse(access_token, status_code=status.HTTP_201_CREATED)
 
 
 @router.get(
     "/validate-access",
     description="Get access token payload",
     status_code=status.HTTP_200_OK,
+    response_model=AccessTokenPayloadSchema,
 )
 async def validate_access_token(
     access_token: str = Depends(access_token_scheme),
-    auth_service: AuthService = Depends(),
-) -> AccessTokenPayloadSchema:
-    return await auth_service.decode_access_token(token=access_token)
+    if_none_match: str | None = Header(None),
+    token_verifier: TokenVerifier = Depends(get_token_verifier),
+) -> Response:
+    token_payload = await token_verifier.decode_access_token(token=access_token)
+
+    # The payload is decoded from the token alone, so the token identifies the representation
+    return get_cached_response(
+        token_payload, etag=get_etag(access_token), expires_at=token_payload.exp, if_none_match=if_none_match
+    )
+
+
+@router.get(
+    "/jwks",
+    description="Public keys to verify access tokens without calling the service",
+    status_code=status.HTTP_200_OK,
+    response_model=JwksOutputSchema,
+)
+async def get_jwks(
+    token_verifier: TokenVerifier = Depends(get_token_verifier),
+) -> PydanticResponse:
+    jwks = await token_verifier.get_jwks()
+
+    return PydanticResponse(jwks)
 
 
 @router.get(
     "/validate-refresh",
     description="Get refresh token payload",
     status_code=status.HTTP_200_OK,
+    response_model=RefreshTokenPayloadSchema,
 )
 async def validate_refresh_token(
     refresh_token: str = Depends(refresh_token_scheme),
-    auth_service: AuthService = Depends(),
-) -> RefreshTokenPayloadSchema:
-    return await auth_service.decode_refresh_token(token=refresh_token)
+    auth_service: AuthService = Depends(get_auth_service),
+) -> PydanticResponse:
+    token_payload = await auth_service.decode_refresh_token(token=refresh_token)
+
+    return PydanticResponse(token_payload)
 
 
 @router.post(
@@ -79,11 +120,11 @@ async def validate_refresh_token(
 )
 async def sign_up(
     request_data: SignUpInputSchema,
-    auth_service: AuthService = Depends(),
-) -> User:
+    auth_service: AuthService = Depends(get_auth_service),
+) -> PydanticResponse:
     user = await auth_service.sign_up(credentials=request_data)
 
-    return user
+    return PydanticResponse(user, schema=UserOutputSchema, status_code=status.HTTP_201_CREATED)
 
 
 @router.post(
@@ -93,6 +134,43 @@ async def sign_up(
 )
 async def sign_out(
     user: User = Depends(get_user_by_refresh_token),
-    auth_service: AuthService = Depends(),
+    auth_service: AuthService = Depends(get_auth_service),
 ) -> None:
     await auth_service.delete_user_session(user=user)
+
+
+@router.get(
+    "/revocation-events",
+    description="Server-sent events of users whose tokens were revoked. Each event id is an offset: "
+    "reconnect with the Last-Event-ID header or the after parameter to resume, or without both to start from now",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+)
+async def stream_revocation_events(
+    after: str | None = None,
+    last_event_id: str | None = Header(None),
+    _: User = Security(get_user_by_access_token, scopes=[UserRolesEnum.ADMIN, UserRolesEnum.SUPER_ADMIN]),
+    session: AsyncSession = Depends(get_session),
+    revocation_service: RevocationService = Depends(get_revocation_stream_service),
+) -> StreamingResponse:
+    events = revocation_service.follow_events(after_event_id=after or last_event_id)
+    # The stream outlives the user lookup: give the database connection back before it starts
+    await session.close()
+
+    return StreamingResponse(
+        _format_server_sent_events(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _format_server_sent_events(
+    events: typing.AsyncIterator[tuple[str, RevocationEventSchema] | None],
+) -> typing.AsyncIterator[bytes]:
+    async for item in events:
+        if item is None:
+            yield b": keep-alive\n\n"
+            continue
+
+        event_id, event = item
+        yield b"id: %s\nevent: revocation\ndata: %s\n\n" % (event_id.encode(), event.model_dump_json().encode())
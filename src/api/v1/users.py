@@ -1,17 +1,31 @@
-import typing
 import uuid as _uuid
 
-from fastapi import APIRouter, Depends, Security, status
+from fastapi import APIRouter, Depends, Header, Query, Security, status
+from starlette.responses import Response
 
 from db.models import User
-from enums import UserRolesEnum
-from schemas.user import UserChangeSchema, UserOutputSchema
-from services.auth import get_user_by_access_token
-from services.user import UserService
+from enums import UserRolesEnum, UserSearchModeEnum
+from schemas.auth import AccessTokenPayloadSchema
+from schemas.user import (
+    UserAdminChangeSchema,
+    UserChangeSchema,
+    UserOutputSchema,
+    UserSearchOutputSchema,
+)
+from services.auth import get_access_token_payload, get_user_by_access_token
+from services.user import UserService, get_user_service
+from settings import get_settings
+from utils.http_cache import get_cached_response, get_etag
+from utils.responses import PydanticResponse
 
 router = APIRouter()
 
 
+def _get_user_etag(user: User) -> str:
+    # updated_at is set by every change of the row
+    return get_etag(user.uuid, user.updated_at.isoformat())
+
+
 @router.get(
     "",
     status_code=status.HTTP_200_OK,
@@ -19,11 +33,31 @@ router = APIRouter()
     dependencies=[Security(get_user_by_access_token, scopes=[UserRolesEnum.ADMIN, UserRolesEnum.SUPER_ADMIN])],
 )
 async def get_all_users(
-    user_service: UserService = Depends(),
-) -> typing.Sequence[User]:
+    user_service: UserService = Depends(get_user_service),
+) -> PydanticResponse:
     all_users = await user_service.get_all_users()
 
-    return all_users
+    return PydanticResponse(all_users, schema=list[UserOutputSchema])
+
+
+@router.get(
+    "/search",
+    description="Search users by username, email or full name. SUBSTRING mode needs a query of at least "
+    "3 characters; use PREFIX mode for shorter ones",
+    status_code=status.HTTP_200_OK,
+    response_model=UserSearchOutputSchema,
+    dependencies=[Security(get_user_by_access_token, scopes=[UserRolesEnum.ADMIN, UserRolesEnum.SUPER_ADMIN])],
+)
+async def search_users(
+    query: str = Query(min_length=1, max_length=255),
+    mode: UserSearchModeEnum = UserSearchModeEnum.SUBSTRING,
+    limit: int = Query(default=20, ge=1),
+    after: _uuid.UUID | None = None,
+    user_service: UserService = Depends(get_user_service),
+) -> PydanticResponse:
+    search_result = await user_service.search_users(query=query, mode=mode, limit=limit, after_uuid=after)
+
+    return PydanticResponse(search_result)
 
 
 @router.get(
@@ -32,9 +66,18 @@ async def get_all_users(
     response_model=UserOutputSchema,
 )
 async def get_current_user(
+    if_none_match: str | None = Header(None),
     user: User = Depends(get_user_by_access_token),
-) -> User:
-    return user
+    token_payload: AccessTokenPayloadSchema = Depends(get_access_token_payload),
+) -> Response:
+    return get_cached_response(
+        user,
+        schema=UserOutputSchema,
+        etag=_get_user_etag(user),
+        expires_at=token_payload.exp,
+        max_age_seconds=get_settings().USER_CACHE_MAX_AGE_SECONDS,
+        if_none_match=if_none_match,
+    )
 
 
 @router.get(
@@ -45,11 +88,23 @@ async def get_current_user(
 )
 async def get_user_by_uuid(
     user_uuid: _uuid.UUID,
-    user_service: UserService = Depends(),
-) -> User:
+    if_none_match: str | None = Header(None),
+    # Same scopes as the dependency above, so FastAPI reuses the payload it decoded
+    token_payload: AccessTokenPayloadSchema = Security(
+        get_access_token_payload, scopes=[UserRolesEnum.ADMIN, UserRolesEnum.SUPER_ADMIN]
+    ),
+    user_service: UserService = Depends(get_user_service),
+) -> Response:
     user = await user_service.get_user_by_uuid(user_uuid=user_uuid)
 
-    return user
+    return get_cached_response(
+        user,
+        schema=UserOutputSchema,
+        etag=_get_user_etag(user),
+        expires_at=token_payload.exp,
+        max_age_seconds=get_settings().USER_CACHE_MAX_AGE_SECONDS,
+        if_none_match=if_none_match,
+    )
 
 
 @router.patch(
@@ -61,11 +116,11 @@ async def get_user_by_uuid(
 async def change_current_user(
     user_uuid: _uuid.UUID,
     request_data: UserChangeSchema,
-    user_service: UserService = Depends(),
-) -> User:
+    user_service: UserService = Depends(get_user_service),
+) -> PydanticResponse:
     user = await user_service.change_user_by_uuid(user_uuid=user_uuid, user_data=request_data)
 
-    return user
+    return PydanticResponse(user, schema=UserOutputSchema)
 
 
 @router.patch(
@@ -76,12 +131,12 @@ async def change_current_user(
 )
 async def change_user_by_uuid(
     user_uuid: _uuid.UUID,
-    request_data: UserChangeSchema,
-    user_service: UserService = Depends(),
-) -> User:
+    request_data: UserAdminChangeSchema,
+    user_service: UserService = Depends(get_user_service),
+) -> PydanticResponse:
     user = await user_service.change_user_by_uuid(user_uuid=user_uuid, user_data=request_data)
 
-    return user
+    return PydanticResponse(user, schema=UserOutputSchema)
 
 
 @router.delete(
@@ -92,7 +147,7 @@ async def change_user_by_uuid(
 )
 async def delete_current_user(
     current_user: User = Depends(get_user_by_access_token),
-    user_service: UserService = Depends(),
+    user_service: UserService = Depends(get_user_service),
 ) -> None:
     await user_service.delete_user_by_uuid(user_uuid=current_user.uuid)
 
@@ -105,6 +160,6 @@ async def delete_current_user(
 )
 async def delete_user_by_uuid(
     user_uuid: _uuid.UUID,
-    user_service: UserService = Depends(),
+    user_service: UserService = Depends(get_user_service),
 ) -> None:
     await user_service.delete_user_by_uuid(user_uuid=user_uuid)
@@ -0,0 +1,39 @@
+"""Users and tokens prepared on the target, shared by the load test and the replay."""
+import dataclasses
+
+from httpx import AsyncClient
+
+API_PREFIX = "/api/v1"
+
+
+@dataclasses.dataclass
+class BenchmarkContext:
+    """Users signed up for a run under ``username_prefix``, with their tokens at the same index."""
+
+    username_prefix: str
+    usernames: list[str] = dataclasses.field(default_factory=list)
+    user_uuids: list[str] = dataclasses.field(default_factory=list)
+    refresh_tokens: list[str] = dataclasses.field(default_factory=list)
+    access_tokens: list[str] = dataclasses.field(default_factory=list)
+    admin_access_token: str | None = None
+
+
+async def sign_in_user(client: AsyncClient, username: str, password: str) -> tuple[str, str]:
+    response = await client.post(f"{API_PREFIX}/auth/sign-in", json={"username": username, "password": password})
+    response.raise_for_status()
+    token_pair = response.json()
+
+    return token_pair["refresh_token"], token_pair["access_token"]
+
+
+async def sign_up_users(client: AsyncClient, context: BenchmarkContext, users: int, password: str) -> None:
+    for i in range(users):
+        username = f"{context.username_prefix}user_{i}"
+        response = await client.post(f"{API_PREFIX}/auth/sign-up", json={"username": username, "password": password})
+        response.raise_for_status()
+
+        refresh_token, access_token = await sign_in_user(client, username=username, password=password)
+        context.usernames.append(username)
+        context.user_uuids.append(response.json()["uuid"])
+        context.refresh_tokens.append(refresh_token)
+        context.access_tokens.append(access_token)
@@ -0,0 +1,207 @@
+"""Cost of resolving the dependencies of each endpoint, measured with FastAPI's own ``solve_dependencies``.
+
+Nothing goes over HTTP and no endpoint runs: each iteration builds the request scope in process and resolves
+the endpoint's dependency graph the way the router does. That includes the work the dependencies do
+themselves, like token checks and user lookups, and closing yield dependencies like the database session.
+FastAPI runs class and plain function dependencies in the thread pool, so every such dependency costs a
+thread hop on top of its own work.
+
+By default the dependencies talk to the Postgres and Redis configured in settings, e.g. the docker-compose
+stack with migrations applied. With --in-memory they are served from the in-memory repositories, which
+leaves the dependency injection overhead itself.
+
+Usage (from the src directory):
+    python -m benchmarks.dependency_injection --iterations 2000 --output results/di.json
+    python -m benchmarks.dependency_injection --in-memory --compare results/di.json
+"""
+import argparse
+import asyncio
+import contextlib
+import pathlib
+import secrets
+import time
+import typing
+
+from fastapi import FastAPI
+from fastapi.dependencies.utils import solve_dependencies
+from fastapi.routing import APIRoute
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete
+from starlette.requests import Request
+
+from benchmarks.report import print_comparison, print_results, save_results, summarize
+from db.models import User
+from db.postgres import get_async_session
+from db.repositories.in_memory import (
+    InMemoryJwtPublicKeyRepository,
+    InMemoryStore,
+    InMemoryUserRepository,
+    use_in_memory_repositories,
+)
+from db.repositories.user import UserRepository
+from enums import HeaderKeyEnum, UserRolesEnum
+from schemas.user import UserCreateSchema
+from services.auth import AuthService
+from settings import get_settings
+
+API_PREFIX = "/api/v1"
+PASSWORD = "dependency-injection-password"
+
+# name -> method, route path and the token header the request carries
+ENDPOINTS: dict[str, tuple[str, str, HeaderKeyEnum | None]] = {
+    "sign-in": ("POST", f"{API_PREFIX}/auth/sign-in", None),
+    "sign-up": ("POST", f"{API_PREFIX}/auth/sign-up", None),
+    "access": ("POST", f"{API_PREFIX}/auth/access", HeaderKeyEnum.REFRESH_TOKEN),
+    "validate-access": ("GET", f"{API_PREFIX}/auth/validate-access", HeaderKeyEnum.ACCESS_TOKEN),
+    "validate-refresh": ("GET", f"{API_PREFIX}/auth/validate-refresh", HeaderKeyEnum.REFRESH_TOKEN),
+    "users-me": ("GET", f"{API_PREFIX}/users/me", HeaderKeyEnum.ACCESS_TOKEN),
+    "users-list": ("GET", f"{API_PREFIX}/users", HeaderKeyEnum.ACCESS_TOKEN),
+    "health-live": ("GET", "/health/live", None),
+}
+
+
+def _get_route(app: FastAPI, method: str, path: str) -> APIRoute:
+    return next(
+        route for route in app.routes if isinstance(route, APIRoute) and route.path == path and method in route.methods
+    )
+
+
+async def _measure(
+    name: str,
+    app: FastAPI,
+    route: APIRoute,
+    headers: list[tuple[bytes, bytes]],
+    body: dict[str, typing.Any] | None,
+    iterations: int,
+) -> dict[str, typing.Any]:
+    base_scope = {
+        "type": "http",
+        "method": next(iter(route.methods)),
+        "path": route.path,
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+        "path_params": {},
+        "app": app,
+        "client": ("127.0.0.1", 50000),
+        "server": ("dependency-injection", 80),
+    }
+
+    async def resolve() -> None:
+        async with contextlib.AsyncExitStack() as stack:
+            request = Request({**base_scope, "fastapi_astack": stack})
+            _, errors, *_ = await solve_dependencies(
+                request=request, dependant=route.dependant, body=body, dependency_overrides_provider=app
+            )
+        if errors:
+            raise RuntimeError(f"{name}: dependencies failed to resolve: {errors}")
+
+    # One unmeasured resolution warms the caches the dependencies build lazily
+    await resolve()
+
+    latencies = []
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        resolve_started_at = time.perf_counter()
+        await resolve()
+        latencies.append(time.perf_counter() - resolve_started_at)
+
+    return summarize(name, latencies, elapsed=time.perf_counter() - started_at)
+
+
+async def _create_user(username: str, store: InMemoryStore | None) -> None:
+    user_data = UserCreateSchema(
+        username=username,
+        password=AuthService.hash_password(PASSWORD),
+        role=UserRolesEnum.ADMIN,
+        is_active=True,
+    )
+    if store is not None:
+        await InMemoryUserRepository(store=store).create_user(data=user_data)
+        return
+
+    async with get_async_session()() as session:
+        await UserRepository(session=session).create_user(data=user_data)
+        await session.commit()
+
+
+async def _delete_users(username_prefix: str) -> None:
+    async with get_async_session()() as session:
+        await session.execute(delete(User).where(User.username.startswith(username_prefix, autoescape=True)))
+        await session.commit()
+
+
+async def run(endpoints: list[str], iterations: int, in_memory: bool) -> list[dict[str, typing.Any]]:
+    # The middleware stack is built when main is imported
+    get_settings().RATE_LIMIT_ENABLED = False
+    from main import app, save_jwt_key
+
+    username_prefix = f"di_{secrets.token_hex(4)}_"
+    username = f"{username_prefix}admin"
+    store = InMemoryStore() if in_memory else None
+    results = []
+
+    async with contextlib.AsyncExitStack() as stack:
+        if store is not None:
+            use_in_memory_repositories(app, store=store)
+            await save_jwt_key(jwt_public_key_repository=InMemoryJwtPublicKeyRepository(store=store))
+        else:
+            await stack.enter_async_context(app.router.lifespan_context(app))
+
+        await _create_user(username, store=store)
+        try:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://dependency-injection") as client:
+                response = await client.post(
+                    f"{API_PREFIX}/auth/sign-in", json={"username": username, "password": PASSWORD}
+                )
+                response.raise_for_status()
+                tokens = {
+                    HeaderKeyEnum.ACCESS_TOKEN: response.json()["access_token"],
+                    HeaderKeyEnum.REFRESH_TOKEN: response.json()["refresh_token"],
+                }
+
+            bodies = {
+                "sign-in": {"username": username, "password": PASSWORD},
+                "sign-up": {"username": f"{username_prefix}new", "password": PASSWORD},
+            }
+            for name in endpoints:
+                method, path, token_header = ENDPOINTS[name]
+                headers = []
+                if token_header is not None:
+                    headers.append((token_header.value.lower().encode(), tokens[token_header].encode()))
+
+                route = _get_route(app, method, path)
+                results.append(await _measure(name, app, route, headers, bodies.get(name), iterations))
+
+        finally:
+            if store is None:
+                await _delete_users(username_prefix)
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", nargs="+", choices=list(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument("--iterations", type=int, default=2_000)
+    parser.add_argument("--in-memory", action="store_true", help="resolve without Postgres and Redis")
+    parser.add_argument("--output", type=pathlib.Path, help="save the results as JSON")
+    parser.add_argument("--compare", type=pathlib.Path, help="JSON results of an earlier run to compare with")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(endpoints=args.endpoints, iterations=args.iterations, in_memory=args.in_memory))
+
+    print_results(results)
+    if args.output:
+        parameters = {
+            "endpoints": args.endpoints,
+            "iterations": args.iterations,
+            "target": "in-memory" if args.in_memory else "in-process",
+        }
+        save_results(args.output, benchmark="dependency_injection", parameters=parameters, results=results)
+    if args.compare:
+        print_comparison(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""End-to-end load test: throughput and p50/p95/p99 latency of the auth endpoints at several concurrency levels.
+
+By default the app runs in process against the Postgres and Redis configured in settings, e.g. the
+docker-compose stack with migrations applied. Rate limiting is switched off for the in-process app, a server
+passed with --base-url has to run with RATE_LIMIT_ENABLED=false. In process, client and app share one event
+loop, so absolute numbers include the client; compare runs made the same way. With --in-memory the app is
+served from the in-memory repositories, which leaves application overhead without Postgres and Redis I/O.
+
+Each scenario is driven by --concurrency closed-loop clients for --duration seconds after a --warmup. Users
+are signed up once per run and removed afterwards when running in process. GET /users needs an admin: it is
+created in process, a remote run takes --admin-username and --admin-password or skips the scenario.
+Responses other than 2xx are counted as errors and left out of the latencies. JWT refresh tokens carry no
+unique claim, so two sign-ins of one user within the same second collide; keep --users above the sign-in
+rate per second or run with REFRESH_TOKEN_FORMAT=OPAQUE.
+
+Usage (from the src directory):
+    python -m benchmarks.load_test --concurrency 1 16 64 --duration 10 --output results/load.json
+    python -m benchmarks.load_test --scenarios validate-access users-me --compare results/load.json
+    python -m benchmarks.load_test --in-memory --scenarios access validate-access users-me users-list
+    python -m benchmarks.load_test --base-url http://localhost:8000 --admin-username admin --admin-password secret
+"""
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import itertools
+import pathlib
+import secrets
+import time
+import typing
+
+from httpx import ASGITransport, AsyncClient, Limits, Response
+from sqlalchemy import delete
+
+from benchmarks.client import API_PREFIX, BenchmarkContext, sign_in_user, sign_up_users
+from benchmarks.report import print_comparison, print_results, save_results, summarize
+from db.models import User
+from db.postgres import get_async_session
+from db.repositories.in_memory import (
+    InMemoryJwtPublicKeyRepository,
+    InMemoryStore,
+    InMemoryUserRepository,
+    use_in_memory_repositories,
+)
+from db.repositories.user import UserRepository
+from enums import UserRolesEnum
+from schemas.user import UserCreateSchema
+from services.auth import AuthService
+from settings import get_settings
+
+PASSWORD = "load-test-password"
+
+
+@dataclasses.dataclass
+class LoadTestContext(BenchmarkContext):
+    sign_up_counter: typing.Iterator[int] = dataclasses.field(default_factory=itertools.count)
+
+
+Scenario = typing.Callable[[AsyncClient, LoadTestContext, int], typing.Awaitable[Response]]
+
+
+async def _sign_up(client: AsyncClient, context: LoadTestContext, _: int) -> Response:
+    username = f"{context.username_prefix}signup_{next(context.sign_up_counter)}"
+    return await client.post(f"{API_PREFIX}/auth/sign-up", json={"username": username, "password": PASSWORD})
+
+
+async def _sign_in(client: AsyncClient, context: LoadTestContext, i: int) -> Response:
+    username = context.usernames[i % len(context.usernames)]
+    return await client.post(f"{API_PREFIX}/auth/sign-in", json={"username": username, "password": PASSWORD})
+
+
+async def _access(client: AsyncClient, context: LoadTestContext, i: int) -> Response:
+    refresh_token = context.refresh_tokens[i % len(context.refresh_tokens)]
+    return await client.post(f"{API_PREFIX}/auth/access", headers={"X-Refresh-Token": refresh_token})
+
+
+async def _validate_access(client: AsyncClient, context: LoadTestContext, i: int) -> Response:
+    access_token = context.access_tokens[i % len(context.access_tokens)]
+    return await client.get(f"{API_PREFIX}/auth/validate-access", headers={"X-Access-Token": access_token})
+
+
+async def _users_me(client: AsyncClient, context: LoadTestContext, i: int) -> Response:
+    access_token = context.access_tokens[i % len(context.access_tokens)]
+    return await client.get(f"{API_PREFIX}/users/me", headers={"X-Access-Token": access_token})
+
+
+async def _users_list(client: AsyncClient, context: LoadTestContext, _: int) -> Response:
+    return await client.get(f"{API_PREFIX}/users", headers={"X-Access-Token": context.admin_access_token or ""})
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "sign-up": _sign_up,
+    "sign-in": _sign_in,
+    "access": _access,
+    "validate-access": _validate_access,
+    "users-me": _users_me,
+    "users-list": _users_list,
+}
+
+
+async def _drive(
+    client: AsyncClient,
+    context: LoadTestContext,
+    scenario: Scenario,
+    concurrency: int,
+    duration: float,
+) -> tuple[list[float], int, float]:
+    latencies: list[float] = []
+    errors = 0
+    started_at = time.perf_counter()
+    deadline = started_at + duration
+
+    async def worker(worker_id: int) -> None:
+        nonlocal errors
+        for i in itertools.count(worker_id, concurrency):
+            request_started_at = time.perf_counter()
+            if request_started_at >= deadline:
+                return
+
+            response = await scenario(client, context, i)
+            if response.is_success:
+                latencies.append(time.perf_counter() - request_started_at)
+            else:
+                errors += 1
+
+    await asyncio.gather(*(worker(worker_id) for worker_id in range(concurrency)))
+
+    return latencies, errors, time.perf_counter() - started_at
+
+
+async def _create_admin(username: str, password: str, store: InMemoryStore | None) -> None:
+    admin_data = UserCreateSchema(
+        username=username,
+        password=AuthService.hash_password(password),
+        role=UserRolesEnum.ADMIN,
+        is_active=True,
+    )
+    if store is not None:
+        await InMemoryUserRepository(store=store).create_user(data=admin_data)
+        return
+
+    async with get_async_session()() as session:
+        await UserRepository(session=session).create_user(data=admin_data)
+        await session.commit()
+
+
+async def _delete_users(username_prefix: str) -> None:
+    async with get_async_session()() as session:
+        await session.execute(delete(User).where(User.username.startswith(username_prefix, autoescape=True)))
+        await session.commit()
+
+
+@contextlib.asynccontextmanager
+async def _open_client(
+    base_url: str | None,
+    max_connections: int,
+    store: InMemoryStore | None,
+) -> typing.AsyncIterator[AsyncClient]:
+    if base_url:
+        async with AsyncClient(base_url=base_url, limits=Limits(max_connections=max_connections)) as client:
+            yield client
+        return
+
+    # The middleware stack is built when main is imported
+    get_settings().RATE_LIMIT_ENABLED = False
+    from main import app, save_jwt_key
+
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    if store is not None:
+        use_in_memory_repositories(app, store=store)
+        await save_jwt_key(jwt_public_key_repository=InMemoryJwtPublicKeyRepository(store=store))
+
+        async with AsyncClient(transport=transport, base_url="http://load-test") as client:
+            yield client
+        return
+
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=transport, base_url="http://load-test") as client:
+            yield client
+
+
+async def run(
+    scenarios: list[str],
+    concurrency_levels: list[int],
+    duration: float,
+    warmup: float,
+    users: int,
+    base_url: str | None,
+    in_memory: bool,
+    admin_username: str | None,
+    admin_password: str | None,
+) -> list[dict[str, typing.Any]]:
+    context = LoadTestContext(username_prefix=f"load_{secrets.token_hex(4)}_")
+    store = InMemoryStore() if in_memory else None
+    results = []
+
+    async with _open_client(base_url, max_connections=max(concurrency_levels), store=store) as client:
+        try:
+            await sign_up_users(client, context, users=users, password=PASSWORD)
+
+            if "users-list" in scenarios:
+                if not base_url:
+                    admin_username, admin_password = f"{context.username_prefix}admin", PASSWORD
+                    await _create_admin(username=admin_username, password=admin_password, store=store)
+
+                if admin_username and admin_password:
+                    _, context.admin_access_token = await sign_in_user(client, admin_username, admin_password)
+                else:
+                    print("users-list skipped: a remote run needs --admin-username and --admin-password")
+                    scenarios = [scenario for scenario in scenarios if scenario != "users-list"]
+
+            for scenario_name, concurrency in itertools.product(scenarios, concurrency_levels):
+                scenario = SCENARIOS[scenario_name]
+                if warmup:
+                    await _drive(client, context, scenario, concurrency=concurrency, duration=warmup)
+
+                latencies, errors, elapsed = await _drive(
+                    client, context, scenario, concurrency=concurrency, duration=duration
+                )
+                results.append(summarize(f"{scenario_name}@{concurrency}", latencies, elapsed=elapsed, errors=errors))
+
+        finally:
+            if not base_url and store is None:
+                await _delete_users(context.username_prefix)
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 16, 64])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds measured per scenario and level")
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds run before each measurement")
+    parser.add_argument("--users", type=int, default=20, help="users signed up before the scenarios run")
+    parser.add_argument("--base-url", help="load a running server instead of the in-process app")
+    parser.add_argument("--in-memory", action="store_true", help="serve the in-process app without Postgres and Redis")
+    parser.add_argument("--admin-username")
+    parser.add_argument("--admin-password")
+    parser.add_argument("--output", type=pathlib.Path, help="save the results as JSON")
+    parser.add_argument("--compare", type=pathlib.Path, help="JSON results of an earlier run to compare with")
+    args = parser.parse_args()
+
+    results = asyncio.run(
+        run(
+            scenarios=args.scenarios,
+            concurrency_levels=args.concurrency,
+            duration=args.duration,
+            warmup=args.warmup,
+            users=args.users,
+            base_url=args.base_url,
+            in_memory=args.in_memory,
+            admin_username=args.admin_username,
+            admin_password=args.admin_password,
+        )
+    )
+
+    print_results(results)
+    if args.output:
+        parameters = {
+            "scenarios": args.scenarios,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "users": args.users,
+            "target": args.base_url or ("in-memory" if args.in_memory else "in-process"),
+        }
+        save_results(args.output, benchmark="load_test", parameters=parameters, results=results)
+    if args.compare:
+        print_comparison(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Caller-side cost of a failed sign-in log line: loguru's default blocking sink vs the enqueued, sampled JSON sink.
+
+stderr is replaced by a stream that sleeps on every write, standing in for a back-pressured pipe or log shipper.
+
+Usage (from the src directory):
+    python -m benchmarks.logging_throughput --records 20000 --write-latency-us 50
+"""
+import argparse
+import io
+import sys
+import time
+
+from loguru import logger
+
+from monitoring.logs import configure_logging
+
+
+class SlowStream(io.StringIO):
+    def __init__(self, write_latency_seconds: float) -> None:
+        super().__init__()
+        self._write_latency_seconds = write_latency_seconds
+
+    def write(self, s: str) -> int:
+        time.sleep(self._write_latency_seconds)
+        return len(s)
+
+
+def _measure(name: str, records: int) -> None:
+    started_at = time.perf_counter()
+    for i in range(records):
+        logger.error("Invalid password", event="sign_in.invalid_password", username=f"user_{i}")
+    per_record = (time.perf_counter() - started_at) / records
+
+    print(f"  {name}: {per_record * 1_000_000:,.2f} us per record", file=sys.__stdout__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--write-latency-us", type=int, default=50)
+    args = parser.parse_args()
+
+    sys.stderr = SlowStream(write_latency_seconds=args.write_latency_us / 1_000_000)
+
+    logger.remove()
+    logger.add(sys.stderr)
+    _measure("default sink", records=args.records)
+
+    configure_logging()
+    _measure("enqueued JSON sink with sampling", records=args.records)
+    logger.complete()
+
+    sys.stderr = sys.__stderr__
+
+
+if __name__ == "__main__":
+    main()
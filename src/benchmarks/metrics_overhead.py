@@ -0,0 +1,67 @@
+"""Per-request overhead of PrometheusMiddleware on a minimal FastAPI app.
+
+Usage (from the src directory):
+    python -m benchmarks.metrics_overhead --requests 2000 --rounds 5
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from monitoring.metrics import PrometheusMiddleware
+
+
+def _build_app(with_metrics: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int) -> dict[str, int]:
+        return {"item_id": item_id}
+
+    if with_metrics:
+        app.add_middleware(PrometheusMiddleware)
+
+    return app
+
+
+async def _measure(client: AsyncClient, requests: int) -> float:
+    started_at = time.perf_counter()
+    for i in range(requests):
+        await client.get(f"/items/{i}")
+
+    return (time.perf_counter() - started_at) / requests
+
+
+async def run(requests: int, rounds: int) -> None:
+    baseline_client = AsyncClient(app=_build_app(with_metrics=False), base_url="http://benchmark")
+    instrumented_client = AsyncClient(app=_build_app(with_metrics=True), base_url="http://benchmark")
+
+    async with baseline_client, instrumented_client:
+        # Warm up routing and serialization caches before timing
+        await _measure(baseline_client, requests=100)
+        await _measure(instrumented_client, requests=100)
+
+        # Rounds are interleaved and the best one is kept, so drift in the host affects both apps alike
+        baseline, instrumented = float("inf"), float("inf")
+        for _ in range(rounds):
+            baseline = min(baseline, await _measure(baseline_client, requests=requests))
+            instrumented = min(instrumented, await _measure(instrumented_client, requests=requests))
+
+    print(f"  without middleware: {baseline * 1_000_000:,.1f} us per request")
+    print(f"  with middleware: {instrumented * 1_000_000:,.1f} us per request")
+    print(f"  overhead: {(instrumented - baseline) * 1_000_000:,.1f} us per request")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(run(requests=args.requests, rounds=args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Microbenchmarks of the per-request CPU work: bcrypt, JWT encode/decode and response serialization.
+
+Each operation is timed call by call, so the results carry the same p50/p95/p99 fields as the load test
+and can be saved and compared the same way.
+
+Usage (from the src directory):
+    python -m benchmarks.microbenchmarks --iterations 2000 --bcrypt-iterations 20 --output results/micro.json
+    python -m benchmarks.microbenchmarks --compare results/micro.json
+"""
+import argparse
+import calendar
+import datetime as dt
+import pathlib
+import time
+import typing
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwt
+
+from benchmarks.report import print_comparison, print_results, save_results, summarize
+from db.models import User
+from enums import UserRolesEnum
+from schemas.auth import AccessTokenPayloadSchema, TokenPairOutputSchema
+from schemas.user import UserOutputSchema
+from services.auth import AuthService
+from utils.jwt import JwtMinter
+from utils.responses import PydanticResponse
+from utils.uuid7 import uuid7
+
+
+def _measure(name: str, operation: typing.Callable[[], typing.Any], iterations: int) -> dict[str, typing.Any]:
+    # One untimed call builds lazy caches (bcrypt backend, pydantic adapters)
+    operation()
+
+    latencies = []
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        operation_started_at = time.perf_counter()
+        operation()
+        latencies.append(time.perf_counter() - operation_started_at)
+
+    return summarize(name, latencies, elapsed=time.perf_counter() - started_at)
+
+
+def run(iterations: int, bcrypt_iterations: int, users: int) -> list[dict[str, typing.Any]]:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_key_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode()
+    public_key_pem = (
+        private_key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+
+    # The same context the service signs up and signs in with
+    password_context = AuthService._password_context
+    password_hash = password_context.hash("benchmark-password")
+
+    minter = JwtMinter(private_key=private_key_pem)
+    exp = calendar.timegm((dt.datetime.now(tz=dt.timezone.utc) + dt.timedelta(minutes=30)).utctimetuple())
+    claims = {"sub": str(uuid7()), "exp": exp}
+    token = minter.encode(claims)
+
+    user_list = [
+        User(
+            uuid=uuid7(),
+            username=f"user_{i}",
+            full_name=f"User {i}",
+            email=f"user_{i}@example.com",
+            role=UserRolesEnum.STAFF,
+            is_active=True,
+        )
+        for i in range(users)
+    ]
+    token_pair = TokenPairOutputSchema(refresh_token=token, access_token=token)
+
+    return [
+        _measure("bcrypt-hash", lambda: password_context.hash("benchmark-password"), bcrypt_iterations),
+        _measure(
+            "bcrypt-verify", lambda: password_context.verify("benchmark-password", password_hash), bcrypt_iterations
+        ),
+        _measure("jwt-encode", lambda: minter.encode(claims), iterations),
+        _measure("jwt-decode", lambda: jwt.decode(token, public_key_pem, algorithms=["RS256"]), iterations),
+        _measure("payload-validate", lambda: AccessTokenPayloadSchema.model_validate(claims), iterations),
+        _measure("serialize-token-pair", lambda: PydanticResponse(token_pair).body, iterations),
+        _measure("serialize-user", lambda: PydanticResponse(user_list[0], schema=UserOutputSchema).body, iterations),
+        _measure(
+            f"serialize-{users}-users",
+            lambda: PydanticResponse(user_list, schema=list[UserOutputSchema]).body,
+            iterations,
+        ),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2_000)
+    parser.add_argument("--bcrypt-iterations", type=int, default=20)
+    parser.add_argument("--users", type=int, default=100, help="users in the serialized GET /users response")
+    parser.add_argument("--output", type=pathlib.Path, help="save the results as JSON")
+    parser.add_argument("--compare", type=pathlib.Path, help="JSON results of an earlier run to compare with")
+    args = parser.parse_args()
+
+    results = run(iterations=args.iterations, bcrypt_iterations=args.bcrypt_iterations, users=args.users)
+
+    print_results(results)
+    if args.output:
+        parameters = {"iterations": args.iterations, "bcrypt_iterations": args.bcrypt_iterations, "users": args.users}
+        save_results(args.output, benchmark="microbenchmarks", parameters=parameters, results=results)
+    if args.compare:
+        print_comparison(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
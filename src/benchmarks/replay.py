@@ -0,0 +1,298 @@
+"""Replay a traffic capture against a running instance and report latency per route.
+
+Captures are written by the server with TRAFFIC_CAPTURE_ENABLED=true (see monitoring.traffic). Requests are
+sent open loop at their recorded arrival offsets divided by --speed, so bursts and idle gaps are kept, and a
+slow target builds up concurrency the way it would in production. Each route is reported twice: as
+recorded and as replayed. The recorded latencies come from the server, the replayed ones are measured by
+the client and include the network and waiting for one of --max-connections.
+
+The capture holds no tokens. Before the replay --users users are signed up on the target, and every token
+fingerprint in the capture is bound to one of them in order of first appearance. Requests that reused a
+token reuse the same user's token, and requests sent without a token are replayed without one. Admin
+routes need --admin-username and --admin-password. Sign-out, PATCH and DELETE requests would change the
+prepared users, so they are skipped, like unmatched routes, and counted. The prepared users stay on the
+target under a random username prefix. Run the target with RATE_LIMIT_ENABLED=false unless the rate limiter
+is part of what is measured.
+
+Usage (from the src directory):
+    python -m benchmarks.replay traffic/capture.jsonl --base-url http://localhost:8000 --output results/replay.json
+    python -m benchmarks.replay traffic/*.jsonl --base-url http://candidate:8000 --speed 4 --compare results/replay.json
+"""
+import argparse
+import asyncio
+import collections
+import dataclasses
+import itertools
+import pathlib
+import secrets
+import time
+import typing
+
+import orjson
+from httpx import AsyncClient, HTTPError, Limits
+
+from benchmarks.client import API_PREFIX, BenchmarkContext, sign_in_user, sign_up_users
+from benchmarks.report import print_comparison, print_results, save_results, summarize
+
+PASSWORD = "replay-password"
+
+
+@dataclasses.dataclass(frozen=True)
+class CapturedRequest:
+    arrived_at: float
+    method: str
+    route: str
+    status_code: int
+    duration_ms: float
+    access_token_fingerprint: str | None
+    refresh_token_fingerprint: str | None
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.route.removeprefix(API_PREFIX)}"
+
+
+@dataclasses.dataclass
+class ReplayContext(BenchmarkContext):
+    user_indexes: dict[str, int] = dataclasses.field(default_factory=dict)
+    counter: typing.Iterator[int] = dataclasses.field(default_factory=itertools.count)
+
+    def get_user_index(self, fingerprint: str | None) -> int:
+        if fingerprint is None:
+            return next(self.counter) % len(self.usernames)
+
+        return self.user_indexes.setdefault(fingerprint, len(self.user_indexes) % len(self.usernames))
+
+    def get_access_headers(self, request: CapturedRequest) -> dict[str, str]:
+        if request.access_token_fingerprint is None:
+            return {}
+
+        return {"X-Access-Token": self.access_tokens[self.get_user_index(request.access_token_fingerprint)]}
+
+    def get_refresh_headers(self, request: CapturedRequest) -> dict[str, str]:
+        if request.refresh_token_fingerprint is None:
+            return {}
+
+        return {"X-Refresh-Token": self.refresh_tokens[self.get_user_index(request.refresh_token_fingerprint)]}
+
+    def get_admin_headers(self, request: CapturedRequest) -> dict[str, str]:
+        if request.access_token_fingerprint is None:
+            return {}
+
+        return {"X-Access-Token": self.admin_access_token or ""}
+
+
+# Keyword arguments of AsyncClient.request for a captured request
+RequestBuilder = typing.Callable[[ReplayContext, CapturedRequest], dict[str, typing.Any]]
+
+
+def _sign_in(context: ReplayContext, _: CapturedRequest) -> dict[str, typing.Any]:
+    username = context.usernames[context.get_user_index(None)]
+    return {"json": {"username": username, "password": PASSWORD}}
+
+
+def _sign_up(context: ReplayContext, _: CapturedRequest) -> dict[str, typing.Any]:
+    return {"json": {"username": f"{context.username_prefix}signup_{next(context.counter)}", "password": PASSWORD}}
+
+
+def _with_access_token(context: ReplayContext, request: CapturedRequest) -> dict[str, typing.Any]:
+    return {"headers": context.get_access_headers(request)}
+
+
+def _with_refresh_token(context: ReplayContext, request: CapturedRequest) -> dict[str, typing.Any]:
+    return {"headers": context.get_refresh_headers(request)}
+
+
+def _users_list(context: ReplayContext, request: CapturedRequest) -> dict[str, typing.Any]:
+    return {"headers": context.get_admin_headers(request)}
+
+
+def _users_search(context: ReplayContext, request: CapturedRequest) -> dict[str, typing.Any]:
+    return {"headers": context.get_admin_headers(request), "params": {"query": context.username_prefix}}
+
+
+def _user_by_uuid(context: ReplayContext, request: CapturedRequest) -> dict[str, typing.Any]:
+    user_uuid = context.user_uuids[context.get_user_index(None)]
+    return {"url": f"{API_PREFIX}/users/{user_uuid}", "headers": context.get_admin_headers(request)}
+
+
+def _without_arguments(_: ReplayContext, __: CapturedRequest) -> dict[str, typing.Any]:
+    return {}
+
+
+REQUEST_BUILDERS: dict[tuple[str, str], RequestBuilder] = {
+    ("POST", f"{API_PREFIX}/auth/sign-in"): _sign_in,
+    ("POST", f"{API_PREFIX}/auth/sign-up"): _sign_up,
+    ("POST", f"{API_PREFIX}/auth/access"): _with_refresh_token,
+    ("GET", f"{API_PREFIX}/auth/validate-access"): _with_access_token,
+    ("GET", f"{API_PREFIX}/auth/validate-refresh"): _with_refresh_token,
+    ("GET", f"{API_PREFIX}/users/me"): _with_access_token,
+    ("GET", f"{API_PREFIX}/users"): _users_list,
+    ("GET", f"{API_PREFIX}/users/search"): _users_search,
+    ("GET", f"{API_PREFIX}/users/{{user_uuid}}"): _user_by_uuid,
+    ("GET", "/health/live"): _without_arguments,
+    ("GET", "/health/ready"): _without_arguments,
+    ("GET", "/metrics"): _without_arguments,
+}
+ADMIN_ROUTES = frozenset({f"{API_PREFIX}/users", f"{API_PREFIX}/users/search", f"{API_PREFIX}/users/{{user_uuid}}"})
+
+
+def read_capture(paths: list[pathlib.Path]) -> list[CapturedRequest]:
+    requests = []
+    for path in paths:
+        with path.open("rb") as capture_file:
+            for line in capture_file:
+                entry = orjson.loads(line)
+                requests.append(
+                    CapturedRequest(
+                        arrived_at=entry["t"],
+                        method=entry["m"],
+                        route=entry["r"],
+                        status_code=entry["s"],
+                        duration_ms=entry["d"],
+                        access_token_fingerprint=entry.get("a"),
+                        refresh_token_fingerprint=entry.get("f"),
+                    )
+                )
+
+    # Workers append to a shared file in flush order, not in arrival order
+    requests.sort(key=lambda request: request.arrived_at)
+
+    return requests
+
+
+def _summarize_recorded(requests: list[CapturedRequest], elapsed: float) -> list[dict[str, typing.Any]]:
+    latencies: dict[str, list[float]] = collections.defaultdict(list)
+    errors: collections.Counter[str] = collections.Counter()
+    for request in requests:
+        if 200 <= request.status_code < 300:
+            latencies[request.name].append(request.duration_ms / 1000)
+        else:
+            errors[request.name] += 1
+
+    names = sorted(latencies.keys() | errors.keys())
+    return [summarize(f"recorded {name}", latencies[name], elapsed=elapsed, errors=errors[name]) for name in names]
+
+
+async def run(
+    capture: list[pathlib.Path],
+    base_url: str,
+    speed: float,
+    users: int,
+    max_connections: int,
+    admin_username: str | None,
+    admin_password: str | None,
+) -> list[dict[str, typing.Any]]:
+    requests = read_capture(capture)
+    if not requests:
+        return []
+
+    context = ReplayContext(username_prefix=f"replay_{secrets.token_hex(4)}_")
+    latencies: dict[str, list[float]] = collections.defaultdict(list)
+    errors: collections.Counter[str] = collections.Counter()
+    skipped: collections.Counter[str] = collections.Counter()
+    status_mismatches = 0
+    send_lags: list[float] = []
+
+    async with AsyncClient(base_url=base_url, limits=Limits(max_connections=max_connections), timeout=30) as client:
+        await sign_up_users(client, context, users=users, password=PASSWORD)
+        if admin_username and admin_password:
+            _, context.admin_access_token = await sign_in_user(client, admin_username, admin_password)
+
+        async def send(request: CapturedRequest, builder: RequestBuilder) -> None:
+            nonlocal status_mismatches
+            arguments = builder(context, request)
+            url = arguments.pop("url", request.route)
+
+            request_started_at = time.perf_counter()
+            try:
+                response = await client.request(request.method, url, **arguments)
+
+            except HTTPError:
+                errors[request.name] += 1
+                status_mismatches += 1
+                return
+
+            if response.is_success:
+                latencies[request.name].append(time.perf_counter() - request_started_at)
+            else:
+                errors[request.name] += 1
+            if response.status_code != request.status_code:
+                status_mismatches += 1
+
+        tasks: set[asyncio.Task] = set()
+        first_arrived_at = requests[0].arrived_at
+        started_at = time.perf_counter()
+        for request in requests:
+            builder = REQUEST_BUILDERS.get((request.method, request.route))
+            if builder is None or (request.route in ADMIN_ROUTES and context.admin_access_token is None):
+                skipped[request.name] += 1
+                continue
+
+            scheduled_at = started_at + (request.arrived_at - first_arrived_at) / speed
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            send_lags.append(max(time.perf_counter() - scheduled_at, 0.0))
+
+            task = asyncio.create_task(send(request, builder))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started_at
+
+    names = sorted(latencies.keys() | errors.keys())
+    results = _summarize_recorded(requests, elapsed=(requests[-1].arrived_at - first_arrived_at) or elapsed)
+    results += [summarize(name, latencies[name], elapsed=elapsed, errors=errors[name]) for name in names]
+    # How late requests left the client: a growing lag means the replay itself could not keep the pace
+    results.append(summarize("send lag", send_lags, elapsed=elapsed))
+
+    for name, count in sorted(skipped.items()):
+        print(f"skipped {count:,} x {name}")
+    print(f"{status_mismatches:,} responses differ in status code from the capture")
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("capture", nargs="+", type=pathlib.Path, help="capture files, e.g. one per instance")
+    parser.add_argument("--base-url", required=True, help="instance to replay against")
+    parser.add_argument("--speed", type=float, default=1.0, help="2 replays twice as fast as recorded")
+    parser.add_argument("--users", type=int, default=50, help="users the captured tokens are mapped to")
+    parser.add_argument("--max-connections", type=int, default=256)
+    parser.add_argument("--admin-username")
+    parser.add_argument("--admin-password")
+    parser.add_argument("--output", type=pathlib.Path, help="save the results as JSON")
+    parser.add_argument("--compare", type=pathlib.Path, help="JSON results of an earlier run to compare with")
+    args = parser.parse_args()
+
+    results = asyncio.run(
+        run(
+            capture=args.capture,
+            base_url=args.base_url,
+            speed=args.speed,
+            users=args.users,
+            max_connections=args.max_connections,
+            admin_username=args.admin_username,
+            admin_password=args.admin_password,
+        )
+    )
+
+    print_results(results)
+    if args.output:
+        parameters = {
+            "capture": [str(path) for path in args.capture],
+            "base_url": args.base_url,
+            "speed": args.speed,
+            "users": args.users,
+            "max_connections": args.max_connections,
+        }
+        save_results(args.output, benchmark="replay", parameters=parameters, results=results)
+    if args.compare:
+        print_comparison(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
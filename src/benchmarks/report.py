@@ -0,0 +1,93 @@
+"""Latency summaries and JSON result files shared by the load test and the microbenchmarks."""
+import datetime as dt
+import json
+import pathlib
+import platform
+import statistics
+import subprocess
+import typing
+
+
+def summarize(name: str, latencies: list[float], elapsed: float, errors: int = 0) -> dict[str, typing.Any]:
+    """Throughput and latency percentiles of ``latencies`` (seconds) completed in ``elapsed`` seconds."""
+    if len(latencies) > 1:
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = percentiles[49], percentiles[94], percentiles[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+
+    def to_ms(seconds: float) -> float:
+        return round(seconds * 1000, 4)
+
+    return {
+        "name": name,
+        "operations": len(latencies),
+        "errors": errors,
+        "throughput_per_second": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": to_ms(statistics.fmean(latencies)) if latencies else 0.0,
+            "p50": to_ms(p50),
+            "p95": to_ms(p95),
+            "p99": to_ms(p99),
+            "max": to_ms(max(latencies, default=0.0)),
+        },
+    }
+
+
+def print_results(results: list[dict[str, typing.Any]]) -> None:
+    print(f"{'name':<32}{'ops/s':>12}{'p50 ms':>12}{'p95 ms':>12}{'p99 ms':>12}{'errors':>8}")
+    for result in results:
+        latency = result["latency_ms"]
+        print(
+            f"{result['name']:<32}{result['throughput_per_second']:>12,.1f}"
+            f"{latency['p50']:>12,.3f}{latency['p95']:>12,.3f}{latency['p99']:>12,.3f}{result['errors']:>8}"
+        )
+
+
+def _get_git_commit() -> str | None:
+    completed = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=False)
+    return completed.stdout.strip() or None
+
+
+def save_results(
+    path: pathlib.Path,
+    benchmark: str,
+    parameters: dict[str, typing.Any],
+    results: list[dict[str, typing.Any]],
+) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "benchmark": benchmark,
+        "started_at": dt.datetime.now(tz=dt.timezone.utc).isoformat(),
+        "git_commit": _get_git_commit(),
+        "python": platform.python_version(),
+        "parameters": parameters,
+        "results": results,
+    }
+    path.write_text(json.dumps(document, indent=2))
+
+    print(f"results saved to {path}")
+
+
+def print_comparison(baseline_path: pathlib.Path, results: list[dict[str, typing.Any]]) -> None:
+    """Throughput and p99 change of each result against the same-named one in a saved run."""
+    baseline = {result["name"]: result for result in json.loads(baseline_path.read_text())["results"]}
+
+    print(f"compared to {baseline_path}:")
+    print(f"{'name':<32}{'ops/s':>12}{'p99':>12}")
+    for result in results:
+        previous = baseline.get(result["name"])
+        if previous is None:
+            print(f"{result['name']:<32}{'new':>12}{'new':>12}")
+            continue
+
+        throughput_change = _get_relative_change(previous["throughput_per_second"], result["throughput_per_second"])
+        p99_change = _get_relative_change(previous["latency_ms"]["p99"], result["latency_ms"]["p99"])
+        print(f"{result['name']:<32}{throughput_change:>12}{p99_change:>12}")
+
+
+def _get_relative_change(previous: float, current: float) -> str:
+    if not previous:
+        return "n/a"
+
+    return f"{(current - previous) / previous:+.1%}"
@@ -0,0 +1,80 @@
+"""Response serialization time: FastAPI response_model + JSONResponse vs PydanticResponse.
+
+Usage (from the src directory):
+    python -m benchmarks.serialization --users 100 --iterations 2000
+"""
+import argparse
+import asyncio
+import time
+import typing
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from db.models import User
+from enums import UserRolesEnum
+from schemas.auth import AccessTokenPayloadSchema, TokenPairOutputSchema
+from schemas.user import UserOutputSchema
+from utils.responses import PydanticResponse
+from utils.uuid7 import uuid7
+
+
+def _measure(name: str, render: typing.Callable[[], bytes], iterations: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        render()
+    per_response = (time.perf_counter() - started_at) / iterations
+
+    print(f"  {name}: {per_response * 1_000_000:,.1f} us per response")
+
+    return per_response
+
+
+def _compare(title: str, schema: typing.Any, content: typing.Any, iterations: int, pass_schema: bool) -> None:
+    response_field = create_response_field(name="response", type_=schema)
+    loop = asyncio.new_event_loop()
+
+    def fastapi_default() -> bytes:
+        serialized = loop.run_until_complete(serialize_response(field=response_field, response_content=content))
+        return JSONResponse(serialized).body
+
+    def pydantic_response() -> bytes:
+        return PydanticResponse(content, schema=schema if pass_schema else None).body
+
+    print(title)
+    default_cost = _measure("FastAPI default", fastapi_default, iterations=iterations)
+    pydantic_cost = _measure("PydanticResponse", pydantic_response, iterations=iterations)
+    print(f"  speedup: {default_cost / pydantic_cost:.1f}x")
+
+    loop.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2_000)
+    args = parser.parse_args()
+
+    users = [
+        User(
+            uuid=uuid7(),
+            username=f"user_{i}",
+            full_name=f"User {i}",
+            email=f"user_{i}@example.com",
+            role=UserRolesEnum.STAFF,
+            is_active=True,
+        )
+        for i in range(args.users)
+    ]
+    token_pair = TokenPairOutputSchema(refresh_token="r" * 400, access_token="a" * 400)
+    token_payload = AccessTokenPayloadSchema(sub=str(uuid7()), exp=1_700_000_000)
+
+    _compare(f"GET /users ({args.users} users)", list[UserOutputSchema], users, args.iterations, pass_schema=True)
+    _compare("GET /users/me", UserOutputSchema, users[0], args.iterations, pass_schema=True)
+    _compare("POST /auth/sign-in", TokenPairOutputSchema, token_pair, args.iterations, pass_schema=False)
+    _compare("GET /auth/validate-access", AccessTokenPayloadSchema, token_payload, args.iterations, pass_schema=False)
+
+
+if __name__ == "__main__":
+    main()
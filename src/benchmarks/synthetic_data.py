@@ -0,0 +1,256 @@
+"""Bulk-load synthetic users and jwt sessions with COPY, to benchmark query plans and index sizes at scale.
+
+Users are created evenly over --history-days with time-ordered keys, like rows inserted over time.
+Sessions per user follow a geometric distribution around --sessions-per-user, so most users have a few
+sessions and some have many. --expired-ratio and --denied-ratio set the share of expired and denied
+sessions, --inactive-ratio and --admin-ratio the share of inactive users and admins.
+
+All users have the password given by --password. It is hashed --password-hashes times up front, one
+bcrypt salt per hash, and the hashes are shared round-robin. Refresh tokens are stored in the shape of
+REFRESH_TOKEN_FORMAT: JWT-sized strings with a random signature, or SHA-256 digests for opaque tokens.
+
+Usage (from the src directory, with the docker-compose Postgres running and migrated):
+    python -m benchmarks.synthetic_data --users 1000000 --sessions-per-user 10
+    python -m benchmarks.synthetic_data --users 100000 --prefix scale_ --replace --seed 7
+"""
+import argparse
+import asyncio
+import calendar
+import dataclasses
+import datetime as dt
+import hashlib
+import math
+import random
+import time
+import typing
+import uuid
+
+import orjson
+from sqlalchemy import delete, text
+
+from db.models import JwtSession, User
+from db.postgres import get_engine
+from enums import RefreshTokenFormatEnum, UserRolesEnum
+from services.auth import AuthService
+from settings import get_settings
+from utils.jwt import base64url_encode
+from utils.uuid7 import uuid7_at
+
+USER_COLUMNS = ("uuid", "username", "full_name", "email", "password", "role", "is_active", "created_at", "updated_at")
+JWT_SESSION_COLUMNS = ("uuid", "user_uuid", "refresh_token", "expires_at", "is_denied", "created_at", "updated_at")
+
+FIRST_NAMES = ("Alex", "Maria", "Ivan", "Olga", "John", "Anna", "Pavel", "Elena", "Sam", "Nina", "Omar", "Yuki")
+LAST_NAMES = ("Smith", "Ivanova", "Garcia", "Chen", "Kowalski", "Novak", "Petrov", "Silva", "Kim", "Müller")
+EMAIL_DOMAINS = ("example.com", "example.org", "example.net")
+
+JWT_HEADER = base64url_encode(orjson.dumps({"alg": "RS256", "typ": "JWT"})).decode()
+RSA_2048_SIGNATURE_BYTES = 256
+
+
+@dataclasses.dataclass(frozen=True)
+class DataShape:
+    users: int
+    sessions_per_user: float
+    inactive_ratio: float
+    admin_ratio: float
+    expired_ratio: float
+    denied_ratio: float
+    history_days: int
+    refresh_token_expire_days: int
+    refresh_token_format: RefreshTokenFormatEnum
+
+
+def _get_session_count(rng: random.Random, mean: float) -> int:
+    # Geometric distribution on 0, 1, 2, ... with the given mean
+    if mean <= 0:
+        return 0
+
+    return int(math.log(1.0 - rng.random()) / math.log(mean / (mean + 1.0)))
+
+
+def _get_refresh_token(rng: random.Random, user_uuid: uuid.UUID, expires_at: dt.datetime, shape: DataShape) -> str:
+    if shape.refresh_token_format == RefreshTokenFormatEnum.OPAQUE:
+        return hashlib.sha256(rng.randbytes(32)).hexdigest()
+
+    payload = base64url_encode(orjson.dumps({"sub": str(user_uuid), "exp": calendar.timegm(expires_at.utctimetuple())}))
+    signature = base64url_encode(rng.randbytes(RSA_2048_SIGNATURE_BYTES))
+
+    return f"{JWT_HEADER}.{payload.decode()}.{signature.decode()}"
+
+
+def _generate_batch(
+    rng: random.Random,
+    first_user: int,
+    last_user: int,
+    shape: DataShape,
+    prefix: str,
+    password_hashes: list[str],
+    now: dt.datetime,
+) -> tuple[list[tuple[typing.Any, ...]], list[tuple[typing.Any, ...]]]:
+    history_start = now - dt.timedelta(days=shape.history_days)
+    refresh_token_lifetime = dt.timedelta(days=shape.refresh_token_expire_days)
+    users, jwt_sessions = [], []
+
+    for i in range(first_user, last_user):
+        created_at = history_start + (now - history_start) * (i / shape.users)
+        user_uuid = uuid7_at(int(created_at.timestamp() * 1000), rand=rng.getrandbits(74))
+        if rng.random() < shape.admin_ratio:
+            role = UserRolesEnum.ADMIN
+        else:
+            role = UserRolesEnum.STAFF
+
+        users.append(
+            (
+                user_uuid,
+                f"{prefix}{i}",
+                f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                f"{prefix}{i}@{rng.choice(EMAIL_DOMAINS)}",
+                password_hashes[i % len(password_hashes)],
+                role.value,
+                rng.random() >= shape.inactive_ratio,
+                created_at,
+                created_at,
+            )
+        )
+
+        for _ in range(_get_session_count(rng, shape.sessions_per_user)):
+            # Expired sessions started more than one refresh token lifetime ago, live ones within it
+            if rng.random() < shape.expired_ratio:
+                earliest_start, latest_start = created_at, max(created_at, now - refresh_token_lifetime)
+            else:
+                earliest_start, latest_start = max(created_at, now - refresh_token_lifetime), now
+            session_created_at = earliest_start + (latest_start - earliest_start) * rng.random()
+            expires_at = session_created_at + refresh_token_lifetime
+
+            jwt_sessions.append(
+                (
+                    uuid7_at(int(session_created_at.timestamp() * 1000), rand=rng.getrandbits(74)),
+                    user_uuid,
+                    _get_refresh_token(rng, user_uuid, expires_at, shape),
+                    expires_at,
+                    rng.random() < shape.denied_ratio,
+                    session_created_at,
+                    session_created_at,
+                )
+            )
+
+    return users, jwt_sessions
+
+
+async def _print_sizes() -> None:
+    async with get_engine().connect() as conn:
+        await conn.execute(text(f"ANALYZE {User.__tablename__}, {JwtSession.__tablename__}"))
+        rows = await conn.execute(
+            text(
+                """
+                SELECT relname, indexrelname, pg_size_pretty(pg_relation_size(indexrelid))
+                FROM pg_stat_user_indexes
+                WHERE relname IN (:users, :jwt_sessions)
+                ORDER BY relname, indexrelname
+                """
+            ),
+            {"users": User.__tablename__, "jwt_sessions": JwtSession.__tablename__},
+        )
+        for table, index, size in rows:
+            print(f"  {table}.{index}: {size}")
+
+        for table in (User.__tablename__, JwtSession.__tablename__):
+            rows_count = await conn.scalar(text(f"SELECT count(*) FROM {table}"))
+            size = await conn.scalar(text(f"SELECT pg_size_pretty(pg_table_size('{table}'))"))
+            print(f"  {table}: {rows_count:,} rows, {size} without indexes")
+
+
+async def _delete_users(prefix: str) -> None:
+    async with get_engine().begin() as conn:
+        # Sessions go with their users through ON DELETE CASCADE
+        await conn.execute(delete(User).where(User.username.startswith(prefix, autoescape=True)))
+
+
+async def run(
+    shape: DataShape,
+    prefix: str,
+    replace: bool,
+    password: str,
+    password_hashes: int,
+    batch_size: int,
+    seed: int,
+) -> None:
+    rng = random.Random(seed)
+    now = dt.datetime.now(tz=dt.timezone.utc)
+    # A bcrypt hash per user would take longer than the whole load, so users share a few salted hashes
+    hashes = [AuthService.hash_password(password) for _ in range(password_hashes)]
+
+    if replace:
+        await _delete_users(prefix)
+
+    async with get_engine().connect() as conn:
+        connection = (await conn.get_raw_connection()).driver_connection
+
+        started_at = time.perf_counter()
+        users_count = jwt_sessions_count = 0
+        for first_user in range(0, shape.users, batch_size):
+            last_user = min(first_user + batch_size, shape.users)
+            users, jwt_sessions = _generate_batch(rng, first_user, last_user, shape, prefix, hashes, now)
+
+            async with connection.transaction():
+                await connection.copy_records_to_table(User.__tablename__, records=users, columns=USER_COLUMNS)
+                await connection.copy_records_to_table(
+                    JwtSession.__tablename__, records=jwt_sessions, columns=JWT_SESSION_COLUMNS
+                )
+
+            users_count += len(users)
+            jwt_sessions_count += len(jwt_sessions)
+            elapsed = time.perf_counter() - started_at
+            print(f"{users_count:,} users, {jwt_sessions_count:,} sessions, {users_count / elapsed:,.0f} users/s")
+
+    print(f"loaded in {time.perf_counter() - started_at:.1f}s")
+    await _print_sizes()
+    await get_engine().dispose()
+
+
+def main() -> None:
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--sessions-per-user", type=float, default=10.0, help="mean of the geometric distribution")
+    parser.add_argument("--inactive-ratio", type=float, default=0.05)
+    parser.add_argument("--admin-ratio", type=float, default=0.001)
+    parser.add_argument("--expired-ratio", type=float, default=0.6)
+    parser.add_argument("--denied-ratio", type=float, default=0.05)
+    parser.add_argument("--history-days", type=int, default=730)
+    parser.add_argument("--prefix", default="synthetic_", help="username prefix of the generated users")
+    parser.add_argument("--replace", action="store_true", help="delete users with the prefix before loading")
+    parser.add_argument("--password", default="synthetic-password")
+    parser.add_argument("--password-hashes", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=10_000, help="users per COPY transaction")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    shape = DataShape(
+        users=args.users,
+        sessions_per_user=args.sessions_per_user,
+        inactive_ratio=args.inactive_ratio,
+        admin_ratio=args.admin_ratio,
+        expired_ratio=args.expired_ratio,
+        denied_ratio=args.denied_ratio,
+        history_days=args.history_days,
+        refresh_token_expire_days=settings.REFRESH_TOKEN_EXPIRE_DAYS,
+        refresh_token_format=settings.REFRESH_TOKEN_FORMAT,
+    )
+
+    asyncio.run(
+        run(
+            shape,
+            prefix=args.prefix,
+            replace=args.replace,
+            password=args.password,
+            password_hashes=args.password_hashes,
+            batch_size=args.batch_size,
+            seed=args.seed,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""CPU cost of minting the sign-in token pair: python-jose vs the cached-key JwtMinter.
+
+Usage (from the src directory):
+    python -m benchmarks.token_minting --iterations 2000
+"""
+import argparse
+import calendar
+import datetime as dt
+import time
+import typing
+import uuid
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwt
+
+from schemas.auth import AccessTokenPayloadSchema, RefreshTokenPayloadSchema
+from utils.jwt import JwtMinter
+
+
+def _measure(name: str, mint_token_pair: typing.Callable[[], tuple[str, str]], iterations: int) -> float:
+    started_at = time.process_time()
+    for _ in range(iterations):
+        mint_token_pair()
+    per_sign_in = (time.process_time() - started_at) / iterations
+
+    print(f"{name}: {per_sign_in * 1_000_000:,.0f} us CPU per sign-in")
+
+    return per_sign_in
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2_000)
+    args = parser.parse_args()
+
+    private_key = (
+        rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        .private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+        .decode()
+    )
+    user_uuid = str(uuid.uuid4())
+    now = dt.datetime.now(tz=dt.timezone.utc)
+    refresh_exp = calendar.timegm((now + dt.timedelta(days=30)).utctimetuple())
+    access_exp = calendar.timegm((now + dt.timedelta(minutes=30)).utctimetuple())
+
+    def jose_token_pair() -> tuple[str, str]:
+        return (
+            jwt.encode(
+                claims=RefreshTokenPayloadSchema(sub=user_uuid, exp=refresh_exp).model_dump(),
+                key=private_key,
+                algorithm="RS256",
+            ),
+            jwt.encode(
+                claims=AccessTokenPayloadSchema(sub=user_uuid, exp=access_exp).model_dump(),
+                key=private_key,
+                algorithm="RS256",
+            ),
+        )
+
+    minter = JwtMinter(private_key=private_key)
+
+    def minter_token_pair() -> tuple[str, str]:
+        return (
+            minter.encode({"sub": user_uuid, "exp": refresh_exp}),
+            minter.encode({"sub": user_uuid, "exp": access_exp}),
+        )
+
+    if jose_token_pair() != minter_token_pair():
+        raise AssertionError("JwtMinter output differs from python-jose")
+
+    jose_cost = _measure("python-jose", jose_token_pair, iterations=args.iterations)
+    minter_cost = _measure("JwtMinter", minter_token_pair, iterations=args.iterations)
+
+    print(f"saved: {(jose_cost - minter_cost) * 1_000_000:,.0f} us CPU per sign-in ({jose_cost / minter_cost:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
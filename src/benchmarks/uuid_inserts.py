@@ -0,0 +1,64 @@
+"""Insert throughput of random (v4) vs time-ordered (v7) UUID primary keys.
+
+Usage (from the src directory, with the docker-compose Postgres running):
+    python -m benchmarks.uuid_inserts --rows 200000 --batch-size 1000
+"""
+import argparse
+import asyncio
+import time
+import typing
+import uuid
+
+from sqlalchemy import Column, DateTime, MetaData, Table, func, select, text
+from sqlalchemy.dialects.postgresql import UUID
+
+from db.postgres import get_engine
+from utils.uuid7 import uuid7
+
+metadata = MetaData()
+
+
+def _get_table(name: str) -> Table:
+    return Table(
+        name,
+        metadata,
+        Column("uuid", UUID(as_uuid=True), primary_key=True),
+        Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    )
+
+
+async def _run(name: str, generate: typing.Callable[[], uuid.UUID], rows: int, batch_size: int) -> None:
+    table = _get_table(name)
+    engine = get_engine()
+
+    async with engine.begin() as conn:
+        await conn.run_sync(table.drop, checkfirst=True)
+        await conn.run_sync(table.create)
+
+    started_at = time.perf_counter()
+    for _ in range(0, rows, batch_size):
+        async with engine.begin() as conn:
+            await conn.execute(table.insert(), [{"uuid": generate()} for _ in range(batch_size)])
+    elapsed = time.perf_counter() - started_at
+
+    async with engine.begin() as conn:
+        index_size = await conn.scalar(select(func.pg_size_pretty(func.pg_relation_size(text(f"'{name}_pkey'")))))
+        await conn.run_sync(table.drop)
+
+    print(f"{name}: {rows / elapsed:,.0f} rows/s, {elapsed:.2f}s total, primary key index {index_size}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    args = parser.parse_args()
+
+    await _run("benchmark_uuid4", uuid.uuid4, rows=args.rows, batch_size=args.batch_size)
+    await _run("benchmark_uuid7", uuid7, rows=args.rows, batch_size=args.batch_size)
+
+    await get_engine().dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
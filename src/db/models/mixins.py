@@ -5,9 +5,11 @@ from sqlalchemy import DateTime, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
+from utils.uuid7 import uuid7
+
 
 class UUIDMixin:
-    uuid: Mapped[_uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=_uuid.uuid4, unique=True)
+    uuid: Mapped[_uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
 
 
 class CreatedAtUpdatedAtMixin:
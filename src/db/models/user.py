@@ -1,6 +1,6 @@
 import typing
 
-from sqlalchemy import Boolean, Enum, String, Text
+from sqlalchemy import Boolean, Enum, Index, String, Text, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from db.models.base import BaseModel
@@ -13,10 +13,32 @@ if typing.TYPE_CHECKING:
 
 class User(BaseModel, UUIDMixin, CreatedAtUpdatedAtMixin):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("users_username_lower_key", func.lower(text("username")), unique=True),
+        Index("users_email_lower_key", func.lower(text("email")), unique=True),
+        Index(
+            "users_username_trgm_idx",
+            "username",
+            postgresql_using="gin",
+            postgresql_ops={"username": "gin_trgm_ops"},
+        ),
+        Index(
+            "users_email_trgm_idx",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+        ),
+        Index(
+            "users_full_name_trgm_idx",
+            "full_name",
+            postgresql_using="gin",
+            postgresql_ops={"full_name": "gin_trgm_ops"},
+        ),
+    )
 
-    username: Mapped[str] = mapped_column(String(length=255), nullable=False, unique=True)
+    username: Mapped[str] = mapped_column(String(length=255), nullable=False)
     full_name: Mapped[str | None] = mapped_column(String(length=255), default=None, nullable=True)
-    email: Mapped[str | None] = mapped_column(String(length=255), default=None, nullable=True, unique=True)
+    email: Mapped[str | None] = mapped_column(String(length=255), default=None, nullable=True)
 
     password: Mapped[str] = mapped_column(Text, nullable=False)
 
@@ -1,27 +1,85 @@
 import functools
+import time
 import typing
 
-from sqlalchemy import URL
+from sqlalchemy import URL, event
+from sqlalchemy.engine import Connection, ExecutionContext
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
 
+from monitoring.metrics import (
+    DB_POOL_CHECKOUT_WAIT,
+    DB_STATEMENT_DURATION,
+    get_sql_operation_label,
+)
 from settings import get_settings
 
 
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    @property
+    def max_overflow(self) -> int:
+        return self._max_overflow
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started_at)
+
+
+def _before_cursor_execute(
+    conn: Connection,
+    cursor: typing.Any,
+    statement: str,
+    parameters: typing.Any,
+    context: ExecutionContext,
+    executemany: bool,
+) -> None:
+    # Kept on the statement's own context: a start time on the connection would outlive a failed statement
+    context.statement_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn: Connection,
+    cursor: typing.Any,
+    statement: str,
+    parameters: typing.Any,
+    context: ExecutionContext,
+    executemany: bool,
+) -> None:
+    duration = time.perf_counter() - context.statement_started_at
+    DB_STATEMENT_DURATION.labels(get_sql_operation_label(statement)).observe(duration)
+
+
 @functools.lru_cache
 def get_engine(url: str | URL | None = None, **kwargs) -> AsyncEngine:
-    return create_async_engine(url or get_settings().postgres_dsn, echo=False, future=True, **kwargs)
+    settings = get_settings()
+
+    kwargs.setdefault("poolclass", InstrumentedAsyncAdaptedQueuePool)
+    kwargs.setdefault("pool_size", settings.POSTGRES_POOL_SIZE)
+    kwargs.setdefault("max_overflow", settings.POSTGRES_MAX_OVERFLOW)
+    engine = create_async_engine(url or settings.postgres_dsn, echo=False, future=True, **kwargs)
 
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
 
+    return engine
+
+
+@functools.lru_cache
 def get_async_session(url: str | URL | None = None) -> async_sessionmaker[AsyncSession]:
     return async_sessionmaker(get_engine(url or get_settings().postgres_dsn), expire_on_commit=False)
 
 
 async def get_session() -> typing.AsyncGenerator[AsyncSession, None]:
-    async_session = get_async_session()
-    async with async_session() as session:
+    # The session checks a connection out of the pool only when its first statement runs, so requests
+    # that never query, e.g. a JWT refresh token validation, never touch the pool
+    async with get_async_session()() as session:
         yield session
@@ -1,18 +1,51 @@
 import functools
+import time
 import typing
 
-from redis.asyncio import Redis, from_url
+from opentelemetry.trace import SpanKind
+from redis.asyncio import Redis
 
+from monitoring.metrics import OTHER_LABEL, REDIS_COMMAND_DURATION
+from monitoring.tracing import tracer
 from settings import get_settings
 
+# Commands issued by the repositories; anything else is reported as OTHER to keep the label set bounded
+INSTRUMENTED_REDIS_COMMANDS = frozenset(
+    {"GET", "SET", "DEL", "EXISTS", "EXPIRE", "PING", "EVALSHA", "EVAL", "SCRIPT", "XADD", "XREAD", "XREVRANGE"}
+)
+
+
+class InstrumentedRedis(Redis):
+    async def execute_command(self, *args: typing.Any, **options: typing.Any) -> typing.Any:
+        command = str(args[0]).upper()
+        command_label = command if command in INSTRUMENTED_REDIS_COMMANDS else OTHER_LABEL
+
+        with tracer.start_as_current_span(f"redis {command_label}", kind=SpanKind.CLIENT) as span:
+            span.set_attribute("db.system", "redis")
+            span.set_attribute("db.operation", command_label)
+
+            started_at = time.perf_counter()
+            try:
+                return await super().execute_command(*args, **options)
+
+            finally:
+                REDIS_COMMAND_DURATION.labels(command_label).observe(time.perf_counter() - started_at)
+
+
 AsyncRedis: typing.TypeAlias = Redis
 
 
 @functools.lru_cache
 def get_redis_connection() -> AsyncRedis:
-    return from_url(get_settings().REDIS_DSN, encoding="utf-8", decode_responses=True)
+    return InstrumentedRedis.from_url(get_settings().REDIS_DSN, encoding="utf-8", decode_responses=True)
+
+
+@functools.lru_cache
+def get_redis_stream_connection() -> AsyncRedis:
+    # Blocking stream reads hold a connection while they wait: their own pool keeps them from starving requests
+    return InstrumentedRedis.from_url(get_settings().REDIS_DSN, encoding="utf-8", decode_responses=True)
 
 
 async def get_redis() -> typing.AsyncGenerator[AsyncRedis, None]:
-    async with get_redis_connection() as redis:
-        yield redis
+    # The client and its connection pool are shared by the process and closed on app shutdown
+    yield get_redis_connection()
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.postgres import get_session
 from db.redis import AsyncRedis, get_redis
+from monitoring.tracing import traced
 from schemas.base import RedisKeySchema, RedisModelSchema
 
 
@@ -21,6 +22,7 @@ class BaseRedisRepository:
     def __init__(self, redis_client: AsyncRedis = Depends(get_redis)) -> None:
         self._redis_client = redis_client
 
+    @traced
     async def get(self, pk: _uuid.UUID) -> RedisModelSchema | None:
         value = await self._redis_client.get(self._key_schema.get_key(pk))
         if value is None:
@@ -28,6 +30,7 @@ class BaseRedisRepository:
 
         return self._model_schema.model_validate_json(value)
 
+    @traced
     async def save(self, instance: RedisModelSchema, expire_seconds: int | None = None) -> None:
         if not isinstance(instance, self._model_schema):
             raise ValueError("Instance is not instance of repository model schema")
@@ -38,5 +41,6 @@ class BaseRedisRepository:
         if expire_seconds:
             await self._redis_client.expire(name=instance_key, time=expire_seconds)
 
+    @traced
     async def delete(self, pk: _uuid.UUID) -> None:
         await self._redis_client.delete(self._key_schema.get_key(pk))
@@ -0,0 +1,377 @@
+"""Dict-backed stand-ins for the Postgres and Redis repositories, for tests and benchmarks without I/O.
+
+Writes are applied immediately: commit and rollback of ``InMemorySession`` only matter for models added
+with ``add``, the way the test factories create rows.
+"""
+import asyncio
+import dataclasses
+import datetime as dt
+import time
+import typing
+import uuid as _uuid
+
+from fastapi import FastAPI
+from loguru import logger
+
+from db.models import JwtSession, User
+from db.postgres import get_session
+from db.repositories.base import BaseRedisRepository
+from db.repositories.jwt import JwtPublicKeyRepository
+from db.repositories.jwt_session import (
+    JwtSessionRepository,
+    get_jwt_session_repository,
+    get_jwt_session_writer,
+)
+from db.repositories.revocation import (
+    FIRST_EVENT_ID,
+    RevocationEventRepository,
+    get_revocation_event_repository,
+    get_revocation_event_stream_repository,
+)
+from db.repositories.user import UserRepository, get_user_repository
+from enums import UserRolesEnum, UserSearchModeEnum
+from exceptions import CreateUserException
+from schemas.base import RedisModelSchema
+from schemas.jwt_session import JwtSessionCreateSchema
+from schemas.revocation import RevocationEventSchema
+from schemas.user import UserChangeSchema, UserCreateSchema
+from services.token import TokenVerifier, get_token_verifier
+from settings import get_settings
+from utils.uuid7 import uuid7
+
+
+@dataclasses.dataclass
+class InMemoryStore:
+    """Rows indexed like the tables they stand in for: users by uuid and lower-cased username and email,
+    jwt sessions by refresh token and user uuid, Redis values by key with their expiry and the revocation
+    event stream as (id, JSON) entries."""
+
+    users: dict[_uuid.UUID, User] = dataclasses.field(default_factory=dict)
+    user_uuids_by_username: dict[str, _uuid.UUID] = dataclasses.field(default_factory=dict)
+    user_uuids_by_email: dict[str, _uuid.UUID] = dataclasses.field(default_factory=dict)
+    jwt_sessions: dict[str, JwtSession] = dataclasses.field(default_factory=dict)
+    refresh_tokens_by_user_uuid: dict[_uuid.UUID, set[str]] = dataclasses.field(default_factory=dict)
+    redis_values: dict[str, tuple[str, float | None]] = dataclasses.field(default_factory=dict)
+    revocation_events: list[tuple[str, str]] = dataclasses.field(default_factory=list)
+
+    def insert_user(self, user: User) -> User:
+        self._check_user_is_unique(user.username, user.email)
+
+        now = dt.datetime.now(tz=dt.timezone.utc)
+        user.uuid = user.uuid or uuid7()
+        user.role = user.role or UserRolesEnum.STAFF
+        user.is_active = bool(user.is_active)
+        user.created_at = user.created_at or now
+        user.updated_at = user.updated_at or now
+
+        self.users[user.uuid] = user
+        self._index_user(user)
+
+        return user
+
+    def update_user(self, user: User, changes: dict[str, typing.Any]) -> User:
+        self._unindex_user(user)
+        try:
+            self._check_user_is_unique(changes.get("username", user.username), changes.get("email", user.email))
+
+        except ValueError:
+            self._index_user(user)
+            raise
+
+        for field, value in changes.items():
+            setattr(user, field, value)
+        user.updated_at = dt.datetime.now(tz=dt.timezone.utc)
+        self._index_user(user)
+
+        return user
+
+    def delete_user(self, user_uuid: _uuid.UUID) -> User | None:
+        user = self.users.pop(user_uuid, None)
+        if user is None:
+            return None
+
+        self._unindex_user(user)
+        self.delete_jwt_sessions(user_uuid)
+
+        return user
+
+    def _check_user_is_unique(self, username: str, email: str | None) -> None:
+        if username.lower() in self.user_uuids_by_username or (email and email.lower() in self.user_uuids_by_email):
+            raise ValueError("User with this username or email already exists")
+
+    def _index_user(self, user: User) -> None:
+        self.user_uuids_by_username[user.username.lower()] = user.uuid
+        if user.email:
+            self.user_uuids_by_email[user.email.lower()] = user.uuid
+
+    def _unindex_user(self, user: User) -> None:
+        self.user_uuids_by_username.pop(user.username.lower(), None)
+        if user.email:
+            self.user_uuids_by_email.pop(user.email.lower(), None)
+
+    def insert_jwt_session(self, jwt_session: JwtSession) -> JwtSession:
+        if jwt_session.refresh_token in self.jwt_sessions:
+            raise ValueError("Jwt session with this refresh token already exists")
+        if jwt_session.user_uuid not in self.users:
+            raise ValueError("Jwt session user does not exist")
+
+        now = dt.datetime.now(tz=dt.timezone.utc)
+        jwt_session.uuid = jwt_session.uuid or uuid7()
+        jwt_session.is_denied = bool(jwt_session.is_denied)
+        jwt_session.created_at = jwt_session.created_at or now
+        jwt_session.updated_at = jwt_session.updated_at or now
+
+        self.jwt_sessions[jwt_session.refresh_token] = jwt_session
+        self.refresh_tokens_by_user_uuid.setdefault(jwt_session.user_uuid, set()).add(jwt_session.refresh_token)
+
+        return jwt_session
+
+    def delete_jwt_sessions(self, user_uuid: _uuid.UUID) -> list[_uuid.UUID]:
+        deleted_jwt_sessions = [
+            self.jwt_sessions.pop(refresh_token)
+            for refresh_token in self.refresh_tokens_by_user_uuid.pop(user_uuid, set())
+            if refresh_token in self.jwt_sessions
+        ]
+        return [jwt_session.uuid for jwt_session in deleted_jwt_sessions]
+
+    def insert(self, instance: typing.Any) -> None:
+        if isinstance(instance, User):
+            self.insert_user(instance)
+        elif isinstance(instance, JwtSession):
+            self.insert_jwt_session(instance)
+        else:
+            raise TypeError(f"{type(instance).__name__} is not stored in memory")
+
+
+class InMemorySession:
+    """The part of ``AsyncSession`` the services and test factories use."""
+
+    def __init__(self, store: InMemoryStore) -> None:
+        self._store = store
+        self._pending: list[typing.Any] = []
+
+    def add(self, instance: typing.Any) -> None:
+        self._pending.append(instance)
+
+    async def flush(self) -> None:
+        pending, self._pending = self._pending, []
+        for instance in pending:
+            self._store.insert(instance)
+
+    async def commit(self) -> None:
+        await self.flush()
+
+    async def rollback(self) -> None:
+        self._pending.clear()
+
+    async def refresh(self, instance: typing.Any) -> None:
+        pass
+
+    async def close(self) -> None:
+        self._pending.clear()
+
+
+class InMemoryUserRepository(UserRepository):
+    def __init__(self, store: InMemoryStore) -> None:
+        self._store = store
+
+    async def get_active_user_by_username(self, username: str) -> User | None:
+        user_uuid = self._store.user_uuids_by_username.get(username.lower())
+        user = self._store.users.get(user_uuid) if user_uuid else None
+
+        return user if user and user.is_active else None
+
+    async def get_active_user_with_not_denied_sessions_by_uuid(self, uuid: _uuid.UUID) -> User | None:
+        user = self._store.users.get(uuid)
+        if user is None or not user.is_active:
+            return None
+
+        refresh_tokens = self._store.refresh_tokens_by_user_uuid.get(uuid, set())
+        if all(self._store.jwt_sessions[refresh_token].is_denied for refresh_token in refresh_tokens):
+            return None
+
+        return user
+
+    async def create_user(self, data: UserCreateSchema) -> User:
+        try:
+            return self._store.insert_user(User(**data.model_dump(exclude_unset=True)))
+
+        except ValueError as e:
+            logger.error("Create user exception", event="user.create_failed", error=str(e))
+            raise CreateUserException
+
+    async def get_all_users(self) -> typing.Sequence[User]:
+        return sorted(self._store.users.values(), key=lambda user: user.uuid)
+
+    async def search_users(
+        self,
+        query: str,
+        mode: UserSearchModeEnum,
+        limit: int,
+        after_uuid: _uuid.UUID | None = None,
+    ) -> typing.Sequence[User]:
+        query = query.lower()
+
+        def is_match(value: str | None) -> bool:
+            if value is None:
+                return False
+            if mode == UserSearchModeEnum.PREFIX:
+                return value.lower().startswith(query)
+            return query in value.lower()
+
+        users = [
+            user
+            for user in await self.get_all_users()
+            if (after_uuid is None or user.uuid > after_uuid)
+            and any(is_match(value) for value in (user.username, user.email, user.full_name))
+        ]
+
+        return users[:limit]
+
+    async def get_user_by_uuid(self, user_uuid: _uuid.UUID) -> User | None:
+        return self._store.users.get(user_uuid)
+
+    async def change_user_by_uuid(
+        self,
+        user_uuid: _uuid.UUID,
+        user_data: UserChangeSchema,
+    ) -> User | None:
+        user = self._store.users.get(user_uuid)
+        if user is None:
+            return None
+
+        return self._store.update_user(user, user_data.model_dump(exclude_unset=True))
+
+    async def delete_user_by_uuid(self, user_uuid: _uuid.UUID) -> User | None:
+        return self._store.delete_user(user_uuid)
+
+
+class InMemoryJwtSessionRepository(JwtSessionRepository):
+    def __init__(self, store: InMemoryStore) -> None:
+        self._store = store
+
+    async def create_jwt_session(self, data: JwtSessionCreateSchema) -> JwtSession:
+        return self._store.insert_jwt_session(JwtSession(**data.model_dump()))
+
+    async def get_jwt_session_with_user_by_refresh_token(self, refresh_token: str) -> JwtSession | None:
+        jwt_session = self._store.jwt_sessions.get(refresh_token)
+        if jwt_session is not None:
+            jwt_session.user = self._store.users[jwt_session.user_uuid]
+
+        return jwt_session
+
+    async def delete_jwt_session_by_user_uuid(self, user_uuid: _uuid.UUID) -> list[_uuid.UUID]:
+        return self._store.delete_jwt_sessions(user_uuid)
+
+
+class InMemoryRedisRepository(BaseRedisRepository):
+    def __init__(self, store: InMemoryStore) -> None:
+        self._store = store
+
+    async def get(self, pk: _uuid.UUID) -> RedisModelSchema | None:
+        key = self._key_schema.get_key(pk)
+        value, expires_at = self._store.redis_values.get(key, (None, None))
+        if value is None:
+            return None
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._store.redis_values[key]
+            return None
+
+        return self._model_schema.model_validate_json(value)
+
+    async def save(self, instance: RedisModelSchema, expire_seconds: int | None = None) -> None:
+        if not isinstance(instance, self._model_schema):
+            raise ValueError("Instance is not instance of repository model schema")
+
+        expires_at = time.monotonic() + expire_seconds if expire_seconds else None
+        self._store.redis_values[self._key_schema.get_key(instance.pk)] = (instance.model_dump_json(), expires_at)
+
+    async def delete(self, pk: _uuid.UUID) -> None:
+        self._store.redis_values.pop(self._key_schema.get_key(pk), None)
+
+
+class InMemoryJwtPublicKeyRepository(JwtPublicKeyRepository, InMemoryRedisRepository):
+    pass
+
+
+class InMemoryRevocationEventRepository(RevocationEventRepository):
+    def __init__(self, store: InMemoryStore) -> None:
+        self._store = store
+
+    async def publish(self, event: RevocationEventSchema, min_event_id: str) -> str:
+        timestamp_ms, sequence = int(time.time() * 1000), 0
+        if self._store.revocation_events:
+            last_timestamp_ms, last_sequence = _parse_event_id(self._store.revocation_events[-1][0])
+            if last_timestamp_ms >= timestamp_ms:
+                timestamp_ms, sequence = last_timestamp_ms, last_sequence + 1
+
+        event_id = f"{timestamp_ms}-{sequence}"
+        self._store.revocation_events = [
+            entry
+            for entry in self._store.revocation_events
+            if _parse_event_id(entry[0]) >= _parse_event_id(min_event_id)
+        ]
+        self._store.revocation_events.append((event_id, event.model_dump_json()))
+
+        return event_id
+
+    async def get_last_event_id(self) -> str:
+        return self._store.revocation_events[-1][0] if self._store.revocation_events else FIRST_EVENT_ID
+
+    async def read(
+        self,
+        after_event_id: str,
+        count: int,
+        block_seconds: float,
+    ) -> list[tuple[str, RevocationEventSchema]]:
+        events = [
+            (event_id, RevocationEventSchema.model_validate_json(data))
+            for event_id, data in self._store.revocation_events
+            if _parse_event_id(event_id) > _parse_event_id(after_event_id)
+        ][:count]
+        if not events:
+            await asyncio.sleep(block_seconds)
+
+        return events
+
+
+def _parse_event_id(event_id: str) -> tuple[int, int]:
+    timestamp_ms, _, sequence = event_id.partition("-")
+    return int(timestamp_ms), int(sequence or 0)
+
+
+def use_in_memory_repositories(app: FastAPI, store: InMemoryStore) -> None:
+    """Serve the app's repositories and sessions from ``store`` through dependency overrides."""
+    jwt_session_repository = InMemoryJwtSessionRepository(store=store)
+    token_verifier = TokenVerifier(
+        settings=get_settings(), jwt_public_key_repository=InMemoryJwtPublicKeyRepository(store=store)
+    )
+
+    # Async providers like the ones they replace: plain callables would cost a thread pool hop each
+    async def get_in_memory_session() -> InMemorySession:
+        return InMemorySession(store=store)
+
+    async def get_in_memory_user_repository() -> InMemoryUserRepository:
+        return InMemoryUserRepository(store=store)
+
+    async def get_in_memory_jwt_session_repository() -> InMemoryJwtSessionRepository:
+        return jwt_session_repository
+
+    async def get_in_memory_token_verifier() -> TokenVerifier:
+        return token_verifier
+
+    async def get_in_memory_revocation_event_repository() -> InMemoryRevocationEventRepository:
+        return InMemoryRevocationEventRepository(store=store)
+
+    app.dependency_overrides.update(
+        {
+            get_session: get_in_memory_session,
+            get_user_repository: get_in_memory_user_repository,
+            get_jwt_session_repository: get_in_memory_jwt_session_repository,
+            # Group commit has nothing to batch in memory: sessions are written one by one
+            get_jwt_session_writer: get_in_memory_jwt_session_repository,
+            get_token_verifier: get_in_memory_token_verifier,
+            get_revocation_event_repository: get_in_memory_revocation_event_repository,
+            get_revocation_event_stream_repository: get_in_memory_revocation_event_repository,
+        }
+    )
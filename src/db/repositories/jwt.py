@@ -1,8 +1,18 @@
+import functools
+import uuid as _uuid
+
 from db.repositories.base import BaseRedisRepository
-from schemas.base import RedisKeySchema
+from schemas.base import RedisKeySchema, RedisModelSchema
 from schemas.jwt import JwtPublicKeySchema
+from utils.singleflight import SingleFlight
 
 
 class JwtPublicKeyRepository(BaseRedisRepository):
     _key_schema = RedisKeySchema(prefix="jwt_public_key")
     _model_schema = JwtPublicKeySchema
+
+    # Every token verification reads the same key: concurrent reads share one Redis GET
+    _lookups: SingleFlight[_uuid.UUID, RedisModelSchema | None] = SingleFlight("jwt_public_key")
+
+    async def get(self, pk: _uuid.UUID) -> RedisModelSchema | None:
+        return await self._lookups.do(pk, functools.partial(super().get, pk))
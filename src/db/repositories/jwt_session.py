@@ -1,13 +1,25 @@
+import asyncio
+import contextlib
+import functools
+import typing
 import uuid as _uuid
 
-from sqlalchemy import delete, insert
+from fastapi import Depends
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from db.models import JwtSession
+from db.postgres import get_async_session, get_session
 from db.repositories.base import BaseDatabaseRepository
+from monitoring.tracing import traced
 from schemas.jwt_session import JwtSessionCreateSchema
+from settings import get_settings
 
 
 class JwtSessionRepository(BaseDatabaseRepository):
+    @traced
     async def create_jwt_session(self, data: JwtSessionCreateSchema) -> JwtSession:
         stmt = insert(JwtSession).values(**data.model_dump()).returning(JwtSession)
 
@@ -16,8 +28,148 @@ class JwtSessionRepository(BaseDatabaseRepository):
 
         return jwt_session
 
-    async def delete_jwt_session_by_user_uuid(self, user_uuid: _uuid.UUID) -> None:
-        stmt = delete(JwtSession).filter_by(user_uuid=user_uuid)
+    @traced
+    async def get_jwt_session_with_user_by_refresh_token(self, refresh_token: str) -> JwtSession | None:
+        stmt = select(JwtSession).filter_by(refresh_token=refresh_token).options(joinedload(JwtSession.user))
 
-        await self._session.execute(stmt)
+        jwt_session = await self._session.scalar(stmt)
+
+        return jwt_session
+
+    @traced
+    async def delete_jwt_session_by_user_uuid(self, user_uuid: _uuid.UUID) -> list[_uuid.UUID]:
+        stmt = delete(JwtSession).filter_by(user_uuid=user_uuid).returning(JwtSession.uuid)
+
+        deleted_jwt_session_uuids = (await self._session.scalars(stmt)).all()
         await self._session.flush()
+
+        return list(deleted_jwt_session_uuids)
+
+
+class JwtSessionBatcher:
+    """Group commit of jwt sessions.
+
+    Concurrent callers enqueue rows, which are written by one multi-row INSERT and one COMMIT every
+    ``max_delay_seconds`` or as soon as ``max_batch_size`` rows are pending. Each caller gets its own row
+    back only after the commit, or the flush exception if the batch failed. A row violating a constraint,
+    such as a refresh token issued twice within one second, fails the whole INSERT: the rows are then
+    retried one by one, so only its caller gets the error.
+    """
+
+    def __init__(
+        self,
+        session_factory: typing.Callable[[], typing.AsyncContextManager[AsyncSession]],
+        max_batch_size: int,
+        max_delay_seconds: float,
+    ) -> None:
+        self._session_factory = session_factory
+        self._max_batch_size = max_batch_size
+        self._max_delay_seconds = max_delay_seconds
+
+        self._pending: list[tuple[JwtSessionCreateSchema, asyncio.Future[JwtSession]]] = []
+        self._has_pending = asyncio.Event()
+        self._is_batch_full = asyncio.Event()
+        self._is_closing = False
+        self._flush_task: asyncio.Task | None = None
+
+    @traced
+    async def create_jwt_session(self, data: JwtSessionCreateSchema) -> JwtSession:
+        if self._is_closing:
+            raise RuntimeError("Jwt session batcher is closed")
+
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._run())
+
+        future: asyncio.Future[JwtSession] = asyncio.get_running_loop().create_future()
+        self._pending.append((data, future))
+
+        self._has_pending.set()
+        if len(self._pending) >= self._max_batch_size:
+            self._is_batch_full.set()
+
+        return await future
+
+    async def close(self) -> None:
+        self._is_closing = True
+        if self._flush_task is None:
+            return
+
+        self._has_pending.set()
+        self._is_batch_full.set()
+        await self._flush_task
+        self._flush_task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self._has_pending.wait()
+            if not self._pending and self._is_closing:
+                return
+
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._is_batch_full.wait(), timeout=self._max_delay_seconds)
+
+            batch, self._pending = self._pending[: self._max_batch_size], self._pending[self._max_batch_size :]
+            if len(self._pending) < self._max_batch_size:
+                self._is_batch_full.clear()
+            if not self._pending and not self._is_closing:
+                self._has_pending.clear()
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[tuple[JwtSessionCreateSchema, asyncio.Future[JwtSession]]]) -> None:
+        stmt = insert(JwtSession).values([data.model_dump() for data, _ in batch]).returning(JwtSession)
+
+        try:
+            async with self._session_factory() as session:
+                jwt_sessions = (await session.scalars(stmt)).all()
+                await session.commit()
+
+        except IntegrityError as e:
+            if len(batch) == 1:
+                self._fail(batch, e)
+                return
+
+            for item in batch:
+                await self._flush([item])
+            return
+
+        except Exception as e:
+            self._fail(batch, e)
+            return
+
+        # RETURNING order is not guaranteed, refresh tokens are unique
+        jwt_sessions_by_refresh_token = {jwt_session.refresh_token: jwt_session for jwt_session in jwt_sessions}
+        for data, future in batch:
+            if not future.done():
+                future.set_result(jwt_sessions_by_refresh_token[data.refresh_token])
+
+    @staticmethod
+    def _fail(batch: list[tuple[JwtSessionCreateSchema, asyncio.Future[JwtSession]]], exc: Exception) -> None:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(exc)
+
+
+@functools.lru_cache
+def get_jwt_session_batcher() -> JwtSessionBatcher:
+    settings = get_settings()
+
+    return JwtSessionBatcher(
+        session_factory=get_async_session(),
+        max_batch_size=settings.JWT_SESSION_GROUP_COMMIT_MAX_BATCH_SIZE,
+        max_delay_seconds=settings.JWT_SESSION_GROUP_COMMIT_MAX_DELAY_MS / 1000,
+    )
+
+
+async def get_jwt_session_repository(session: AsyncSession = Depends(get_session)) -> JwtSessionRepository:
+    return JwtSessionRepository(session=session)
+
+
+async def get_jwt_session_writer(
+    jwt_session_repository: JwtSessionRepository = Depends(get_jwt_session_repository),
+) -> JwtSessionRepository | JwtSessionBatcher:
+    """Where sign-in writes new jwt sessions: the request's own session, or the group commit batcher."""
+    if get_settings().JWT_SESSION_GROUP_COMMIT:
+        return get_jwt_session_batcher()
+
+    return jwt_session_repository
@@ -0,0 +1,59 @@
+from fastapi import Depends
+
+from db.redis import AsyncRedis, get_redis
+from monitoring.tracing import traced
+from schemas.base import RedisKeySchema
+from schemas.rate_limit import RateLimitGrantSchema, RateLimitRuleSchema
+
+# Refills the bucket from the Redis clock, then grants up to ARGV[3] whole tokens in one atomic step.
+# Fractional values are returned as strings: Lua numbers are truncated to integers in replies.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_per_second = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * refill_per_second)
+
+local granted = math.min(math.floor(tokens), requested)
+tokens = tokens - granted
+
+local reset_seconds = (capacity - tokens) / refill_per_second
+local retry_after_seconds = 0
+if granted == 0 then
+    retry_after_seconds = (1 - tokens) / refill_per_second
+end
+
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "updated_at", tostring(now))
+redis.call("PEXPIRE", KEYS[1], math.ceil(reset_seconds * 1000) + 1000)
+
+return {granted, tostring(tokens), tostring(retry_after_seconds), tostring(reset_seconds)}
+"""
+
+
+class RateLimitRepository:
+    _key_schema = RedisKeySchema(prefix="rate_limit")
+
+    def __init__(self, redis_client: AsyncRedis = Depends(get_redis)) -> None:
+        self._redis_client = redis_client
+        self._token_bucket_script = redis_client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    @traced
+    async def acquire(self, bucket: str, rule: RateLimitRuleSchema, requested: int) -> RateLimitGrantSchema:
+        granted, remaining, retry_after_seconds, reset_seconds = await self._token_bucket_script(
+            keys=[self._key_schema.get_key(bucket)],
+            args=[rule.capacity, rule.refill_per_second, requested],
+        )
+
+        return RateLimitGrantSchema(
+            granted=granted,
+            remaining=remaining,
+            retry_after_seconds=retry_after_seconds,
+            reset_seconds=reset_seconds,
+        )
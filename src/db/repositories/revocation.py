@@ -0,0 +1,53 @@
+from db.redis import AsyncRedis, get_redis_connection, get_redis_stream_connection
+from monitoring.tracing import traced
+from schemas.base import RedisKeySchema
+from schemas.revocation import RevocationEventSchema
+
+# Id to read a stream from its beginning
+FIRST_EVENT_ID = "0-0"
+
+
+class RevocationEventRepository:
+    """Revocation events in a Redis stream; stream entry ids are the offsets consumers resume from."""
+
+    _key_schema = RedisKeySchema(prefix="revocation")
+
+    def __init__(self, redis_client: AsyncRedis) -> None:
+        self._redis_client = redis_client
+        self._stream_key = self._key_schema.get_key("events")
+
+    @traced
+    async def publish(self, event: RevocationEventSchema, min_event_id: str) -> str:
+        """Append ``event`` and trim entries older than ``min_event_id``."""
+        return await self._redis_client.xadd(
+            self._stream_key, {"data": event.model_dump_json()}, minid=min_event_id, approximate=True
+        )
+
+    @traced
+    async def get_last_event_id(self) -> str:
+        entries = await self._redis_client.xrevrange(self._stream_key, count=1)
+        return entries[0][0] if entries else FIRST_EVENT_ID
+
+    async def read(
+        self,
+        after_event_id: str,
+        count: int,
+        block_seconds: float,
+    ) -> list[tuple[str, RevocationEventSchema]]:
+        """Events after ``after_event_id``, waiting up to ``block_seconds`` for the first one."""
+        response = await self._redis_client.xread(
+            {self._stream_key: after_event_id}, count=count, block=int(block_seconds * 1000)
+        )
+        if not response:
+            return []
+
+        _, entries = response[0]
+        return [(event_id, RevocationEventSchema.model_validate_json(fields["data"])) for event_id, fields in entries]
+
+
+async def get_revocation_event_repository() -> RevocationEventRepository:
+    return RevocationEventRepository(redis_client=get_redis_connection())
+
+
+async def get_revocation_event_stream_repository() -> RevocationEventRepository:
+    return RevocationEventRepository(redis_client=get_redis_stream_connection())
@@ -1,25 +1,34 @@
 import typing
 import uuid as _uuid
 
+from fastapi import Depends
 from loguru import logger
-from sqlalchemy import and_, delete, insert, select, update
+from sqlalchemy import and_, delete, func, insert, or_, select, update
 from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.models import JwtSession, User
+from db.postgres import get_session
 from db.repositories.base import BaseDatabaseRepository
+from enums import UserSearchModeEnum
 from exceptions import CreateUserException
+from monitoring.tracing import traced
 from schemas.user import UserChangeSchema, UserCreateSchema
 
 
 class UserRepository(BaseDatabaseRepository):
+    @traced
     async def get_active_user_by_username(self, username: str) -> User | None:
-        stmt = select(User).filter_by(username=username, is_active=True)
+        # Matches the users_username_lower_key functional index, so lookup stays a single index probe
+        stmt = select(User).where(func.lower(User.username) == func.lower(username)).filter_by(is_active=True)
 
         user = await self._session.scalar(stmt)
 
         return user
 
+    @traced
     async def get_active_user_with_not_denied_sessions_by_uuid(self, uuid: _uuid.UUID) -> User | None:
+        # Not coalesced across requests like the key lookup: the query and the User belong to this session
         stmt = (
             select(User)
             .filter_by(uuid=uuid, is_active=True)
@@ -36,6 +45,7 @@ class UserRepository(BaseDatabaseRepository):
 
         return user
 
+    @traced
     async def create_user(self, data: UserCreateSchema) -> User:
         stmt = insert(User).values(data.model_dump(exclude_unset=True)).returning(User)
 
@@ -43,13 +53,15 @@ class UserRepository(BaseDatabaseRepository):
             user = (await self._session.execute(stmt)).scalar_one()
 
         except DBAPIError as e:
-            logger.exception(f"Create user exception: {e}")
+            # The driver error only: the wrapped SQLAlchemy error would also log the statement parameters
+            logger.error("Create user exception", event="user.create_failed", error=str(e.orig))
             raise CreateUserException
 
         await self._session.flush()
 
         return user
 
+    @traced
     async def get_all_users(self) -> typing.Sequence[User]:
         stmt = select(User).order_by(User.uuid)
 
@@ -57,6 +69,29 @@ class UserRepository(BaseDatabaseRepository):
 
         return all_users
 
+    @traced
+    async def search_users(
+        self,
+        query: str,
+        mode: UserSearchModeEnum,
+        limit: int,
+        after_uuid: _uuid.UUID | None = None,
+    ) -> typing.Sequence[User]:
+        searchable_columns = (User.username, User.email, User.full_name)
+        if mode == UserSearchModeEnum.PREFIX:
+            conditions = [column.istartswith(query, autoescape=True) for column in searchable_columns]
+        else:
+            conditions = [column.icontains(query, autoescape=True) for column in searchable_columns]
+
+        stmt = select(User).where(or_(*conditions)).order_by(User.uuid).limit(limit)
+        if after_uuid is not None:
+            stmt = stmt.where(User.uuid > after_uuid)
+
+        users = (await self._session.scalars(stmt)).all()
+
+        return users
+
+    @traced
     async def get_user_by_uuid(self, user_uuid: _uuid.UUID) -> User | None:
         stmt = select(User).filter_by(uuid=user_uuid)
 
@@ -64,6 +99,7 @@ class UserRepository(BaseDatabaseRepository):
 
         return user
 
+    @traced
     async def change_user_by_uuid(
         self,
         user_uuid: _uuid.UUID,
@@ -76,6 +112,7 @@ class UserRepository(BaseDatabaseRepository):
 
         return changed_user
 
+    @traced
     async def delete_user_by_uuid(self, user_uuid: _uuid.UUID) -> User | None:
         stmt = delete(User).filter_by(uuid=user_uuid).returning(User)
 
@@ -83,3 +120,7 @@ class UserRepository(BaseDatabaseRepository):
         await self._session.flush()
 
         return deleted_user
+
+
+async def get_user_repository(session: AsyncSession = Depends(get_session)) -> UserRepository:
+    return UserRepository(session=session)
@@ -10,3 +10,29 @@ class UserRolesEnum(str, enum.Enum):
 class HeaderKeyEnum(str, enum.Enum):
     ACCESS_TOKEN = "X-Access-Token"
     REFRESH_TOKEN = "X-Refresh-Token"
+
+
+class UserSearchModeEnum(str, enum.Enum):
+    PREFIX = "PREFIX"
+    SUBSTRING = "SUBSTRING"
+
+
+class RefreshTokenFormatEnum(str, enum.Enum):
+    JWT = "JWT"
+    OPAQUE = "OPAQUE"
+
+
+class TracingExporterEnum(str, enum.Enum):
+    NONE = "NONE"
+    CONSOLE = "CONSOLE"
+
+
+class HealthStatusEnum(str, enum.Enum):
+    OK = "OK"
+    FAIL = "FAIL"
+
+
+class RevocationReasonEnum(str, enum.Enum):
+    SIGN_OUT = "SIGN_OUT"
+    USER_DELETED = "USER_DELETED"
+    USER_DEACTIVATED = "USER_DEACTIVATED"
@@ -33,6 +33,10 @@ class TokenIsExpiredException(UnauthorizedException):
     message = "Token is expired"
 
 
+class InvalidRefreshTokenException(UnauthorizedException):
+    message = "Invalid refresh token"
+
+
 class TokenDecodeException(UnauthorizedException):
     def __init__(self, error: typing.Any) -> None:
         self.message = f"Token decode error: {error}"
@@ -47,5 +51,22 @@ class HeaderIsNotProvidedException(UnauthorizedException):
         self.message = f"Header {header} is not provided"
 
 
+class SearchQueryTooShortException(BadRequestException):
+    def __init__(self, min_length: int) -> None:
+        self.message = f"Substring search query must have at least {min_length} characters, use PREFIX mode"
+
+
+class InvalidEventIdException(BadRequestException):
+    message = "Invalid event id"
+
+
 class CreateUserException(MessageException):
     message = "Create user error"
+
+
+class TooManyRequestsException(MessageException):
+    pass
+
+
+class RateLimitExceededException(TooManyRequestsException):
+    message = "Rate limit exceeded"
@@ -1,47 +1,181 @@
+import contextlib
+import time
+import typing
+import uuid as _uuid
+
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
 from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from loguru import logger
+from sqlalchemy import text
 from starlette import status
 from starlette.middleware.cors import CORSMiddleware
 from starlette.requests import Request
-from starlette.responses import JSONResponse
 
-from api.router import api_router
-from db.redis import get_redis_connection
+from api.fast_path import TokenValidationMiddleware
+from api.router import api_router, health_router
+from db.postgres import get_async_session, get_engine
+from db.redis import get_redis_connection, get_redis_stream_connection
 from db.repositories.jwt import JwtPublicKeyRepository
+from db.repositories.jwt_session import JwtSessionRepository, get_jwt_session_batcher
+from db.repositories.user import UserRepository
 from exceptions import (
     BadRequestException,
     ForbiddenException,
     MessageException,
     NotFoundException,
+    TooManyRequestsException,
     UnauthorizedException,
 )
+from monitoring.logs import REQUEST_ID_HEADER, RequestIdMiddleware, configure_logging
+from monitoring.metrics import (
+    PrometheusMiddleware,
+    lru_cache_collector,
+    mark_process_dead,
+    metrics_endpoint,
+)
+from monitoring.tracing import TracingMiddleware, get_tracer_provider
+from monitoring.traffic import TrafficCaptureMiddleware, get_traffic_recorder
 from schemas.jwt import JwtPublicKeySchema
+from schemas.user import UserOutputSchema
 from settings import get_settings
+from utils.jwt import get_jwt_minter
+from utils.rate_limit import RATE_LIMIT_HEADERS, RateLimitMiddleware
+from utils.responses import get_type_adapter
 
 
-async def save_jwt_key(key: RSAPrivateKey = rsa.generate_private_key(public_exponent=65537, key_size=2048)):
+def load_or_generate_private_key() -> RSAPrivateKey:
     settings = get_settings()
 
+    if settings.TOKEN_PRIVATE_KEY:
+        private_key = serialization.load_pem_private_key(settings.TOKEN_PRIVATE_KEY.encode(), password=None)
+        if not isinstance(private_key, RSAPrivateKey):
+            raise ValueError("TOKEN_PRIVATE_KEY is not an RSA key")
+
+        return private_key
+
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def load_provisioned_private_key() -> None:
+    """Reads the private key the production entrypoint wrote for the workers, kept out of their environment."""
+    settings = get_settings()
+
+    if settings.TOKEN_PRIVATE_KEY_FILE is not None:
+        settings.TOKEN_PRIVATE_KEY = settings.TOKEN_PRIVATE_KEY_FILE.read_text()
+
+
+async def save_jwt_key(
+    key: RSAPrivateKey | None = None,
+    jwt_public_key_repository: JwtPublicKeyRepository | None = None,
+) -> None:
+    settings = get_settings()
+
+    if key is None:
+        key = load_or_generate_private_key()
+
     settings.TOKEN_PRIVATE_KEY = key.private_bytes(
         encoding=serialization.Encoding.PEM,
         format=serialization.PrivateFormat.PKCS8,
         encryption_algorithm=serialization.NoEncryption(),
     ).decode()
-    async with get_redis_connection() as redis:
-        jwt_public_key_repository = JwtPublicKeyRepository(redis_client=redis)
-
-        jwt_public_key = JwtPublicKeySchema(
-            pk=settings.TOKEN_PUBLIC_KEY_PK,
-            public_key=key.public_key()
-            .public_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PublicFormat.SubjectPublicKeyInfo,
-            )
-            .decode(),
+
+    if jwt_public_key_repository is None:
+        jwt_public_key_repository = JwtPublicKeyRepository(redis_client=get_redis_connection())
+
+    jwt_public_key = JwtPublicKeySchema(
+        pk=settings.TOKEN_PUBLIC_KEY_PK,
+        public_key=key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
         )
-        await jwt_public_key_repository.save(instance=jwt_public_key)
+        .decode(),
+    )
+    await jwt_public_key_repository.save(instance=jwt_public_key)
+
+
+async def open_postgres_pool() -> None:
+    engine = get_engine()
+
+    async with contextlib.AsyncExitStack() as stack:
+        for _ in range(engine.pool.size()):  # type: ignore[attr-defined]
+            connection = await stack.enter_async_context(engine.connect())
+            await connection.execute(text("SELECT 1"))
+
+
+async def open_redis_pool() -> None:
+    await get_redis_connection().ping()
+
+
+async def warm_up_caches() -> None:
+    """Run hot statements once so SQLAlchemy compiled caches, asyncpg prepared statements,
+    pydantic adapters and the token signer are built before the first request."""
+    get_jwt_minter(get_settings().TOKEN_PRIVATE_KEY, key_id=str(get_settings().TOKEN_PUBLIC_KEY_PK))
+
+    get_type_adapter(UserOutputSchema)
+    get_type_adapter(list[UserOutputSchema])
+
+    async with get_async_session()() as session:
+        user_repository = UserRepository(session=session)
+        await user_repository.get_active_user_by_username(username="")
+        await user_repository.get_active_user_with_not_denied_sessions_by_uuid(uuid=_uuid.UUID(int=0))
+        await user_repository.get_user_by_uuid(user_uuid=_uuid.UUID(int=0))
+
+        jwt_session_repository = JwtSessionRepository(session=session)
+        await jwt_session_repository.get_jwt_session_with_user_by_refresh_token(refresh_token="")
+
+        await session.rollback()
+
+
+async def shutdown() -> None:
+    await get_jwt_session_batcher().close()
+    get_jwt_session_batcher.cache_clear()
+
+    await get_redis_connection().connection_pool.disconnect()
+    await get_redis_stream_connection().connection_pool.disconnect()
+    await get_engine().dispose()
+
+    if get_settings().TRAFFIC_CAPTURE_ENABLED:
+        get_traffic_recorder().close()
+
+    mark_process_dead()
+    await logger.complete()
+
+
+@contextlib.contextmanager
+def _measure_startup_phase(name: str, timings: dict[str, float]) -> typing.Iterator[None]:
+    started_at = time.perf_counter()
+    yield
+    timings[name] = round((time.perf_counter() - started_at) * 1000, 2)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI) -> typing.AsyncIterator[None]:
+    startup_timings: dict[str, float] = {}
+
+    with _measure_startup_phase("total", startup_timings):
+        with _measure_startup_phase("redis", startup_timings):
+            await open_redis_pool()
+        with _measure_startup_phase("jwt_key", startup_timings):
+            # The production entrypoint provisions the keys once before forking workers
+            if get_settings().TOKEN_KEYS_PROVISIONED:
+                load_provisioned_private_key()
+            else:
+                await save_jwt_key()
+        with _measure_startup_phase("postgres", startup_timings):
+            await open_postgres_pool()
+        with _measure_startup_phase("warm_up", startup_timings):
+            await warm_up_caches()
+
+    app.state.startup_timings = startup_timings
+    logger.info("Startup finished", event="app.startup", timings_ms=startup_timings)
+
+    yield
+
+    await shutdown()
 
 
 async def message_exception_handler(_: Request, exc: MessageException):
@@ -50,6 +184,7 @@ async def message_exception_handler(_: Request, exc: MessageException):
         UnauthorizedException: status.HTTP_401_UNAUTHORIZED,
         ForbiddenException: status.HTTP_403_FORBIDDEN,
         NotFoundException: status.HTTP_404_NOT_FOUND,
+        TooManyRequestsException: status.HTTP_429_TOO_MANY_REQUESTS,
     }
 
     status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -57,7 +192,7 @@ async def message_exception_handler(_: Request, exc: MessageException):
         if isinstance(exc, exception_class):
             status_code = exception_status_code
 
-    return JSONResponse(status_code=status_code, content={"error": exc.message})
+    return ORJSONResponse(status_code=status_code, content={"error": exc.message})
 
 
 def get_app() -> FastAPI:
@@ -65,21 +200,53 @@ def get_app() -> FastAPI:
         title="Base Auth Service",
         openapi_url="/api/openapi.json",
         docs_url="/api/swagger",
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
     )
 
     app.include_router(api_router)
+    app.include_router(health_router)
+
+    app.add_exception_handler(MessageException, message_exception_handler)
+
+    if get_settings().TOKEN_VALIDATION_FAST_PATH_ENABLED:
+        app.add_middleware(
+            TokenValidationMiddleware,
+            routes=app.routes,
+            dependency_overrides_provider=app,
+            exception_handler=message_exception_handler,
+            settings=get_settings(),
+        )
+
+    if get_settings().RATE_LIMIT_ENABLED:
+        app.add_middleware(RateLimitMiddleware, routes=app.routes, settings=get_settings())
 
+    # Outside the rate limiter: 429s get CORS headers and preflights do not use up the buckets
     app.add_middleware(
         CORSMiddleware,
         allow_origins=get_settings().cors_allow_origin_list,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[REQUEST_ID_HEADER, *RATE_LIMIT_HEADERS],
     )
 
-    app.add_exception_handler(MessageException, message_exception_handler)
+    if get_settings().METRICS_ENABLED:
+        app.add_api_route("/metrics", metrics_endpoint, include_in_schema=False)
+        app.add_middleware(PrometheusMiddleware)
+
+        lru_cache_collector.register("jwt_minter", get_jwt_minter)
+        lru_cache_collector.register("type_adapter", get_type_adapter)
+
+    if get_settings().TRACING_ENABLED:
+        get_tracer_provider()
+        app.add_middleware(TracingMiddleware)
+
+    if get_settings().TRAFFIC_CAPTURE_ENABLED:
+        app.add_middleware(TrafficCaptureMiddleware, recorder=get_traffic_recorder())
 
-    app.add_event_handler("startup", save_jwt_key)
+    configure_logging()
+    app.add_middleware(RequestIdMiddleware)
 
     return app
 
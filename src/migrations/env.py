@@ -13,7 +13,8 @@ from settings import get_settings
 # access to the values within the .ini file in use.
 config = context.config
 settings = get_settings()
-config.set_main_option("sqlalchemy.url", settings.postgres_dsn)
+# A URL set by the caller wins, e.g. the tests migrating their template database
+config.set_main_option("sqlalchemy.url", config.get_main_option("sqlalchemy.url") or settings.postgres_dsn)
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -0,0 +1,51 @@
+"""users search trgm indexes
+
+Revision ID: 4b2e8f1c9d3a
+Revises: 697a44259d6a
+Create Date: 2026-10-19 10:12:41.318204
+
+"""
+from typing import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4b2e8f1c9d3a"
+down_revision: str | None = "697a44259d6a"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+
+    op.create_index(
+        "users_username_trgm_idx",
+        "users",
+        ["username"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"username": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "users_email_trgm_idx",
+        "users",
+        ["email"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"email": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "users_full_name_trgm_idx",
+        "users",
+        ["full_name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"full_name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("users_full_name_trgm_idx", table_name="users")
+    op.drop_index("users_email_trgm_idx", table_name="users")
+    op.drop_index("users_username_trgm_idx", table_name="users")
@@ -0,0 +1,52 @@
+"""case insensitive username and email
+
+Revision ID: 9c7d1e3f5a20
+Revises: 4b2e8f1c9d3a
+Create Date: 2026-10-19 11:02:17.540983
+
+"""
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9c7d1e3f5a20"
+down_revision: str | None = "4b2e8f1c9d3a"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _check_case_insensitive_collisions(column_name: str) -> None:
+    collisions = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                f"SELECT lower({column_name}) AS value, count(*) AS duplicates FROM users "
+                f"WHERE {column_name} IS NOT NULL GROUP BY lower({column_name}) HAVING count(*) > 1"
+            )
+        )
+        .all()
+    )
+    if collisions:
+        values = ", ".join(f"{value!r} ({duplicates} rows)" for value, duplicates in collisions)
+        raise RuntimeError(f"Can't make users.{column_name} case insensitive, resolve colliding values first: {values}")
+
+
+def upgrade() -> None:
+    _check_case_insensitive_collisions("username")
+    _check_case_insensitive_collisions("email")
+
+    op.create_index("users_username_lower_key", "users", [sa.text("lower(username)")], unique=True)
+    op.create_index("users_email_lower_key", "users", [sa.text("lower(email)")], unique=True)
+
+    op.drop_constraint("users_username_key", "users", type_="unique")
+    op.drop_constraint("users_email_key", "users", type_="unique")
+
+
+def downgrade() -> None:
+    op.create_unique_constraint("users_email_key", "users", ["email"])
+    op.create_unique_constraint("users_username_key", "users", ["username"])
+
+    op.drop_index("users_email_lower_key", table_name="users")
+    op.drop_index("users_username_lower_key", table_name="users")
@@ -0,0 +1,27 @@
+"""drop duplicate uuid unique constraints
+
+Revision ID: e15a0b6c2d47
+Revises: 9c7d1e3f5a20
+Create Date: 2026-10-19 11:48:05.127663
+
+"""
+from typing import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e15a0b6c2d47"
+down_revision: str | None = "9c7d1e3f5a20"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Primary keys already carry a unique index on uuid. Postgres folds the duplicate constraint into the
+    # primary key when both are declared in one CREATE TABLE, so it only exists where it was added separately
+    op.execute("ALTER TABLE jwt_sessions DROP CONSTRAINT IF EXISTS jwt_sessions_uuid_key;")
+    op.execute("ALTER TABLE users DROP CONSTRAINT IF EXISTS users_uuid_key;")
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,158 @@
+import functools
+import sys
+import time
+import typing
+import uuid as _uuid
+
+import orjson
+from loguru import logger
+from opentelemetry import trace
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from settings import get_settings
+
+if typing.TYPE_CHECKING:
+    from loguru import Message as LogMessage
+    from loguru import Record
+
+REQUEST_ID_HEADER = "X-Request-ID"
+REQUEST_ID_MAX_LENGTH = 128
+
+REDACTED = "[REDACTED]"
+SECRET_FIELDS = frozenset(
+    {
+        "password",
+        "raw_password",
+        "access_token",
+        "refresh_token",
+        "token",
+        "private_key",
+        "authorization",
+        "x-access-token",
+        "x-refresh-token",
+    }
+)
+
+
+def _redact(fields: dict[str, typing.Any]) -> dict[str, typing.Any]:
+    return {
+        key: REDACTED if key.lower() in SECRET_FIELDS else _redact(value) if isinstance(value, dict) else value
+        for key, value in fields.items()
+    }
+
+
+def patch_record(record: "Record") -> None:
+    """Redact secret fields and attach the current trace to every record, whatever the sink.
+
+    Redaction works on structured fields only: pass values as keyword fields
+    (``logger.warning("Invalid password", event=..., username=...)``), never interpolate them into the message.
+    """
+    record["extra"] = _redact(record["extra"])
+
+    span_context = trace.get_current_span().get_span_context()
+    if span_context.is_valid:
+        record["extra"]["trace_id"] = trace.format_trace_id(span_context.trace_id)
+        record["extra"]["span_id"] = trace.format_span_id(span_context.span_id)
+
+
+class EventSampler:
+    """Loguru filter sampling records per ``event`` field.
+
+    Within each interval the first ``first`` records of an event are kept, then every ``thereafter``-th one,
+    so a burst of failed sign-ins costs a bounded number of writes. Records without an event are always kept.
+    """
+
+    def __init__(self, first: int, thereafter: int, interval_seconds: float) -> None:
+        self._first = first
+        self._thereafter = thereafter
+        self._interval_seconds = interval_seconds
+
+        self._counters: dict[str, int] = {}
+        self._interval_started_at = time.monotonic()
+
+    def __call__(self, record: "Record") -> bool:
+        event = record["extra"].get("event")
+        if event is None:
+            return True
+
+        now = time.monotonic()
+        if now - self._interval_started_at >= self._interval_seconds:
+            self._counters.clear()
+            self._interval_started_at = now
+
+        count = self._counters.get(event, 0) + 1
+        self._counters[event] = count
+
+        if count <= self._first:
+            return True
+
+        return self._thereafter > 0 and (count - self._first) % self._thereafter == 0
+
+
+def json_sink(message: "LogMessage") -> None:
+    """Write one JSON line per record. Runs in loguru's writer thread when the handler is enqueued."""
+    record = message.record
+
+    entry: dict[str, typing.Any] = {
+        "timestamp": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "logger": record["name"],
+        **record["extra"],
+    }
+    if record["exception"] is not None:
+        # The handler format is "{exception}", so the formatted message is the traceback
+        entry["exception"] = message.rstrip("\n")
+
+    sys.stderr.write(orjson.dumps(entry, default=str).decode() + "\n")
+
+
+@functools.lru_cache
+def configure_logging() -> int:
+    """Replace loguru's default handler by the enqueued JSON sink. Cached, so the handler is added once."""
+    settings = get_settings()
+
+    logger.remove()
+    logger.configure(patcher=patch_record)
+
+    return logger.add(
+        json_sink,
+        level=settings.LOG_LEVEL,
+        format="{exception}",
+        filter=EventSampler(
+            first=settings.LOG_SAMPLING_FIRST,
+            thereafter=settings.LOG_SAMPLING_THEREAFTER,
+            interval_seconds=settings.LOG_SAMPLING_INTERVAL_SECONDS,
+        ),
+        enqueue=True,
+        backtrace=False,
+        diagnose=False,
+    )
+
+
+class RequestIdMiddleware:
+    """Binds a request id to every log record of the request and echoes it in the ``X-Request-ID`` header.
+
+    An incoming ``X-Request-ID`` is reused so ids can be followed across services.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get(REQUEST_ID_HEADER, "")
+        if not request_id or len(request_id) > REQUEST_ID_MAX_LENGTH:
+            request_id = _uuid.uuid4().hex
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(REQUEST_ID_HEADER, request_id)
+            await send(message)
+
+        with logger.contextualize(request_id=request_id):
+            await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,99 @@
+import functools
+import inspect
+import typing
+
+from opentelemetry import trace
+from opentelemetry.propagate import extract
+from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from enums import TracingExporterEnum
+from settings import get_settings
+
+# Resolves to the SDK provider once it is installed, and to a no-op tracer until then (or when tracing is off)
+tracer = trace.get_tracer("auth-service")
+
+Function = typing.TypeVar("Function", bound=typing.Callable[..., typing.Any])
+
+
+@functools.lru_cache
+def get_tracer_provider() -> TracerProvider:
+    """Build the SDK tracer provider and install it globally. Cached: the global provider can be set only once."""
+    settings = get_settings()
+
+    # Follow the caller's sampling decision from traceparent, sample root spans by ratio
+    sampler = ParentBased(root=TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO))
+    tracer_provider = TracerProvider(
+        sampler=sampler,
+        resource=Resource.create({SERVICE_NAME: settings.TRACING_SERVICE_NAME}),
+    )
+
+    if settings.TRACING_EXPORTER == TracingExporterEnum.CONSOLE:
+        tracer_provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter()))
+
+    trace.set_tracer_provider(tracer_provider)
+
+    return tracer_provider
+
+
+def traced(func: Function) -> Function:
+    """Run the function inside a span named after its qualified name, e.g. ``UserRepository.get_user_by_uuid``."""
+    span_name = func.__qualname__
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+            with tracer.start_as_current_span(span_name):
+                return await func(*args, **kwargs)
+
+        return typing.cast(Function, async_wrapper)
+
+    @functools.wraps(func)
+    def wrapper(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        with tracer.start_as_current_span(span_name):
+            return func(*args, **kwargs)
+
+    return typing.cast(Function, wrapper)
+
+
+class TracingMiddleware:
+    """Opens a server span per request, continuing the trace from W3C ``traceparent``/``tracestate`` headers.
+
+    The span is renamed to ``METHOD /route/{template}`` once routing is done, so span names stay bounded
+    like the metric labels.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        carrier = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        method = scope["method"]
+
+        with tracer.start_as_current_span(method, context=extract(carrier), kind=SpanKind.SERVER) as span:
+            span.set_attribute("http.method", method)
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.update_name(f"{method} {route.path}")
+                    span.set_attribute("http.route", route.path)
@@ -0,0 +1,148 @@
+"""Opt-in capture of request metadata, to replay production traffic shapes with ``benchmarks.replay``.
+
+One JSON line per request: arrival time, method, route template, status and duration. Tokens are
+reduced to keyed fingerprints, so the file shows how often a token is reused, never the token itself.
+Bodies, query strings, path parameters and other headers are not read at all.
+"""
+import concurrent.futures
+import functools
+import hashlib
+import hmac
+import os
+import pathlib
+import secrets
+import time
+import typing
+
+import orjson
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from enums import HeaderKeyEnum
+from monitoring.metrics import HTTP_METHODS, OTHER_LABEL, UNMATCHED_ROUTE
+from settings import get_settings
+
+# Raw ASGI header name -> capture field of its token fingerprint
+TOKEN_HEADER_FIELDS = {
+    HeaderKeyEnum.ACCESS_TOKEN.value.lower().encode(): "a",
+    HeaderKeyEnum.REFRESH_TOKEN.value.lower().encode(): "f",
+}
+# 64 bits keep fingerprints of distinct tokens apart without making them worth brute-forcing
+TOKEN_FINGERPRINT_BYTES = 8
+
+
+class TrafficRecorder:
+    """Buffers capture lines and appends them to ``path`` with one write per flush.
+
+    Writes run on a single writer thread, in flush order, so requests never wait for the disk, like the
+    enqueued log sink. The file is opened with ``O_APPEND``, so workers of one server can share it; lines
+    of different workers are not in arrival order, the replay sorts them. Records after ``close`` start
+    another writer, so the recorder outlives a restarted lifespan of the app that holds it.
+    """
+
+    def __init__(self, path: pathlib.Path, key: bytes, buffer_records: int, flush_interval_seconds: float) -> None:
+        self._path = path
+        self._key = key
+        self._buffer_records = buffer_records
+        self._flush_interval_seconds = flush_interval_seconds
+
+        self._fd: int | None = None
+        self._buffer: list[bytes] = []
+        self._last_flushed_at = time.monotonic()
+        self._writer: concurrent.futures.ThreadPoolExecutor | None = None
+
+    def get_token_fingerprint(self, token: bytes) -> str:
+        return hmac.new(self._key, token, hashlib.sha256).hexdigest()[: TOKEN_FINGERPRINT_BYTES * 2]
+
+    def record(self, entry: dict[str, typing.Any]) -> None:
+        self._buffer.append(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE))
+
+        now = time.monotonic()
+        if len(self._buffer) >= self._buffer_records or now - self._last_flushed_at >= self._flush_interval_seconds:
+            self.flush()
+
+    def flush(self) -> None:
+        self._last_flushed_at = time.monotonic()
+        if not self._buffer:
+            return
+
+        if self._writer is None:
+            self._writer = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="traffic-capture")
+
+        data, self._buffer = b"".join(self._buffer), []
+        self._writer.submit(self._write, data)
+
+    def close(self) -> None:
+        """Flushes, waits for the pending writes and closes the file."""
+        self.flush()
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _write(self, data: bytes) -> None:
+        if self._fd is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self._path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+
+        os.write(self._fd, data)
+
+
+@functools.lru_cache()
+def get_traffic_recorder() -> TrafficRecorder:
+    settings = get_settings()
+
+    return TrafficRecorder(
+        path=settings.TRAFFIC_CAPTURE_PATH,
+        # Without a shared key fingerprints are per process: the same token gets another one on each worker
+        key=settings.TRAFFIC_CAPTURE_KEY.encode() or secrets.token_bytes(32),
+        buffer_records=settings.TRAFFIC_CAPTURE_BUFFER_RECORDS,
+        flush_interval_seconds=settings.TRAFFIC_CAPTURE_FLUSH_INTERVAL_SECONDS,
+    )
+
+
+class TrafficCaptureMiddleware:
+    """Records a line per HTTP request with the fields ``benchmarks.replay`` reads.
+
+    ``t`` is the arrival as Unix time, ``m`` the method, ``r`` the route template, ``s`` the status code
+    and ``d`` the duration in milliseconds. ``a`` and ``f`` are fingerprints of the access and refresh
+    token headers, present only when the request carried them.
+    """
+
+    def __init__(self, app: ASGIApp, recorder: TrafficRecorder) -> None:
+        self.app = app
+        self._recorder = recorder
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        arrived_at = time.time()
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+
+        finally:
+            entry = {
+                "t": round(arrived_at, 6),
+                "m": scope["method"] if scope["method"] in HTTP_METHODS else OTHER_LABEL,
+                "r": getattr(scope.get("route"), "path", UNMATCHED_ROUTE),
+                "s": status_code,
+                "d": round((time.perf_counter() - started_at) * 1000, 3),
+            }
+            for name, value in scope["headers"]:
+                field = TOKEN_HEADER_FIELDS.get(name)
+                if field and value:
+                    entry[field] = self._recorder.get_token_fingerprint(value)
+
+            self._recorder.record(entry)
@@ -0,0 +1,35 @@
+from pydantic import BaseModel
+
+from enums import HealthStatusEnum
+
+
+class LivenessOutputSchema(BaseModel):
+    status: HealthStatusEnum = HealthStatusEnum.OK
+
+
+class ComponentHealthSchema(BaseModel):
+    status: HealthStatusEnum
+    latency_ms: float
+    error: str | None = None
+
+
+class PostgresPoolStatsSchema(BaseModel):
+    size: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    utilisation: float
+
+
+class RedisPoolStatsSchema(BaseModel):
+    in_use: int
+    available: int
+    max_connections: int
+    utilisation: float
+
+
+class ReadinessOutputSchema(BaseModel):
+    status: HealthStatusEnum
+    checks: dict[str, ComponentHealthSchema]
+    postgres_pool: PostgresPoolStatsSchema
+    redis_pool: RedisPoolStatsSchema
@@ -1,5 +1,22 @@
+import typing
+
+from pydantic import BaseModel
+
 from schemas.base import RedisModelSchema
 
 
 class JwtPublicKeySchema(RedisModelSchema):
     public_key: str
+
+
+class JwkSchema(BaseModel):
+    kty: typing.Literal["RSA"] = "RSA"
+    use: typing.Literal["sig"] = "sig"
+    alg: str
+    kid: str
+    n: str
+    e: str
+
+
+class JwksOutputSchema(BaseModel):
+    keys: list[JwkSchema]
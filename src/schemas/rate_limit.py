@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+
+
+class RateLimitRuleSchema(BaseModel):
+    capacity: int = Field(gt=0)
+    period_seconds: float = Field(gt=0)
+
+    @classmethod
+    def from_string(cls, value: str) -> "RateLimitRuleSchema":
+        """Parse ``"<capacity>/<period_seconds>"``: a bucket of ``capacity`` tokens refilled over the period."""
+        capacity, _, period_seconds = value.partition("/")
+        return cls(capacity=int(capacity), period_seconds=float(period_seconds or 1))
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.period_seconds
+
+
+class RateLimitGrantSchema(BaseModel):
+    granted: int
+    remaining: float
+    retry_after_seconds: float
+    reset_seconds: float
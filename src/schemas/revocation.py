@@ -0,0 +1,15 @@
+import uuid as _uuid
+
+from pydantic import BaseModel
+
+from enums import RevocationReasonEnum
+
+
+class RevocationEventSchema(BaseModel):
+    user_uuid: _uuid.UUID
+    session_uuids: list[_uuid.UUID] = []
+    reason: RevocationReasonEnum
+    # Unix time: access tokens of the user issued before it are revoked
+    not_before: int
+    # Unix time: every revoked access token has expired by then, so consumers can forget the event
+    expires_at: int
@@ -24,3 +24,13 @@ class UserChangeSchema(BaseOrmSchema):
     username: str | None = None
     full_name: str | None = None
     email: str | None = None
+
+
+class UserAdminChangeSchema(UserChangeSchema):
+    # Not nullable like the column; the default is never written, changes are dumped with exclude_unset
+    is_active: bool = True
+
+
+class UserSearchOutputSchema(BaseOrmSchema):
+    items: list[UserOutputSchema]
+    next_after: _uuid.UUID | None = None
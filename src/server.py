@@ -0,0 +1,106 @@
+"""Production entrypoint: one uvicorn worker per CPU behind a shared listening socket.
+
+Usage (from the src directory):
+    python server.py
+
+The parent process provisions the token keys once and hands the private key to the workers in a file only
+its user can read, so every worker signs with the same key and none of them writes to Redis on startup. The
+key stays out of the environment, which child processes inherit and /proc/<pid>/environ exposes. SIGTERM stops
+accepting connections, waits up to SERVER_GRACEFUL_SHUTDOWN_SECONDS for in-flight requests, then runs the
+application shutdown that closes the Postgres and Redis pools.
+"""
+import asyncio
+import importlib.util
+import os
+import shutil
+import tempfile
+
+import uvicorn
+from loguru import logger
+
+from db.redis import get_redis_connection
+from main import load_or_generate_private_key, save_jwt_key
+from settings import Settings, get_settings
+
+
+def get_worker_count(settings: Settings) -> int:
+    if settings.SERVER_WORKERS > 0:
+        return settings.SERVER_WORKERS
+
+    # Respects CPU affinity and cgroup cpusets, unlike os.cpu_count()
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+
+def get_event_loop_implementation() -> str:
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def get_http_implementation() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+async def provision_jwt_keys(key_dir: str) -> None:
+    settings = get_settings()
+
+    await save_jwt_key(load_or_generate_private_key())
+    await get_redis_connection().connection_pool.disconnect()
+
+    # mkstemp creates the file readable and writable by its owner only
+    key_fd, key_path = tempfile.mkstemp(prefix="token-private-key-", dir=key_dir)
+    with os.fdopen(key_fd, "w") as key_file:
+        key_file.write(settings.TOKEN_PRIVATE_KEY)
+
+    # Spawned workers build their settings from the environment
+    os.environ.pop("TOKEN_PRIVATE_KEY", None)
+    os.environ["TOKEN_PRIVATE_KEY_FILE"] = key_path
+    os.environ["TOKEN_KEYS_PROVISIONED"] = "true"
+
+
+def main() -> None:
+    settings = get_settings()
+    workers = get_worker_count(settings)
+
+    # Kept until the server exits: workers restarted by the supervisor read the key again
+    key_dir = tempfile.mkdtemp(prefix="auth-service-keys-")
+    prometheus_multiproc_dir = None
+    try:
+        asyncio.run(provision_jwt_keys(key_dir))
+
+        if workers > 1 and "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+            prometheus_multiproc_dir = tempfile.mkdtemp(prefix="auth-service-metrics-")
+            os.environ["PROMETHEUS_MULTIPROC_DIR"] = prometheus_multiproc_dir
+
+        loop = get_event_loop_implementation()
+        http = get_http_implementation()
+        logger.info(
+            "Starting server",
+            event="server.start",
+            workers=workers,
+            loop=loop,
+            http=http,
+            max_postgres_connections=workers * (settings.POSTGRES_POOL_SIZE + settings.POSTGRES_MAX_OVERFLOW),
+        )
+
+        uvicorn.run(
+            "main:app",
+            host=settings.SERVER_HOST,
+            port=settings.SERVER_PORT,
+            workers=workers,
+            loop=loop,
+            http=http,
+            backlog=settings.SERVER_BACKLOG,
+            timeout_keep_alive=settings.SERVER_KEEP_ALIVE_SECONDS,
+            timeout_graceful_shutdown=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+            limit_concurrency=settings.SERVER_LIMIT_CONCURRENCY,
+            access_log=settings.SERVER_ACCESS_LOG,
+            lifespan="on",
+        )
+
+    finally:
+        shutil.rmtree(key_dir, ignore_errors=True)
+        if prometheus_multiproc_dir is not None:
+            shutil.rmtree(prometheus_multiproc_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,39 @@
 import calendar
 import datetime as dt
-import typing
+import hashlib
+import secrets
 import uuid as _uuid
 
 from fastapi import Depends
 from fastapi.security import SecurityScopes
-from jose import ExpiredSignatureError, JWTError, jwt
 from loguru import logger
 from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db.models import User
+from db.models import JwtSession, User
 from db.postgres import get_session
-from db.repositories.jwt import JwtPublicKeyRepository
-from db.repositories.jwt_session import JwtSessionRepository
-from db.repositories.user import UserRepository
-from enums import HeaderKeyEnum, UserRolesEnum
+from db.repositories.jwt_session import (
+    JwtSessionBatcher,
+    JwtSessionRepository,
+    get_jwt_session_repository,
+    get_jwt_session_writer,
+)
+from db.repositories.user import UserRepository, get_user_repository
+from enums import (
+    HeaderKeyEnum,
+    RefreshTokenFormatEnum,
+    RevocationReasonEnum,
+    UserRolesEnum,
+)
 from exceptions import (
     InvalidPasswordException,
+    InvalidRefreshTokenException,
     OperationNotPermittedException,
-    TokenDecodeException,
     TokenIsExpiredException,
     UserNotFoundException,
 )
+from monitoring.metrics import PASSWORD_HASH_DURATION, TOKEN_OPERATION_DURATION
+from monitoring.tracing import traced
 from schemas.auth import (
     AccessTokenOutputSchema,
     AccessTokenPayloadSchema,
@@ -31,127 +42,157 @@ from schemas.auth import (
     SignUpInputSchema,
     TokenPairOutputSchema,
 )
-from schemas.jwt import JwtPublicKeySchema
 from schemas.jwt_session import JwtSessionCreateSchema
 from schemas.user import UserCreateSchema
+from services.revocation import RevocationService, get_revocation_service
+from services.token import TokenVerifier, get_token_verifier
 from settings import Settings, get_settings
 from utils.headers import APIKeyHeader
+from utils.jwt import get_jwt_minter
 
 access_token_scheme = APIKeyHeader(name=HeaderKeyEnum.ACCESS_TOKEN, scheme_name=HeaderKeyEnum.ACCESS_TOKEN)
 refresh_token_scheme = APIKeyHeader(name=HeaderKeyEnum.REFRESH_TOKEN, scheme_name=HeaderKeyEnum.REFRESH_TOKEN)
 
 
+def is_opaque_refresh_token(token: str, settings: Settings) -> bool:
+    # Refresh tokens issued as JWT before switching to the opaque format stay valid until they expire
+    return settings.REFRESH_TOKEN_FORMAT == RefreshTokenFormatEnum.OPAQUE and token.count(".") != 2
+
+
 class AuthService:
-    _jwt_algorithm: str = "RS256"
     _password_context: CryptContext = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
     def __init__(
         self,
-        settings: Settings = Depends(get_settings),
-        session: AsyncSession = Depends(get_session),
-        user_repository: UserRepository = Depends(),
-        jwt_session_repository: JwtSessionRepository = Depends(),
-        jwt_public_key_repository: JwtPublicKeyRepository = Depends(),
+        settings: Settings,
+        session: AsyncSession,
+        user_repository: UserRepository,
+        jwt_session_repository: JwtSessionRepository,
+        jwt_session_writer: JwtSessionRepository | JwtSessionBatcher,
+        token_verifier: TokenVerifier,
+        revocation_service: RevocationService,
     ) -> None:
         self._settings = settings
 
         self._session = session
         self._user_repository = user_repository
         self._jwt_session_repository = jwt_session_repository
-        self._jwt_public_key_repository = jwt_public_key_repository
+        self._jwt_session_writer = jwt_session_writer
+        self._token_verifier = token_verifier
+        self._revocation_service = revocation_service
 
+    @traced
     async def authenticate_user_and_create_token_pair(
         self,
         credentials: SignInInputSchema,
     ) -> TokenPairOutputSchema:
         user = await self._user_repository.get_active_user_by_username(username=credentials.username)
         if not user:
-            logger.error(f"User with username {credentials.username} not found")
+            logger.error("User not found", event="sign_in.user_not_found", username=credentials.username)
             raise UserNotFoundException
 
-        is_passwords_equal = self._password_context.verify(credentials.password, user.password)
+        with PASSWORD_HASH_DURATION.labels("verify").time():
+            is_passwords_equal = self._password_context.verify(credentials.password, user.password)
         if is_passwords_equal is False:
-            logger.error(f"Invalid password {credentials.password} for user {user.username}")
+            logger.error("Invalid password", event="sign_in.invalid_password", username=user.username)
             raise InvalidPasswordException
 
-        refresh_token_expire_delta = dt.timedelta(days=self._settings.REFRESH_TOKEN_EXPIRE_DAYS)
-        refresh_token_expires_at = dt.datetime.now(tz=dt.timezone.utc) + refresh_token_expire_delta
-        refresh_token = self._create_refresh_token(user, expires_at=refresh_token_expires_at)
+        now = dt.datetime.now(tz=dt.timezone.utc)
 
-        access_token_expire_delta = dt.timedelta(minutes=self._settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token_expires_at = dt.datetime.now(tz=dt.timezone.utc) + access_token_expire_delta
-        access_token = self._create_access_token(user, expires_at=access_token_expires_at)
+        refresh_token_expires_at = now + dt.timedelta(days=self._settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        if self._settings.REFRESH_TOKEN_FORMAT == RefreshTokenFormatEnum.OPAQUE:
+            refresh_token = self._create_opaque_refresh_token()
+            stored_refresh_token = self._get_opaque_refresh_token_digest(refresh_token)
+
+        else:
+            refresh_token = self._create_token(user, expires_at=refresh_token_expires_at)
+            stored_refresh_token = refresh_token
+
+        access_token_expires_at = now + dt.timedelta(minutes=self._settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        access_token = self._create_token(user, expires_at=access_token_expires_at)
 
         jwt_session_data = JwtSessionCreateSchema(
-            user_uuid=user.uuid, refresh_token=refresh_token, expires_at=refresh_token_expires_at
+            user_uuid=user.uuid, refresh_token=stored_refresh_token, expires_at=refresh_token_expires_at
         )
-        await self._jwt_session_repository.create_jwt_session(data=jwt_session_data)
-
-        await self._session.commit()
+        await self._jwt_session_writer.create_jwt_session(data=jwt_session_data)
+        # The group commit batcher commits on its own session
+        if not self._settings.JWT_SESSION_GROUP_COMMIT:
+            await self._session.commit()
 
         return TokenPairOutputSchema(
             refresh_token=refresh_token,
             access_token=access_token,
         )
 
+    @traced
     def create_access_token(self, user: User) -> AccessTokenOutputSchema:
         access_token_expire_delta = dt.timedelta(minutes=self._settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token_expires_at = dt.datetime.now(tz=dt.timezone.utc) + access_token_expire_delta
-        access_token = self._create_access_token(user, expires_at=access_token_expires_at)
+        access_token = self._create_token(user, expires_at=access_token_expires_at)
 
         return AccessTokenOutputSchema(access_token=access_token)
 
-    def _create_refresh_token(self, user: User, expires_at: dt.datetime) -> str:
-        token_payload = RefreshTokenPayloadSchema(
-            sub=str(user.uuid),
-            exp=calendar.timegm(expires_at.utctimetuple()),
-        )
+    @staticmethod
+    def _create_opaque_refresh_token() -> str:
+        return secrets.token_urlsafe(32)
 
-        return self._create_token(token_payload)
+    @staticmethod
+    def _get_opaque_refresh_token_digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
 
-    def _create_access_token(self, user: User, expires_at: dt.datetime) -> str:
-        token_payload = AccessTokenPayloadSchema(
-            sub=str(user.uuid),
-            exp=calendar.timegm(expires_at.utctimetuple()),
-        )
+    @traced
+    def _create_token(self, user: User, expires_at: dt.datetime) -> str:
+        # Claims follow the field order of AccessTokenPayloadSchema / RefreshTokenPayloadSchema
+        claims = {
+            "sub": str(user.uuid),
+            "exp": calendar.timegm(expires_at.utctimetuple()),
+        }
 
-        return self._create_token(token_payload)
+        with TOKEN_OPERATION_DURATION.labels("sign").time():
+            return get_jwt_minter(
+                self._settings.TOKEN_PRIVATE_KEY, key_id=str(self._settings.TOKEN_PUBLIC_KEY_PK)
+            ).encode(claims)
 
-    def _create_token(self, payload: AccessTokenPayloadSchema | RefreshTokenPayloadSchema) -> str:
-        encoded_jwt = jwt.encode(
-            claims=payload.model_dump(),
-            key=self._settings.TOKEN_PRIVATE_KEY,
-            algorithm=self._jwt_algorithm,
-        )
+    @traced
+    async def decode_refresh_token(self, token: str) -> RefreshTokenPayloadSchema:
+        if is_opaque_refresh_token(token, settings=self._settings):
+            jwt_session = await self._get_jwt_session_by_opaque_refresh_token(token)
+            return RefreshTokenPayloadSchema(
+                sub=str(jwt_session.user_uuid),
+                exp=calendar.timegm(jwt_session.expires_at.utctimetuple()),
+            )
+
+        payload = await self._token_verifier.decode_token(token)
+        return RefreshTokenPayloadSchema.model_validate(payload)
 
-        return encoded_jwt
+    @traced
+    async def get_user_by_refresh_token(self, token: str) -> User:
+        if is_opaque_refresh_token(token, settings=self._settings):
+            jwt_session = await self._get_jwt_session_by_opaque_refresh_token(token)
+            if not jwt_session.user.is_active:
+                raise UserNotFoundException
 
-    async def decode_access_token(self, token: str) -> AccessTokenPayloadSchema:
-        payload = await self._decode_token(token)
-        return AccessTokenPayloadSchema.model_validate(payload)
+            return jwt_session.user
 
-    async def decode_refresh_token(self, token: str) -> RefreshTokenPayloadSchema:
-        payload = await self._decode_token(token)
-        return RefreshTokenPayloadSchema.model_validate(payload)
+        token_payload = await self.decode_refresh_token(token=token)
+        return await self.get_active_user_with_not_denied_sessions_by_uuid(user_uuid=_uuid.UUID(token_payload.sub))
 
-    async def _decode_token(self, token: str) -> dict[str, typing.Any]:
-        public_key_data: JwtPublicKeySchema = await self._jwt_public_key_repository.get(  # type: ignore
-            pk=self._settings.TOKEN_PUBLIC_KEY_PK,
+    @traced
+    async def _get_jwt_session_by_opaque_refresh_token(self, token: str) -> JwtSession:
+        jwt_session = await self._jwt_session_repository.get_jwt_session_with_user_by_refresh_token(
+            refresh_token=self._get_opaque_refresh_token_digest(token),
         )
+        if jwt_session is None or jwt_session.is_denied:
+            logger.error("Invalid refresh token", event="token.invalid_refresh_token")
+            raise InvalidRefreshTokenException
 
-        try:
-            payload = jwt.decode(token, public_key_data.public_key, algorithms=[self._jwt_algorithm])
-
-        except ExpiredSignatureError:
-            logger.error("Token is expired")
+        if jwt_session.expires_at <= dt.datetime.now(tz=dt.timezone.utc):
+            logger.error("Token is expired", event="token.expired")
             raise TokenIsExpiredException
 
-        except JWTError as e:
-            logger.error(f"Decode token error: {e}")
-            raise TokenDecodeException(error=e)
-
-        return payload
+        return jwt_session
 
+    @traced
     async def get_active_user_with_not_denied_sessions_by_uuid(self, user_uuid: _uuid.UUID) -> User:
         user = await self._user_repository.get_active_user_with_not_denied_sessions_by_uuid(uuid=user_uuid)
         if not user:
@@ -159,6 +200,7 @@ class AuthService:
 
         return user
 
+    @traced
     async def sign_up(self, credentials: SignUpInputSchema) -> User:
         hashed_password = self.hash_password(credentials.password)
 
@@ -177,26 +219,62 @@ class AuthService:
         return user
 
     @classmethod
+    @traced
     def hash_password(cls, raw_password: str) -> str:
-        return cls._password_context.hash(raw_password)
+        with PASSWORD_HASH_DURATION.labels("hash").time():
+            return cls._password_context.hash(raw_password)
 
+    @traced
     async def delete_user_session(self, user: User) -> None:
-        await self._jwt_session_repository.delete_jwt_session_by_user_uuid(user_uuid=user.uuid)
+        jwt_session_uuids = await self._jwt_session_repository.delete_jwt_session_by_user_uuid(user_uuid=user.uuid)
         await self._session.commit()
 
+        await self._revocation_service.revoke_user(
+            user.uuid, reason=RevocationReasonEnum.SIGN_OUT, session_uuids=jwt_session_uuids
+        )
+
 
 def _has_permissions(security_scopes: SecurityScopes, user: User) -> None:
     if security_scopes.scopes and user.role not in security_scopes.scopes:
         raise OperationNotPermittedException
 
 
+async def get_auth_service(
+    session: AsyncSession = Depends(get_session),
+    user_repository: UserRepository = Depends(get_user_repository),
+    jwt_session_repository: JwtSessionRepository = Depends(get_jwt_session_repository),
+    jwt_session_writer: JwtSessionRepository | JwtSessionBatcher = Depends(get_jwt_session_writer),
+    token_verifier: TokenVerifier = Depends(get_token_verifier),
+    revocation_service: RevocationService = Depends(get_revocation_service),
+) -> AuthService:
+    return AuthService(
+        settings=get_settings(),
+        session=session,
+        user_repository=user_repository,
+        jwt_session_repository=jwt_session_repository,
+        jwt_session_writer=jwt_session_writer,
+        token_verifier=token_verifier,
+        revocation_service=revocation_service,
+    )
+
+
+async def get_access_token_payload(
+    access_token: str = Depends(access_token_scheme),
+    token_verifier: TokenVerifier = Depends(get_token_verifier),
+) -> AccessTokenPayloadSchema:
+    # A dependency of its own, so endpoints needing the expiry share the decode of get_user_by_access_token
+    return await token_verifier.decode_access_token(token=access_token)
+
+
 async def get_user_by_access_token(
     security_scopes: SecurityScopes,
-    access_token: str = Depends(access_token_scheme),
-    auth_service: AuthService = Depends(),
+    token_payload: AccessTokenPayloadSchema = Depends(get_access_token_payload),
+    user_repository: UserRepository = Depends(get_user_repository),
 ) -> User:
-    token_payload = await auth_service.decode_access_token(token=access_token)
-    user = await auth_service.get_active_user_with_not_denied_sessions_by_uuid(user_uuid=_uuid.UUID(token_payload.sub))
+    user = await user_repository.get_active_user_with_not_denied_sessions_by_uuid(uuid=_uuid.UUID(token_payload.sub))
+    if not user:
+        raise UserNotFoundException
+
     _has_permissions(security_scopes, user)
     return user
 
@@ -204,9 +282,8 @@ async def get_user_by_access_token(
 async def get_user_by_refresh_token(
     security_scopes: SecurityScopes,
     refresh_token: str = Depends(refresh_token_scheme),
-    auth_service: AuthService = Depends(),
+    auth_service: AuthService = Depends(get_auth_service),
 ) -> User:
-    token_payload = await auth_service.decode_refresh_token(token=refresh_token)
-    user = await auth_service.get_active_user_with_not_denied_sessions_by_uuid(user_uuid=_uuid.UUID(token_payload.sub))
+    user = await auth_service.get_user_by_refresh_token(token=refresh_token)
     _has_permissions(security_scopes, user)
     return user
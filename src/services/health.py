@@ -0,0 +1,144 @@
+import asyncio
+import time
+import typing
+
+from loguru import logger
+from sqlalchemy import text
+
+from db.postgres import get_engine
+from db.redis import get_redis_connection
+from db.repositories.jwt import JwtPublicKeyRepository
+from enums import HealthStatusEnum
+from schemas.health import (
+    ComponentHealthSchema,
+    PostgresPoolStatsSchema,
+    ReadinessOutputSchema,
+    RedisPoolStatsSchema,
+)
+from settings import Settings, get_settings
+from utils.singleflight import SingleFlight
+
+
+class HealthCheckFailedException(Exception):
+    pass
+
+
+class HealthService:
+    # Shared by all requests of the process: probes within HEALTH_CHECK_CACHE_SECONDS reuse one result
+    _readiness_checks: SingleFlight[str, ReadinessOutputSchema] = SingleFlight("readiness")
+    _cached_readiness: tuple[float, ReadinessOutputSchema] | None = None
+
+    def __init__(self, settings: Settings) -> None:
+        self._settings = settings
+
+    async def get_readiness(self) -> ReadinessOutputSchema:
+        cached_readiness = HealthService._cached_readiness
+        if cached_readiness is not None:
+            checked_at, readiness = cached_readiness
+            if time.monotonic() - checked_at < self._settings.HEALTH_CHECK_CACHE_SECONDS:
+                return readiness
+
+        return await self._readiness_checks.do("readiness", self._check_readiness)
+
+    async def _check_readiness(self) -> ReadinessOutputSchema:
+        # Pool stats are taken first, so the checks' own connections are not counted
+        postgres_pool = self._get_postgres_pool_stats()
+        redis_pool = self._get_redis_pool_stats()
+
+        postgres, redis, jwt_key = await asyncio.gather(
+            self._run_check("postgres", self._check_postgres()),
+            self._run_check("redis", self._check_redis()),
+            self._run_check("jwt_key", self._check_jwt_key()),
+        )
+        checks = {"postgres": postgres, "redis": redis, "jwt_key": jwt_key}
+
+        is_saturated = (
+            max(postgres_pool.utilisation, redis_pool.utilisation) >= self._settings.HEALTH_POOL_SATURATION_THRESHOLD
+        )
+        is_ready = not is_saturated and all(check.status == HealthStatusEnum.OK for check in checks.values())
+
+        readiness = ReadinessOutputSchema(
+            status=HealthStatusEnum.OK if is_ready else HealthStatusEnum.FAIL,
+            checks=checks,
+            postgres_pool=postgres_pool,
+            redis_pool=redis_pool,
+        )
+        HealthService._cached_readiness = (time.monotonic(), readiness)
+
+        return readiness
+
+    async def _run_check(self, name: str, check: typing.Awaitable[None]) -> ComponentHealthSchema:
+        started_at = time.perf_counter()
+        try:
+            async with asyncio.timeout(self._settings.HEALTH_CHECK_TIMEOUT_SECONDS):
+                await check
+
+        except Exception as e:
+            logger.warning("Health check failed", event="health.check_failed", check=name, error=repr(e))
+
+            # Only our own messages are exposed, driver errors stay in the logs
+            error = str(e) if isinstance(e, HealthCheckFailedException) else type(e).__name__
+            return ComponentHealthSchema(
+                status=HealthStatusEnum.FAIL,
+                latency_ms=round((time.perf_counter() - started_at) * 1000, 2),
+                error=error,
+            )
+
+        return ComponentHealthSchema(
+            status=HealthStatusEnum.OK,
+            latency_ms=round((time.perf_counter() - started_at) * 1000, 2),
+        )
+
+    @staticmethod
+    async def _check_postgres() -> None:
+        async with get_engine().connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    @staticmethod
+    async def _check_redis() -> None:
+        await get_redis_connection().ping()
+
+    async def _check_jwt_key(self) -> None:
+        if not self._settings.TOKEN_PRIVATE_KEY:
+            raise HealthCheckFailedException("Signing key is not loaded")
+
+        jwt_public_key_repository = JwtPublicKeyRepository(redis_client=get_redis_connection())
+        if await jwt_public_key_repository.get(pk=self._settings.TOKEN_PUBLIC_KEY_PK) is None:
+            raise HealthCheckFailedException("Verification key is not loaded")
+
+    @staticmethod
+    def _get_postgres_pool_stats() -> PostgresPoolStatsSchema:
+        pool = get_engine().pool
+
+        size = pool.size()  # type: ignore[attr-defined]
+        checked_out = pool.checkedout()  # type: ignore[attr-defined]
+        # A negative max overflow means unlimited connections: utilisation is then relative to the pool size
+        max_overflow = getattr(pool, "max_overflow", 0)
+        capacity = size + max(max_overflow, 0)
+
+        return PostgresPoolStatsSchema(
+            size=size,
+            checked_out=checked_out,
+            overflow=max(pool.overflow(), 0),  # type: ignore[attr-defined]
+            max_overflow=max_overflow,
+            utilisation=round(checked_out / capacity, 3) if capacity else 0,
+        )
+
+    @staticmethod
+    def _get_redis_pool_stats() -> RedisPoolStatsSchema:
+        pool = get_redis_connection().connection_pool
+
+        # redis-py exposes no public counters for the pool
+        in_use = len(pool._in_use_connections)
+        max_connections = pool.max_connections
+
+        return RedisPoolStatsSchema(
+            in_use=in_use,
+            available=len(pool._available_connections),
+            max_connections=max_connections,
+            utilisation=round(in_use / max_connections, 3),
+        )
+
+
+async def get_health_service() -> HealthService:
+    return HealthService(settings=get_settings())
@@ -0,0 +1,109 @@
+import re
+import time
+import typing
+import uuid as _uuid
+
+from fastapi import Depends
+from loguru import logger
+from redis.exceptions import RedisError
+
+from db.repositories.revocation import (
+    RevocationEventRepository,
+    get_revocation_event_repository,
+    get_revocation_event_stream_repository,
+)
+from enums import RevocationReasonEnum
+from exceptions import InvalidEventIdException
+from monitoring.tracing import traced
+from schemas.revocation import RevocationEventSchema
+from settings import Settings, get_settings
+
+# Redis stream entry id: milliseconds, optionally followed by a sequence number
+EVENT_ID_PATTERN = re.compile(r"\d+(-\d+)?")
+EVENTS_PER_READ = 100
+
+
+class RevocationService:
+    """Publishes revocation events and follows them for consumers like gateways.
+
+    Consumers that verify or cache access tokens themselves reject a token whose ``sub`` has an event
+    with ``exp`` at or before the event's ``expires_at``. The stream keeps events for one access token
+    lifetime; older events only concern tokens that have expired anyway.
+    """
+
+    def __init__(self, settings: Settings, revocation_event_repository: RevocationEventRepository) -> None:
+        self._settings = settings
+        self._revocation_event_repository = revocation_event_repository
+
+    @traced
+    async def revoke_user(
+        self,
+        user_uuid: _uuid.UUID,
+        reason: RevocationReasonEnum,
+        session_uuids: typing.Sequence[_uuid.UUID] = (),
+    ) -> None:
+        now = int(time.time())
+        access_token_lifetime_seconds = self._settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        event = RevocationEventSchema(
+            user_uuid=user_uuid,
+            session_uuids=list(session_uuids),
+            reason=reason,
+            not_before=now,
+            expires_at=now + access_token_lifetime_seconds,
+        )
+
+        try:
+            event_id = await self._revocation_event_repository.publish(
+                event, min_event_id=str((now - access_token_lifetime_seconds) * 1000)
+            )
+
+        except RedisError as e:
+            # The change is committed either way; consumers fall back to the token expiry
+            logger.error("Revocation event not published", event="revocation.publish_error", error=str(e))
+            return
+
+        logger.info("Revocation event published", event="revocation.published", event_id=event_id, reason=reason)
+
+    def follow_events(
+        self, after_event_id: str | None
+    ) -> typing.AsyncIterator[tuple[str, RevocationEventSchema] | None]:
+        """Events after ``after_event_id``, or from now on without it. ``None`` marks a quiet keep-alive period.
+
+        The id is checked here rather than in the iterator, so a bad one fails before a response starts.
+        """
+        if after_event_id is not None and not EVENT_ID_PATTERN.fullmatch(after_event_id):
+            raise InvalidEventIdException
+
+        return self._follow_events(after_event_id)
+
+    async def _follow_events(
+        self,
+        after_event_id: str | None,
+    ) -> typing.AsyncIterator[tuple[str, RevocationEventSchema] | None]:
+        if after_event_id is None:
+            after_event_id = await self._revocation_event_repository.get_last_event_id()
+
+        while True:
+            events = await self._revocation_event_repository.read(
+                after_event_id,
+                count=EVENTS_PER_READ,
+                block_seconds=self._settings.REVOCATION_EVENTS_KEEP_ALIVE_SECONDS,
+            )
+            if not events:
+                yield None
+
+            for event_id, event in events:
+                yield event_id, event
+                after_event_id = event_id
+
+
+async def get_revocation_service(
+    revocation_event_repository: RevocationEventRepository = Depends(get_revocation_event_repository),
+) -> RevocationService:
+    return RevocationService(settings=get_settings(), revocation_event_repository=revocation_event_repository)
+
+
+async def get_revocation_stream_service(
+    revocation_event_repository: RevocationEventRepository = Depends(get_revocation_event_stream_repository),
+) -> RevocationService:
+    return RevocationService(settings=get_settings(), revocation_event_repository=revocation_event_repository)
@@ -0,0 +1,84 @@
+import functools
+import typing
+
+from jose import ExpiredSignatureError, JWTError, jwt
+from loguru import logger
+
+from db.redis import get_redis_connection
+from db.repositories.jwt import JwtPublicKeyRepository
+from exceptions import TokenDecodeException, TokenIsExpiredException
+from monitoring.metrics import TOKEN_OPERATION_DURATION
+from monitoring.tracing import traced
+from schemas.auth import AccessTokenPayloadSchema
+from schemas.jwt import JwkSchema, JwksOutputSchema, JwtPublicKeySchema
+from settings import Settings, get_settings
+from utils.jwt import get_public_jwk
+from utils.singleflight import SingleFlight
+
+
+class TokenVerifier:
+    """Checks token signatures against the public key stored in Redis.
+
+    It holds no request state, so one instance serves the whole process and endpoints that only verify a
+    token never build a database session or repositories.
+    """
+
+    _jwt_algorithm: str = "RS256"
+    # Concurrent requests carrying the same token share one signature check
+    _token_decodes: SingleFlight[str, dict[str, typing.Any]] = SingleFlight("decode_token")
+
+    def __init__(self, settings: Settings, jwt_public_key_repository: JwtPublicKeyRepository) -> None:
+        self._settings = settings
+        self._jwt_public_key_repository = jwt_public_key_repository
+
+    @traced
+    async def decode_access_token(self, token: str) -> AccessTokenPayloadSchema:
+        payload = await self.decode_token(token)
+        return AccessTokenPayloadSchema.model_validate(payload)
+
+    @traced
+    async def decode_token(self, token: str) -> dict[str, typing.Any]:
+        return await self._token_decodes.do(token, functools.partial(self._verify_token, token))
+
+    @traced
+    async def get_jwks(self) -> JwksOutputSchema:
+        public_key_data: JwtPublicKeySchema | None = await self._jwt_public_key_repository.get(  # type: ignore
+            pk=self._settings.TOKEN_PUBLIC_KEY_PK,
+        )
+        if public_key_data is None:
+            return JwksOutputSchema(keys=[])
+
+        jwk = get_public_jwk(public_key_data.public_key, key_id=str(self._settings.TOKEN_PUBLIC_KEY_PK))
+        return JwksOutputSchema(keys=[JwkSchema.model_validate(jwk)])
+
+    async def _verify_token(self, token: str) -> dict[str, typing.Any]:
+        public_key_data: JwtPublicKeySchema = await self._jwt_public_key_repository.get(  # type: ignore
+            pk=self._settings.TOKEN_PUBLIC_KEY_PK,
+        )
+
+        try:
+            with TOKEN_OPERATION_DURATION.labels("verify").time():
+                payload = jwt.decode(token, public_key_data.public_key, algorithms=[self._jwt_algorithm])
+
+        except ExpiredSignatureError:
+            logger.error("Token is expired", event="token.expired")
+            raise TokenIsExpiredException
+
+        except JWTError as e:
+            logger.error("Decode token error", event="token.decode_error", error=str(e))
+            raise TokenDecodeException(error=e)
+
+        return payload
+
+
+@functools.lru_cache
+def get_shared_token_verifier() -> TokenVerifier:
+    return TokenVerifier(
+        settings=get_settings(),
+        jwt_public_key_repository=JwtPublicKeyRepository(redis_client=get_redis_connection()),
+    )
+
+
+async def get_token_verifier() -> TokenVerifier:
+    # FastAPI runs plain functions and classes in the thread pool; an async provider is resolved inline
+    return get_shared_token_verifier()
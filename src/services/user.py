@@ -7,33 +7,65 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.models import User
 from db.postgres import get_session
-from db.repositories.user import UserRepository
-from exceptions import UserNotFoundException
-from schemas.user import UserChangeSchema
+from db.repositories.user import UserRepository, get_user_repository
+from enums import RevocationReasonEnum, UserSearchModeEnum
+from exceptions import SearchQueryTooShortException, UserNotFoundException
+from schemas.user import UserChangeSchema, UserOutputSchema, UserSearchOutputSchema
+from services.revocation import RevocationService, get_revocation_service
 from settings import Settings, get_settings
 
 
 class UserService:
     def __init__(
         self,
-        settings: Settings = Depends(get_settings),
-        session: AsyncSession = Depends(get_session),
-        user_repository: UserRepository = Depends(),
+        settings: Settings,
+        session: AsyncSession,
+        user_repository: UserRepository,
+        revocation_service: RevocationService,
     ) -> None:
         self._settings = settings
 
         self._session = session
         self._user_repository = user_repository
+        self._revocation_service = revocation_service
 
     async def get_all_users(self) -> typing.Sequence[User]:
         all_users = await self._user_repository.get_all_users()
 
         return all_users
 
+    async def search_users(
+        self,
+        query: str,
+        mode: UserSearchModeEnum,
+        limit: int,
+        after_uuid: _uuid.UUID | None = None,
+    ) -> UserSearchOutputSchema:
+        min_length = self._settings.USERS_SEARCH_SUBSTRING_MIN_LENGTH
+        if mode == UserSearchModeEnum.SUBSTRING and len(query) < min_length:
+            raise SearchQueryTooShortException(min_length=min_length)
+
+        limit = min(limit, self._settings.USERS_SEARCH_MAX_LIMIT)
+
+        # One extra row tells whether there is a next page without a separate count query
+        users = await self._user_repository.search_users(
+            query=query,
+            mode=mode,
+            limit=limit + 1,
+            after_uuid=after_uuid,
+        )
+        has_next_page = len(users) > limit
+        users = users[:limit]
+
+        return UserSearchOutputSchema(
+            items=[UserOutputSchema.model_validate(user) for user in users],
+            next_after=users[-1].uuid if has_next_page else None,
+        )
+
     async def get_user_by_uuid(self, user_uuid: _uuid.UUID) -> User:
         user = await self._user_repository.get_user_by_uuid(user_uuid)
         if user is None:
-            logger.error(f"User with uuid {user_uuid} not found")
+            logger.error("User not found", event="user.not_found", user_uuid=user_uuid)
             raise UserNotFoundException
 
         return user
@@ -45,17 +77,35 @@ class UserService:
     ) -> User:
         changed_user = await self._user_repository.change_user_by_uuid(user_uuid, user_data=user_data)
         if changed_user is None:
-            logger.error(f"User with uuid {user_uuid} not found")
+            logger.error("User not found", event="user.not_found", user_uuid=user_uuid)
             raise UserNotFoundException
 
         await self._session.commit()
 
+        if "is_active" in user_data.model_fields_set and not changed_user.is_active:
+            await self._revocation_service.revoke_user(user_uuid, reason=RevocationReasonEnum.USER_DEACTIVATED)
+
         return changed_user
 
     async def delete_user_by_uuid(self, user_uuid: _uuid.UUID) -> None:
         deleted_user = await self._user_repository.delete_user_by_uuid(user_uuid)
         if deleted_user is None:
-            logger.error(f"User with uuid {user_uuid} not found")
+            logger.error("User not found", event="user.not_found", user_uuid=user_uuid)
             raise UserNotFoundException
 
         await self._session.commit()
+
+        await self._revocation_service.revoke_user(user_uuid, reason=RevocationReasonEnum.USER_DELETED)
+
+
+async def get_user_service(
+    session: AsyncSession = Depends(get_session),
+    user_repository: UserRepository = Depends(get_user_repository),
+    revocation_service: RevocationService = Depends(get_revocation_service),
+) -> UserService:
+    return UserService(
+        settings=get_settings(),
+        session=session,
+        user_repository=user_repository,
+        revocation_service=revocation_service,
+    )
@@ -4,6 +4,8 @@ from functools import lru_cache
 
 from pydantic_settings import BaseSettings
 
+from enums import RefreshTokenFormatEnum, TracingExporterEnum
+
 
 class Settings(BaseSettings):
     BASE_DIR: pathlib.Path = pathlib.Path(__file__).resolve().parent
@@ -18,19 +20,98 @@ class Settings(BaseSettings):
 
     TOKEN_PRIVATE_KEY_PASSWORD: str = "CHANGE_ME"
     TOKEN_PRIVATE_KEY: str = ""
+    TOKEN_KEYS_PROVISIONED: bool = False
+    # Where the production entrypoint hands the provisioned private key to its workers, readable by the owner only
+    TOKEN_PRIVATE_KEY_FILE: pathlib.Path | None = None
 
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    REFRESH_TOKEN_FORMAT: RefreshTokenFormatEnum = RefreshTokenFormatEnum.JWT
+
+    JWT_SESSION_GROUP_COMMIT: bool = False
+    JWT_SESSION_GROUP_COMMIT_MAX_BATCH_SIZE: int = 64
+    JWT_SESSION_GROUP_COMMIT_MAX_DELAY_MS: int = 5
+
+    USERS_SEARCH_MAX_LIMIT: int = 100
+    # Trigram indexes cannot serve shorter substring patterns, which would scan the whole table
+    USERS_SEARCH_SUBSTRING_MIN_LENGTH: int = 3
+
+    LOG_LEVEL: str = "INFO"
+    LOG_SAMPLING_FIRST: int = 100
+    LOG_SAMPLING_THEREAFTER: int = 100
+    LOG_SAMPLING_INTERVAL_SECONDS: float = 1.0
+
+    # Off by default: behind a proxy all requests share the proxy's address unless RATE_LIMIT_TRUSTED_PROXY_HOPS
+    # is the number of proxies in front of the service, each appending to X-Forwarded-For
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMIT_TRUSTED_PROXY_HOPS: int = 0
+    # "<capacity>/<period_seconds>" per client and route template
+    RATE_LIMIT_DEFAULT: str = "100/1"
+    RATE_LIMIT_ROUTES: dict[str, str] = {
+        "/api/v1/auth/sign-in": "10/60",
+        "/api/v1/auth/sign-up": "10/60",
+    }
+    RATE_LIMIT_EXEMPT_ROUTES: list[str] = ["/metrics", "/health/live", "/health/ready"]
+    RATE_LIMIT_LOCAL_SHARE: float = 0.1
+    RATE_LIMIT_LOCAL_LEASE_SECONDS: float = 1.0
+
+    # Upper bound of Cache-Control max-age of user reads; token validations are cacheable until the token expires
+    USER_CACHE_MAX_AGE_SECONDS: int = 30
+
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 0.5
+    HEALTH_CHECK_CACHE_SECONDS: float = 1.0
+    # Share of pool connections in use above which the instance reports itself not ready
+    HEALTH_POOL_SATURATION_THRESHOLD: float = 0.9
+
+    METRICS_ENABLED: bool = True
+
+    # Off by default: without an exporter every span tree would be recorded only to be dropped
+    TRACING_ENABLED: bool = False
+    TRACING_SERVICE_NAME: str = "auth-service"
+    TRACING_SAMPLE_RATIO: float = 1.0
+    TRACING_EXPORTER: TracingExporterEnum = TracingExporterEnum.NONE
+
+    TRAFFIC_CAPTURE_ENABLED: bool = False
+    TRAFFIC_CAPTURE_PATH: pathlib.Path = pathlib.Path("traffic/capture.jsonl")
+    # HMAC key of the token fingerprints; set the same value on all workers to follow a token across them
+    TRAFFIC_CAPTURE_KEY: str = ""
+    TRAFFIC_CAPTURE_BUFFER_RECORDS: int = 256
+    TRAFFIC_CAPTURE_FLUSH_INTERVAL_SECONDS: float = 1.0
+
+    # Serve validate-access and JWT validate-refresh without FastAPI routing and dependency resolution
+    TOKEN_VALIDATION_FAST_PATH_ENABLED: bool = False
+
+    # Revocation event streams send a keep-alive comment after this long without events
+    REVOCATION_EVENTS_KEEP_ALIVE_SECONDS: float = 15.0
 
     POSTGRES_HOST: str = "0.0.0.0"
     POSTGRES_PORT: int = 5432
     POSTGRES_USER: str = "auth-service"
     POSTGRES_PASSWORD: str = "auth-service"
     POSTGRES_DB: str = "auth-service"
+    # Appended to the test database name, so parallel test workers get one database each
+    POSTGRES_TEST_DB_SUFFIX: str = ""
+    # Per worker: the server needs workers * (pool size + max overflow) Postgres connections at most
+    POSTGRES_POOL_SIZE: int = 5
+    POSTGRES_MAX_OVERFLOW: int = 10
+
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    # 0 runs one worker per CPU available to the process
+    SERVER_WORKERS: int = 0
+    SERVER_BACKLOG: int = 2048
+    # Longer than the load balancer idle timeout, so the balancer never reuses a connection the server just closed
+    SERVER_KEEP_ALIVE_SECONDS: int = 75
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = 30
+    SERVER_LIMIT_CONCURRENCY: int | None = None
+    SERVER_ACCESS_LOG: bool = False
 
     @property
     def postgres_dsn(self):
-        database = self.POSTGRES_DB if self.ENVIRONMENT != "test" else f"{self.POSTGRES_DB}_test"
+        database = self.POSTGRES_DB
+        if self.ENVIRONMENT == "test":
+            database = f"{self.POSTGRES_DB}_test{self.POSTGRES_TEST_DB_SUFFIX}"
+
         return (
             f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@"
             f"{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{database}"
@@ -0,0 +1,39 @@
+import pytest
+from httpx import AsyncClient
+from jose import jwt
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from services.auth import AuthService
+from settings import get_settings
+from tests.factories.user import UserFactory
+from tests.utils import get_random_str
+
+pytestmark = pytest.mark.in_memory
+
+
+@pytest.mark.asyncio
+async def test__jwks__verifies_issued_access_token(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    user_raw_password = get_random_str()
+    user = await UserFactory.create(
+        session=async_db_session,
+        password=AuthService.hash_password(user_raw_password),
+        is_active=True,
+    )
+    sign_in_response = await api_client.post(
+        "/api/v1/auth/sign-in", json={"username": user.username, "password": user_raw_password}
+    )
+    access_token = sign_in_response.json()["access_token"]
+
+    response = await api_client.get("/api/v1/auth/jwks")
+    response_data = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [key["kid"] for key in response_data["keys"]] == [str(get_settings().TOKEN_PUBLIC_KEY_PK)]
+
+    key = response_data["keys"][0]
+    assert jwt.get_unverified_header(access_token)["kid"] == key["kid"]
+    assert jwt.decode(access_token, key, algorithms=[key["alg"]])["sub"] == str(user.uuid)
@@ -0,0 +1,198 @@
+import calendar
+import datetime as dt
+import hashlib
+import secrets
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from db.models import JwtSession, User
+from enums import HeaderKeyEnum, RefreshTokenFormatEnum
+from exceptions import InvalidRefreshTokenException, TokenIsExpiredException
+from services.auth import AuthService
+from settings import get_settings
+from tests.factories.jwt_session import JwtSessionFactory
+from tests.factories.user import UserFactory
+from tests.utils import get_random_str, get_refresh_token
+
+
+@pytest.fixture(scope="function", autouse=True)
+def opaque_refresh_token_format(app: FastAPI, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Requested through the app, so the settings are patched after the test session has created them
+    monkeypatch.setattr(get_settings(), "REFRESH_TOKEN_FORMAT", RefreshTokenFormatEnum.OPAQUE)
+
+
+async def _create_user_with_opaque_refresh_token(
+    async_db_session: AsyncSession,
+    is_expired: bool = False,
+    is_denied: bool = False,
+) -> tuple[User, str, dt.datetime]:
+    user = await UserFactory.create(
+        session=async_db_session,
+        password=AuthService.hash_password(get_random_str()),
+        is_active=True,
+    )
+
+    refresh_token = secrets.token_urlsafe(32)
+    refresh_token_expire_delta = dt.timedelta(days=get_settings().REFRESH_TOKEN_EXPIRE_DAYS)
+    if is_expired is False:
+        expires_at = dt.datetime.now(tz=dt.timezone.utc) + refresh_token_expire_delta
+    else:
+        expires_at = dt.datetime.now(tz=dt.timezone.utc) - refresh_token_expire_delta
+
+    await JwtSessionFactory.create(
+        session=async_db_session,
+        user_uuid=user.uuid,
+        refresh_token=hashlib.sha256(refresh_token.encode()).hexdigest(),
+        expires_at=expires_at,
+        is_denied=is_denied,
+    )
+
+    return user, refresh_token, expires_at
+
+
+@pytest.mark.asyncio
+async def test__opaque_refresh_token__sign_in_stores_digest(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    user_raw_password = get_random_str()
+
+    user = await UserFactory.create(
+        session=async_db_session,
+        password=AuthService.hash_password(user_raw_password),
+        is_active=True,
+    )
+    sign_in_data = {
+        "username": user.username,
+        "password": user_raw_password,
+    }
+
+    response = await api_client.post("/api/v1/auth/sign-in", json=sign_in_data)
+    response_data = response.json()
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response_data["access_token"].count(".") == 2
+    assert "." not in response_data["refresh_token"]
+
+    jwt_session_after_sign_in = await async_db_session.scalar(select(JwtSession).filter_by(user_uuid=user.uuid))
+
+    assert jwt_session_after_sign_in
+    assert (
+        jwt_session_after_sign_in.refresh_token == hashlib.sha256(response_data["refresh_token"].encode()).hexdigest()
+    )
+
+
+@pytest.mark.asyncio
+async def test__opaque_refresh_token__recreate_access_token(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    _, refresh_token, _ = await _create_user_with_opaque_refresh_token(async_db_session)
+
+    response = await api_client.post("/api/v1/auth/access", headers={HeaderKeyEnum.REFRESH_TOKEN.value: refresh_token})
+    response_data = response.json()
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response_data.pop("access_token", None)
+    assert not response_data
+
+
+@pytest.mark.asyncio
+async def test__opaque_refresh_token__validate_refresh_token(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    user, refresh_token, expires_at = await _create_user_with_opaque_refresh_token(async_db_session)
+
+    response = await api_client.get(
+        "/api/v1/auth/validate-refresh", headers={HeaderKeyEnum.REFRESH_TOKEN.value: refresh_token}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"sub": str(user.uuid), "exp": calendar.timegm(expires_at.utctimetuple())}
+
+
+@pytest.mark.asyncio
+async def test__opaque_refresh_token__sign_out(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    user, refresh_token, _ = await _create_user_with_opaque_refresh_token(async_db_session)
+
+    response = await api_client.post(
+        "/api/v1/auth/sign-out", headers={HeaderKeyEnum.REFRESH_TOKEN.value: refresh_token}
+    )
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    jwt_session_after_sign_out = await async_db_session.scalar(select(JwtSession).filter_by(user_uuid=user.uuid))
+    assert jwt_session_after_sign_out is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "is_expired, is_denied, expected_message",
+    [
+        pytest.param(True, False, TokenIsExpiredException.message, id="expired"),
+        pytest.param(False, True, InvalidRefreshTokenException.message, id="denied"),
+    ],
+)
+async def test__opaque_refresh_token__rejected(
+    is_expired: bool,
+    is_denied: bool,
+    expected_message: str,
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    _, refresh_token, _ = await _create_user_with_opaque_refresh_token(
+        async_db_session, is_expired=is_expired, is_denied=is_denied
+    )
+
+    response = await api_client.post("/api/v1/auth/access", headers={HeaderKeyEnum.REFRESH_TOKEN.value: refresh_token})
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json().get("error") == expected_message
+
+
+@pytest.mark.asyncio
+async def test__opaque_refresh_token__unknown_token(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    response = await api_client.post(
+        "/api/v1/auth/access", headers={HeaderKeyEnum.REFRESH_TOKEN.value: secrets.token_urlsafe(32)}
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json().get("error") == InvalidRefreshTokenException.message
+
+
+@pytest.mark.asyncio
+async def test__opaque_refresh_token__jwt_refresh_token_still_accepted(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    user = await UserFactory.create(
+        session=async_db_session,
+        password=AuthService.hash_password(get_random_str()),
+        is_active=True,
+    )
+    user_refresh_token, _ = get_refresh_token(user_uuid=user.uuid)
+
+    await JwtSessionFactory.create(
+        session=async_db_session,
+        user_uuid=user.uuid,
+        refresh_token=user_refresh_token,
+        is_denied=False,
+    )
+
+    response = await api_client.post(
+        "/api/v1/auth/access", headers={HeaderKeyEnum.REFRESH_TOKEN.value: user_refresh_token}
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
@@ -0,0 +1,141 @@
+import asyncio
+import uuid
+
+import orjson
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+from starlette.types import Message
+
+from db.models import User
+from db.repositories.revocation import get_revocation_event_repository
+from enums import HeaderKeyEnum, RevocationReasonEnum, UserRolesEnum
+from exceptions import InvalidEventIdException
+from services.auth import AuthService
+from settings import get_settings
+from tests.factories.jwt_session import JwtSessionFactory
+from tests.factories.user import UserFactory
+from tests.utils import get_access_token, get_random_str, get_refresh_token
+
+pytestmark = pytest.mark.in_memory
+
+
+async def _create_user_with_session(async_db_session: AsyncSession, role: UserRolesEnum) -> tuple[User, str]:
+    user = await UserFactory.create(
+        session=async_db_session,
+        password=AuthService.hash_password(get_random_str()),
+        role=role,
+        is_active=True,
+    )
+    refresh_token, _ = get_refresh_token(user_uuid=user.uuid)
+    await JwtSessionFactory.create(
+        session=async_db_session,
+        user_uuid=user.uuid,
+        refresh_token=refresh_token,
+        is_denied=False,
+    )
+
+    return user, refresh_token
+
+
+async def _read_first_event(app: FastAPI, access_token: str, last_event_id: str) -> tuple[str, dict]:
+    """Opens the event stream, returns its first event and disconnects."""
+    body = b""
+    has_event = asyncio.Event()
+
+    async def receive() -> Message:
+        await has_event.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        nonlocal body
+        if message["type"] == "http.response.body":
+            body += message.get("body", b"")
+            if b"data: " in body:
+                has_event.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/auth/revocation-events",
+        "raw_path": b"/api/v1/auth/revocation-events",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (HeaderKeyEnum.ACCESS_TOKEN.value.lower().encode(), access_token.encode()),
+            (b"last-event-id", last_event_id.encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("test", 80),
+    }
+    await asyncio.wait_for(asyncio.gather(app(scope, receive, send), has_event.wait()), timeout=10)
+
+    fields = dict(line.split(": ", 1) for line in body.decode().split("\n\n")[0].splitlines() if ": " in line)
+    return fields["id"], orjson.loads(fields["data"])
+
+
+@pytest.mark.asyncio
+async def test__revocation_events__sign_out_and_deactivation_resumable(
+    async_db_session: AsyncSession,
+    app: FastAPI,
+    api_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(get_settings(), "REVOCATION_EVENTS_KEEP_ALIVE_SECONDS", 0.05)
+    admin, _ = await _create_user_with_session(async_db_session, role=UserRolesEnum.SUPER_ADMIN)
+    admin_access_token, _ = get_access_token(user_uuid=admin.uuid)
+    user, user_refresh_token = await _create_user_with_session(async_db_session, role=UserRolesEnum.STAFF)
+    # Other tests may have published to the same stream before
+    get_repository = app.dependency_overrides.get(get_revocation_event_repository, get_revocation_event_repository)
+    last_event_id = await (await get_repository()).get_last_event_id()
+
+    sign_out_response = await api_client.post(
+        "/api/v1/auth/sign-out", headers={HeaderKeyEnum.REFRESH_TOKEN.value: user_refresh_token}
+    )
+    deactivate_response = await api_client.patch(
+        f"/api/v1/users/{user.uuid}",
+        json={"is_active": False},
+        headers={HeaderKeyEnum.ACCESS_TOKEN.value: admin_access_token},
+    )
+
+    assert sign_out_response.status_code == status.HTTP_204_NO_CONTENT
+    assert deactivate_response.status_code == status.HTTP_200_OK
+
+    sign_out_event_id, sign_out_event = await _read_first_event(app, admin_access_token, last_event_id)
+    deactivation_event_id, deactivation_event = await _read_first_event(
+        app, admin_access_token, last_event_id=sign_out_event_id
+    )
+
+    assert sign_out_event["user_uuid"] == deactivation_event["user_uuid"] == str(user.uuid)
+    assert sign_out_event["reason"] == RevocationReasonEnum.SIGN_OUT
+    assert len(sign_out_event["session_uuids"]) == 1
+    assert uuid.UUID(sign_out_event["session_uuids"][0])
+    assert deactivation_event["reason"] == RevocationReasonEnum.USER_DEACTIVATED
+    assert deactivation_event["session_uuids"] == []
+    assert deactivation_event["expires_at"] - deactivation_event["not_before"] == (
+        get_settings().ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    )
+    assert deactivation_event_id != sign_out_event_id
+
+
+@pytest.mark.asyncio
+async def test__revocation_events__invalid_event_id(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    admin, _ = await _create_user_with_session(async_db_session, role=UserRolesEnum.ADMIN)
+    admin_access_token, _ = get_access_token(user_uuid=admin.uuid)
+
+    response = await api_client.get(
+        "/api/v1/auth/revocation-events",
+        params={"after": "not-an-id"},
+        headers={HeaderKeyEnum.ACCESS_TOKEN.value: admin_access_token},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json().get("error") == InvalidEventIdException.message
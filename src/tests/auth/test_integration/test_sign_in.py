@@ -1,12 +1,22 @@
+import asyncio
+import contextlib
+import datetime as dt
+import typing
+
 import pytest
+from fastapi import FastAPI
 from httpx import AsyncClient
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from db.models import JwtSession
+from db.repositories.jwt_session import JwtSessionBatcher, get_jwt_session_writer
 from exceptions import InvalidPasswordException, UserNotFoundException
+from schemas.jwt_session import JwtSessionCreateSchema
 from services.auth import AuthService
+from settings import get_settings
 from tests.factories.user import UserFactory
 from tests.utils import get_random_str
 
@@ -43,6 +53,109 @@ async def test__sign_in__success_case(
     assert jwt_session_after_sign_in
 
 
+@pytest.mark.asyncio
+async def test__sign_in__group_commit(
+    async_db_session: AsyncSession,
+    app: FastAPI,
+    api_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    @contextlib.asynccontextmanager
+    async def get_test_session() -> typing.AsyncIterator[AsyncSession]:
+        yield async_db_session
+
+    jwt_session_batcher = JwtSessionBatcher(session_factory=get_test_session, max_batch_size=8, max_delay_seconds=0.005)
+    monkeypatch.setattr(get_settings(), "JWT_SESSION_GROUP_COMMIT", True)
+
+    async def get_test_jwt_session_writer() -> JwtSessionBatcher:
+        return jwt_session_batcher
+
+    app.dependency_overrides[get_jwt_session_writer] = get_test_jwt_session_writer
+
+    user_raw_password = get_random_str()
+
+    user = await UserFactory.create(
+        session=async_db_session,
+        password=AuthService.hash_password(user_raw_password),
+        is_active=True,
+    )
+    sign_in_data = {
+        "username": user.username,
+        "password": user_raw_password,
+    }
+
+    response = await api_client.post("/api/v1/auth/sign-in", json=sign_in_data)
+    response_data = response.json()
+    await jwt_session_batcher.close()
+
+    assert response.status_code == status.HTTP_201_CREATED
+
+    jwt_session_after_sign_in = await async_db_session.scalar(select(JwtSession).filter_by(user_uuid=user.uuid))
+
+    assert jwt_session_after_sign_in
+    assert jwt_session_after_sign_in.refresh_token == response_data.get("refresh_token")
+
+
+@pytest.mark.asyncio
+async def test__sign_in__group_commit_duplicate_fails_only_its_row(async_db_session: AsyncSession) -> None:
+    @contextlib.asynccontextmanager
+    async def get_test_session() -> typing.AsyncIterator[AsyncSession]:
+        # A savepoint per session, so the failed INSERT rolls back without aborting the test transaction
+        async with AsyncSession(
+            bind=async_db_session.bind, join_transaction_mode="create_savepoint", expire_on_commit=False
+        ) as session:
+            yield session
+
+    jwt_session_batcher = JwtSessionBatcher(session_factory=get_test_session, max_batch_size=3, max_delay_seconds=1)
+    user = await UserFactory.create(session=async_db_session, password=get_random_str(), is_active=True)
+    expires_at = dt.datetime.now(tz=dt.timezone.utc) + dt.timedelta(days=1)
+    # Two sign-ins of one user within a second get the same JWT refresh token
+    refresh_tokens = [get_random_str(), *[get_random_str()] * 2]
+
+    results = await asyncio.gather(
+        *[
+            jwt_session_batcher.create_jwt_session(
+                JwtSessionCreateSchema(user_uuid=user.uuid, refresh_token=refresh_token, expires_at=expires_at)
+            )
+            for refresh_token in refresh_tokens
+        ],
+        return_exceptions=True,
+    )
+    await jwt_session_batcher.close()
+
+    assert [jwt_session.refresh_token for jwt_session in results[:2]] == refresh_tokens[:2]
+    assert isinstance(results[2], IntegrityError)
+    assert (
+        await async_db_session.scalar(select(func.count()).select_from(JwtSession).filter_by(user_uuid=user.uuid)) == 2
+    )
+
+
+@pytest.mark.asyncio
+async def test__sign_in__username_in_other_case(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    user_raw_password = get_random_str()
+
+    user = await UserFactory.create(
+        session=async_db_session,
+        username=f"CamelCase_{get_random_str()}",
+        password=AuthService.hash_password(user_raw_password),
+        is_active=True,
+    )
+    sign_in_data = {
+        "username": user.username.upper(),
+        "password": user_raw_password,
+    }
+
+    response = await api_client.post("/api/v1/auth/sign-in", json=sign_in_data)
+
+    assert response.status_code == status.HTTP_201_CREATED
+
+    jwt_session_after_sign_in = await async_db_session.scalar(select(JwtSession).filter_by(user_uuid=user.uuid))
+    assert jwt_session_after_sign_in
+
+
 @pytest.mark.asyncio
 async def test__sign_in__inactive_user(
     async_db_session: AsyncSession,
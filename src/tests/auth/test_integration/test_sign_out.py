@@ -15,6 +15,8 @@ from tests.factories.jwt_session import JwtSessionFactory
 from tests.factories.user import UserFactory
 from tests.utils import get_random_str, get_refresh_token
 
+pytestmark = pytest.mark.in_memory
+
 
 @pytest.mark.asyncio
 async def test__sign_out__success_case(
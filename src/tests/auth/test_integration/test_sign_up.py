@@ -39,6 +39,7 @@ async def test__sign_up__success_case(
     user_after_sign_up = await async_db_session.scalar(select(User).filter_by(username=generated_user.username))
 
     assert user_after_sign_up
+    assert user_after_sign_up.uuid.version == 7
     assert response_data == {
         "uuid": str(user_after_sign_up.uuid),
         "username": sign_up_data.get("username"),
@@ -72,3 +73,29 @@ async def test__sign_up__user_already_exists(
 
     assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
     assert response_data.get("error") == CreateUserException.message
+
+
+@pytest.mark.asyncio
+async def test__sign_up__user_already_exists_with_other_case(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    user_raw_password = get_random_str()
+
+    generated_user = await UserFactory.create(
+        session=async_db_session,
+        username=f"CamelCase_{get_random_str()}",
+        password=AuthService.hash_password(user_raw_password),
+        is_active=True,
+    )
+
+    sign_up_data = {
+        "username": generated_user.username.lower(),
+        "password": user_raw_password,
+    }
+
+    response = await api_client.post("/api/v1/auth/sign-up", json=sign_up_data)
+    response_data = response.json()
+
+    assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    assert response_data.get("error") == CreateUserException.message
@@ -15,6 +15,8 @@ from services.auth import AuthService
 from tests.factories.user import UserFactory
 from tests.utils import get_access_token, get_random_str
 
+pytestmark = pytest.mark.in_memory
+
 
 @pytest.mark.asyncio
 async def test__validate_access_token__success_case(
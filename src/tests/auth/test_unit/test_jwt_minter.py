@@ -0,0 +1,60 @@
+import calendar
+import datetime as dt
+import uuid
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwt
+
+from schemas.auth import AccessTokenPayloadSchema
+from services.token import TokenVerifier
+from utils.jwt import JwtMinter
+
+
+@pytest.fixture(scope="module")
+def private_key() -> str:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    return key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode()
+
+
+def test__jwt_minter__byte_compatible_with_jose(private_key: str) -> None:
+    expires_at = dt.datetime.now(tz=dt.timezone.utc) + dt.timedelta(minutes=30)
+    token_payload = AccessTokenPayloadSchema(
+        sub=str(uuid.uuid4()),
+        exp=calendar.timegm(expires_at.utctimetuple()),
+    )
+
+    jose_token = jwt.encode(claims=token_payload.model_dump(), key=private_key, algorithm=TokenVerifier._jwt_algorithm)
+    minted_token = JwtMinter(private_key=private_key).encode(token_payload.model_dump())
+
+    assert minted_token == jose_token
+
+
+def test__jwt_minter__key_id_byte_compatible_with_jose(private_key: str) -> None:
+    claims = {"sub": str(uuid.uuid4()), "exp": 1700000000}
+
+    jose_token = jwt.encode(
+        claims=claims, key=private_key, algorithm=TokenVerifier._jwt_algorithm, headers={"kid": "key-id"}
+    )
+    minted_token = JwtMinter(private_key=private_key, key_id="key-id").encode(claims)
+
+    assert minted_token == jose_token
+    assert jwt.get_unverified_header(minted_token)["kid"] == "key-id"
+
+
+def test__jwt_minter__not_rsa_key() -> None:
+    key = ec.generate_private_key(ec.SECP256R1())
+    private_key = key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode()
+
+    with pytest.raises(ValueError):
+        JwtMinter(private_key=private_key)
@@ -1,22 +1,70 @@
 import asyncio
 import os
 import typing
+import urllib.parse
 
-import alembic.command
 import pytest
 import pytest_asyncio
-from alembic.config import Config
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
+from fastapi import FastAPI
 from httpx import AsyncClient
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 from db.postgres import get_engine, get_session
 from db.redis import AsyncRedis, get_redis, get_redis_connection
-from main import get_app, save_jwt_key
+from db.repositories.in_memory import (
+    InMemoryJwtPublicKeyRepository,
+    InMemorySession,
+    InMemoryStore,
+    use_in_memory_repositories,
+)
+from main import get_app, load_or_generate_private_key, save_jwt_key
+from monitoring.tracing import get_tracer_provider
 from settings import get_settings
-from tests.utils import create_database, database_exists, drop_database
+from tests.utils import create_database_from_template, drop_database
 
 pytestmark = pytest.mark.asyncio
 
+# Redis default; database 0 is left to runs without pytest-xdist workers
+REDIS_DATABASES = 16
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--no-in-memory",
+        action="store_true",
+        help="run tests marked in_memory against Postgres and Redis as well",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line("markers", "in_memory: run against in-memory repositories instead of Postgres and Redis")
+
+    # Each pytest-xdist worker gets its own Postgres database and Redis database index
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER")
+    if worker_id:
+        os.environ["POSTGRES_TEST_DB_SUFFIX"] = f"_{worker_id}"
+        os.environ["REDIS_DSN"] = _get_worker_redis_dsn(worker_id)
+        get_settings.cache_clear()
+
+
+def _get_worker_redis_dsn(worker_id: str) -> str:
+    redis_database = int(worker_id.removeprefix("gw")) + 1
+    if redis_database >= REDIS_DATABASES:
+        raise pytest.UsageError(f"Redis has {REDIS_DATABASES} databases: run at most {REDIS_DATABASES - 1} workers")
+
+    return urllib.parse.urlsplit(get_settings().REDIS_DSN)._replace(path=f"/{redis_database}").geturl()
+
+
+def _is_in_memory(request: pytest.FixtureRequest) -> bool:
+    if request.config.getoption("--no-in-memory"):
+        return False
+
+    return request.node.get_closest_marker("in_memory") is not None
+
 
 @pytest.fixture(scope="session")
 def mock_settings() -> None:
@@ -24,9 +72,14 @@ def mock_settings() -> None:
     os.environ["ENVIRONMENT"] = "test"
 
 
+@pytest.fixture(scope="session")
+def jwt_private_key() -> RSAPrivateKey:
+    return load_or_generate_private_key()
+
+
 @pytest_asyncio.fixture(scope="function")
-async def save_jwt_key_on_app_startup() -> None:
-    await save_jwt_key()
+async def save_jwt_key_on_app_startup(jwt_private_key: RSAPrivateKey) -> None:
+    await save_jwt_key(key=jwt_private_key)
 
 
 @pytest.fixture(scope="session")
@@ -40,10 +93,11 @@ def event_loop() -> typing.Generator[asyncio.AbstractEventLoop, None, None]:
 async def async_db_engine(mock_settings) -> typing.AsyncGenerator[AsyncEngine, None]:
     settings = get_settings()
 
-    if await database_exists(settings.postgres_dsn):
-        await drop_database(settings.postgres_dsn)
-
-    await create_database(settings.postgres_dsn)
+    template_url = make_url(settings.postgres_dsn).set(database=f"{settings.POSTGRES_DB}_test_template")
+    await create_database_from_template(
+        settings.postgres_dsn,
+        template_url=template_url.render_as_string(hide_password=False),
+    )
 
     engine = get_engine()
     await engine.dispose()
@@ -54,19 +108,8 @@ async def async_db_engine(mock_settings) -> typing.AsyncGenerator[AsyncEngine, N
     await drop_database(settings.postgres_dsn)
 
 
-@pytest.fixture(scope="session")
-def apply_migrations() -> typing.Generator[None, None, None]:
-    settings = get_settings()
-
-    config = Config(os.path.join(settings.BASE_DIR, "alembic.ini"))
-    config.set_main_option("script_location", os.path.join(settings.BASE_DIR, "migrations"))
-    alembic.command.upgrade(config, "head")
-    yield
-    alembic.command.downgrade(config, "base")
-
-
 @pytest_asyncio.fixture(scope="function")
-async def async_db_session(async_db_engine: AsyncEngine, apply_migrations) -> typing.AsyncGenerator[AsyncSession, None]:
+async def postgres_db_session(async_db_engine: AsyncEngine) -> typing.AsyncGenerator[AsyncSession, None]:
     async with async_db_engine.connect() as conn:
         async with conn.begin() as transaction:
             session = AsyncSession(bind=conn, expire_on_commit=False)
@@ -83,16 +126,76 @@ async def async_redis_client() -> typing.AsyncGenerator[AsyncRedis, None]:
         await redis.flushdb()
 
 
+@pytest.fixture(scope="function")
+def in_memory_store() -> InMemoryStore:
+    return InMemoryStore()
+
+
+@pytest.fixture(scope="function")
+def async_db_session(request: pytest.FixtureRequest) -> AsyncSession | InMemorySession:
+    """Postgres session in a rolled back transaction, or an in-memory one for tests marked ``in_memory``."""
+    if _is_in_memory(request):
+        return InMemorySession(store=request.getfixturevalue("in_memory_store"))
+
+    return request.getfixturevalue("postgres_db_session")
+
+
 @pytest_asyncio.fixture(scope="function")
-async def api_client(
-    async_db_session: AsyncSession,
+async def postgres_app(
+    postgres_db_session: AsyncSession,
     async_redis_client: AsyncRedis,
     save_jwt_key_on_app_startup: None,
-) -> typing.AsyncGenerator[AsyncClient, None]:
+) -> FastAPI:
     app = get_app()
 
-    app.dependency_overrides[get_session] = lambda: async_db_session
+    app.dependency_overrides[get_session] = lambda: postgres_db_session
     app.dependency_overrides[get_redis] = lambda: async_redis_client
 
+    return app
+
+
+@pytest_asyncio.fixture(scope="function")
+async def in_memory_app(
+    in_memory_store: InMemoryStore,
+    jwt_private_key: RSAPrivateKey,
+    monkeypatch: pytest.MonkeyPatch,
+) -> FastAPI:
+    # The rate limiter talks to Redis directly, outside of dependency injection
+    monkeypatch.setattr(get_settings(), "RATE_LIMIT_ENABLED", False)
+    app = get_app()
+
+    use_in_memory_repositories(app, store=in_memory_store)
+    await save_jwt_key(
+        key=jwt_private_key,
+        jwt_public_key_repository=InMemoryJwtPublicKeyRepository(store=in_memory_store),
+    )
+
+    return app
+
+
+@pytest.fixture(scope="function")
+def app(request: pytest.FixtureRequest) -> FastAPI:
+    if _is_in_memory(request):
+        return request.getfixturevalue("in_memory_app")
+
+    return request.getfixturevalue("postgres_app")
+
+
+@pytest_asyncio.fixture(scope="function")
+async def api_client(app: FastAPI) -> typing.AsyncGenerator[AsyncClient, None]:
     async with AsyncClient(app=app, base_url="http://test") as client:
         yield client
+
+
+@pytest.fixture(scope="session")
+def in_memory_span_exporter() -> InMemorySpanExporter:
+    span_exporter = InMemorySpanExporter()
+    get_tracer_provider().add_span_processor(SimpleSpanProcessor(span_exporter))
+    return span_exporter
+
+
+@pytest.fixture(scope="function")
+def span_exporter(in_memory_span_exporter: InMemorySpanExporter) -> typing.Generator[InMemorySpanExporter, None, None]:
+    in_memory_span_exporter.clear()
+    yield in_memory_span_exporter
+    in_memory_span_exporter.clear()
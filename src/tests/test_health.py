@@ -0,0 +1,94 @@
+import typing
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from db.redis import AsyncRedis
+from db.repositories.jwt import JwtPublicKeyRepository
+from enums import HealthStatusEnum
+from services.health import HealthService
+from settings import get_settings
+
+
+@pytest.fixture(autouse=True)
+def clear_readiness_cache() -> typing.Generator[None, None, None]:
+    HealthService._cached_readiness = None
+    yield
+    HealthService._cached_readiness = None
+
+
+@pytest.mark.asyncio
+async def test__health__live(api_client: AsyncClient) -> None:
+    response = await api_client.get("/health/live")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"status": HealthStatusEnum.OK.value}
+
+
+@pytest.mark.asyncio
+async def test__health__ready(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    response = await api_client.get("/health/ready")
+    response_data = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response_data["status"] == HealthStatusEnum.OK.value
+    assert {name: check["status"] for name, check in response_data["checks"].items()} == {
+        "postgres": HealthStatusEnum.OK.value,
+        "redis": HealthStatusEnum.OK.value,
+        "jwt_key": HealthStatusEnum.OK.value,
+    }
+    assert set(response_data["postgres_pool"]) == {"size", "checked_out", "overflow", "max_overflow", "utilisation"}
+    assert set(response_data["redis_pool"]) == {"in_use", "available", "max_connections", "utilisation"}
+    assert "RateLimit-Limit" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test__health__ready_without_verification_key(
+    async_db_session: AsyncSession,
+    async_redis_client: AsyncRedis,
+    api_client: AsyncClient,
+) -> None:
+    await JwtPublicKeyRepository(redis_client=async_redis_client).delete(pk=get_settings().TOKEN_PUBLIC_KEY_PK)
+
+    response = await api_client.get("/health/ready")
+    response_data = response.json()
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response_data["checks"]["jwt_key"] == {
+        "status": HealthStatusEnum.FAIL.value,
+        "latency_ms": response_data["checks"]["jwt_key"]["latency_ms"],
+        "error": "Verification key is not loaded",
+    }
+
+
+@pytest.mark.asyncio
+async def test__health__ready_is_cached(
+    async_db_session: AsyncSession,
+    async_redis_client: AsyncRedis,
+    api_client: AsyncClient,
+) -> None:
+    first_response = await api_client.get("/health/ready")
+    await JwtPublicKeyRepository(redis_client=async_redis_client).delete(pk=get_settings().TOKEN_PUBLIC_KEY_PK)
+    second_response = await api_client.get("/health/ready")
+
+    assert first_response.status_code == second_response.status_code == status.HTTP_200_OK
+    assert first_response.json() == second_response.json()
+
+
+@pytest.mark.asyncio
+async def test__health__ready_with_saturated_pool(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(get_settings(), "HEALTH_POOL_SATURATION_THRESHOLD", 0.0)
+
+    response = await api_client.get("/health/ready")
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json()["status"] == HealthStatusEnum.FAIL.value
@@ -0,0 +1,148 @@
+import datetime as dt
+import typing
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from api.fast_path import TokenValidationMiddleware
+from db.models import User
+from enums import HeaderKeyEnum, UserRolesEnum
+from main import message_exception_handler
+from services.auth import AuthService
+from settings import get_settings
+from tests.factories.jwt_session import JwtSessionFactory
+from tests.factories.user import UserFactory
+from tests.utils import get_access_token, get_random_str, get_refresh_token
+from utils.http_cache import is_etag_matched
+
+pytestmark = pytest.mark.in_memory
+
+
+async def _create_user_with_session(
+    async_db_session: AsyncSession, role: UserRolesEnum, **user_fields: typing.Any
+) -> tuple[User, str]:
+    user = await UserFactory.create(
+        session=async_db_session,
+        password=AuthService.hash_password(get_random_str()),
+        role=role,
+        is_active=True,
+        **user_fields,
+    )
+    refresh_token, _ = get_refresh_token(user_uuid=user.uuid)
+    await JwtSessionFactory.create(
+        session=async_db_session,
+        user_uuid=user.uuid,
+        refresh_token=refresh_token,
+        is_denied=False,
+    )
+    access_token, _ = get_access_token(user_uuid=user.uuid)
+
+    return user, access_token
+
+
+def _get_max_age(cache_control: str) -> int:
+    assert cache_control.startswith("private, max-age=")
+    return int(cache_control.removeprefix("private, max-age="))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("is_fast_path", [pytest.param(False, id="endpoint"), pytest.param(True, id="fast_path")])
+async def test__http_cache__validate_access_not_modified_until_token_expires(
+    is_fast_path: bool,
+    async_db_session: AsyncSession,
+    app: FastAPI,
+) -> None:
+    user, access_token = await _create_user_with_session(async_db_session, role=UserRolesEnum.STAFF)
+    other_access_token, _ = get_access_token(user_uuid=user.uuid, is_expired=True)
+    asgi_app = app
+    if is_fast_path:
+        asgi_app = TokenValidationMiddleware(
+            app,
+            routes=app.routes,
+            dependency_overrides_provider=app,
+            exception_handler=message_exception_handler,
+            settings=get_settings(),
+        )
+
+    async with AsyncClient(app=asgi_app, base_url="http://test") as client:
+        headers = {HeaderKeyEnum.ACCESS_TOKEN.value: access_token}
+        response = await client.get("/api/v1/auth/validate-access", headers=headers)
+        etag = response.headers["etag"]
+        not_modified_response = await client.get(
+            "/api/v1/auth/validate-access", headers={**headers, "If-None-Match": f'W/"other", {etag}'}
+        )
+        # The tag is of the token: another token with the same tag must still be verified
+        expired_response = await client.get(
+            "/api/v1/auth/validate-access",
+            headers={HeaderKeyEnum.ACCESS_TOKEN.value: other_access_token, "If-None-Match": etag},
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert 0 < _get_max_age(response.headers["cache-control"]) <= get_settings().ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    assert response.headers["vary"] == HeaderKeyEnum.ACCESS_TOKEN.value
+    assert not_modified_response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified_response.content == b""
+    assert not_modified_response.headers["etag"] == etag
+    assert expired_response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test__http_cache__current_user_etag_changes_with_user(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    # Requests of a test share one transaction, where now() does not move: the change has to look later
+    user, access_token = await _create_user_with_session(
+        async_db_session,
+        role=UserRolesEnum.STAFF,
+        updated_at=dt.datetime.now(tz=dt.timezone.utc) - dt.timedelta(days=1),
+    )
+    headers = {HeaderKeyEnum.ACCESS_TOKEN.value: access_token}
+
+    response = await api_client.get("/api/v1/users/me", headers=headers)
+    etag = response.headers["etag"]
+    not_modified_response = await api_client.get("/api/v1/users/me", headers={**headers, "If-None-Match": etag})
+    await api_client.patch(
+        "/api/v1/users/me", params={"user_uuid": str(user.uuid)}, json={"full_name": get_random_str()}, headers=headers
+    )
+    changed_response = await api_client.get("/api/v1/users/me", headers={**headers, "If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert _get_max_age(response.headers["cache-control"]) <= get_settings().USER_CACHE_MAX_AGE_SECONDS
+    assert not_modified_response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert changed_response.status_code == status.HTTP_200_OK
+    assert changed_response.headers["etag"] != etag
+    assert changed_response.json()["full_name"] != response.json()["full_name"]
+
+
+@pytest.mark.asyncio
+async def test__http_cache__user_by_uuid_not_modified(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(get_settings(), "USER_CACHE_MAX_AGE_SECONDS", 5)
+    _, admin_access_token = await _create_user_with_session(async_db_session, role=UserRolesEnum.ADMIN)
+    user, _ = await _create_user_with_session(async_db_session, role=UserRolesEnum.STAFF)
+    headers = {HeaderKeyEnum.ACCESS_TOKEN.value: admin_access_token}
+
+    response = await api_client.get(f"/api/v1/users/{user.uuid}", headers=headers)
+    not_modified_response = await api_client.get(
+        f"/api/v1/users/{user.uuid}", headers={**headers, "If-None-Match": response.headers["etag"]}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["cache-control"] == "private, max-age=5"
+    assert not_modified_response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified_response.headers["cache-control"] == "private, max-age=5"
+
+
+def test__is_etag_matched() -> None:
+    assert is_etag_matched('"a", "b"', '"b"')
+    assert is_etag_matched('W/"b"', '"b"')
+    assert is_etag_matched("*", '"b"')
+    assert not is_etag_matched(None, '"b"')
+    assert not is_etag_matched('"bb"', '"b"')
@@ -0,0 +1,90 @@
+import datetime as dt
+
+import pytest
+
+from db.models import JwtSession, User
+from db.repositories.in_memory import (
+    InMemoryJwtPublicKeyRepository,
+    InMemoryJwtSessionRepository,
+    InMemoryStore,
+    InMemoryUserRepository,
+)
+from enums import UserRolesEnum
+from exceptions import CreateUserException
+from schemas.jwt import JwtPublicKeySchema
+from schemas.user import UserChangeSchema, UserCreateSchema
+from settings import get_settings
+
+
+def _get_user_data(username: str, email: str | None = None) -> UserCreateSchema:
+    return UserCreateSchema(username=username, email=email, password="hash", role=UserRolesEnum.STAFF, is_active=True)
+
+
+@pytest.mark.asyncio
+async def test__in_memory_user_repository__username_and_email_are_unique_ignoring_case(
+    in_memory_store: InMemoryStore,
+) -> None:
+    user_repository = InMemoryUserRepository(store=in_memory_store)
+    await user_repository.create_user(data=_get_user_data("Alice", email="alice@example.com"))
+
+    with pytest.raises(CreateUserException):
+        await user_repository.create_user(data=_get_user_data("ALICE"))
+
+    with pytest.raises(CreateUserException):
+        await user_repository.create_user(data=_get_user_data("bob", email="Alice@Example.com"))
+
+    assert await user_repository.get_active_user_by_username(username="alice") is not None
+
+
+@pytest.mark.asyncio
+async def test__in_memory_user_repository__change_username_moves_index(in_memory_store: InMemoryStore) -> None:
+    user_repository = InMemoryUserRepository(store=in_memory_store)
+    user = await user_repository.create_user(data=_get_user_data("alice"))
+
+    await user_repository.change_user_by_uuid(user.uuid, user_data=UserChangeSchema(username="carol"))
+
+    assert await user_repository.get_active_user_by_username(username="alice") is None
+    assert await user_repository.get_active_user_by_username(username="carol") == user
+
+
+@pytest.mark.asyncio
+async def test__in_memory_user_repository__delete_cascades_to_jwt_sessions(in_memory_store: InMemoryStore) -> None:
+    user_repository = InMemoryUserRepository(store=in_memory_store)
+    jwt_session_repository = InMemoryJwtSessionRepository(store=in_memory_store)
+    user = await user_repository.create_user(data=_get_user_data("alice"))
+    in_memory_store.insert_jwt_session(
+        JwtSession(user_uuid=user.uuid, refresh_token="token", expires_at=dt.datetime.now(tz=dt.timezone.utc))
+    )
+
+    jwt_session = await jwt_session_repository.get_jwt_session_with_user_by_refresh_token(refresh_token="token")
+    assert jwt_session is not None and jwt_session.user == user
+    assert await user_repository.get_active_user_with_not_denied_sessions_by_uuid(uuid=user.uuid) == user
+
+    await user_repository.delete_user_by_uuid(user.uuid)
+
+    assert await jwt_session_repository.get_jwt_session_with_user_by_refresh_token(refresh_token="token") is None
+    assert in_memory_store.refresh_tokens_by_user_uuid == {}
+
+
+@pytest.mark.asyncio
+async def test__in_memory_user_repository__user_without_sessions_is_not_authenticated(
+    in_memory_store: InMemoryStore,
+) -> None:
+    user = in_memory_store.insert_user(User(username="alice", password="hash", is_active=True))
+
+    user_repository = InMemoryUserRepository(store=in_memory_store)
+
+    assert user.role == UserRolesEnum.STAFF
+    assert await user_repository.get_active_user_with_not_denied_sessions_by_uuid(uuid=user.uuid) is None
+
+
+@pytest.mark.asyncio
+async def test__in_memory_redis_repository__value_expires(in_memory_store: InMemoryStore) -> None:
+    jwt_public_key_repository = InMemoryJwtPublicKeyRepository(store=in_memory_store)
+    jwt_public_key = JwtPublicKeySchema(pk=get_settings().TOKEN_PUBLIC_KEY_PK, public_key="key")
+
+    await jwt_public_key_repository.save(instance=jwt_public_key)
+    assert await jwt_public_key_repository.get(pk=jwt_public_key.pk) == jwt_public_key
+
+    await jwt_public_key_repository.save(instance=jwt_public_key, expire_seconds=-1)
+    assert await jwt_public_key_repository.get(pk=jwt_public_key.pk) is None
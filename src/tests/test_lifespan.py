@@ -0,0 +1,79 @@
+import pathlib
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.replay import read_capture
+from db.redis import AsyncRedis
+from db.repositories.jwt import JwtPublicKeyRepository
+from main import get_app, save_jwt_key
+from monitoring.traffic import get_traffic_recorder
+from settings import get_settings
+
+
+@pytest.mark.asyncio
+async def test__lifespan__startup_and_shutdown(
+    async_db_session: AsyncSession,
+    async_redis_client: AsyncRedis,
+) -> None:
+    app: FastAPI = get_app()
+
+    async with app.router.lifespan_context(app):
+        jwt_public_key = await JwtPublicKeyRepository(redis_client=async_redis_client).get(
+            pk=get_settings().TOKEN_PUBLIC_KEY_PK
+        )
+
+        assert jwt_public_key
+        assert get_settings().TOKEN_PRIVATE_KEY
+        assert set(app.state.startup_timings) == {"total", "redis", "jwt_key", "postgres", "warm_up"}
+
+
+@pytest.mark.asyncio
+async def test__lifespan__provisioned_key_from_file(
+    async_db_session: AsyncSession,
+    async_redis_client: AsyncRedis,
+    jwt_private_key: RSAPrivateKey,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    app: FastAPI = get_app()
+    await save_jwt_key(key=jwt_private_key)
+    private_key = get_settings().TOKEN_PRIVATE_KEY
+    key_file = tmp_path / "token-private-key"
+    key_file.write_text(private_key)
+    # Workers of the production entrypoint get the key only through the file
+    monkeypatch.setattr(get_settings(), "TOKEN_PRIVATE_KEY", "")
+    monkeypatch.setattr(get_settings(), "TOKEN_PRIVATE_KEY_FILE", key_file)
+    monkeypatch.setattr(get_settings(), "TOKEN_KEYS_PROVISIONED", True)
+
+    async with app.router.lifespan_context(app):
+        assert get_settings().TOKEN_PRIVATE_KEY == private_key
+
+
+@pytest.mark.asyncio
+async def test__lifespan__restart_with_traffic_capture(
+    async_db_session: AsyncSession,
+    async_redis_client: AsyncRedis,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    capture_path = tmp_path / "capture.jsonl"
+    monkeypatch.setattr(get_settings(), "TRAFFIC_CAPTURE_ENABLED", True)
+    monkeypatch.setattr(get_settings(), "TRAFFIC_CAPTURE_PATH", capture_path)
+    monkeypatch.setattr(get_settings(), "TRAFFIC_CAPTURE_BUFFER_RECORDS", 1)
+    get_traffic_recorder.cache_clear()
+    app: FastAPI = get_app()
+
+    try:
+        for _ in range(2):
+            async with app.router.lifespan_context(app):
+                async with AsyncClient(app=app, base_url="http://test") as client:
+                    await client.get("/not-found")
+
+    finally:
+        get_traffic_recorder.cache_clear()
+
+    assert [request.status_code for request in read_capture([capture_path])] == [404, 404]
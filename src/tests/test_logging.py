@@ -0,0 +1,94 @@
+import typing
+
+import orjson
+import pytest
+from httpx import AsyncClient
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from monitoring.logs import REDACTED, REQUEST_ID_HEADER, EventSampler, json_sink
+from services.auth import AuthService
+from tests.factories.user import UserFactory
+from tests.utils import get_random_str
+
+if typing.TYPE_CHECKING:
+    from loguru import Message
+
+
+@pytest.fixture(scope="function")
+def log_messages() -> typing.Generator[list["Message"], None, None]:
+    messages: list["Message"] = []
+    handler_id = logger.add(messages.append, level="DEBUG")
+    yield messages
+    logger.remove(handler_id)
+
+
+def test__logging__secret_fields_are_redacted(log_messages: list["Message"]) -> None:
+    logger.info("Sign in", username="user", password="secret", headers={"X-Refresh-Token": "secret"})
+
+    extra = log_messages[-1].record["extra"]
+
+    assert extra["username"] == "user"
+    assert extra["password"] == REDACTED
+    assert extra["headers"] == {"X-Refresh-Token": REDACTED}
+
+
+def test__logging__event_sampler() -> None:
+    sampler = EventSampler(first=2, thereafter=3, interval_seconds=60)
+    record: typing.Any = {"extra": {"event": "sign_in.invalid_password"}}
+
+    kept = [sampler(record) for _ in range(8)]
+
+    assert kept == [True, True, False, False, True, False, False, True]
+    assert sampler({"extra": {}})  # type: ignore[arg-type]
+
+
+def test__logging__json_sink(capsys: pytest.CaptureFixture[str]) -> None:
+    handler_id = logger.add(json_sink, format="{exception}")
+    logger.warning("Invalid password", event="sign_in.invalid_password", password="secret")
+    logger.remove(handler_id)
+
+    entry = orjson.loads(capsys.readouterr().err.splitlines()[-1])
+
+    assert entry["level"] == "WARNING"
+    assert entry["message"] == "Invalid password"
+    assert entry["event"] == "sign_in.invalid_password"
+    assert entry["password"] == REDACTED
+
+
+@pytest.mark.asyncio
+async def test__logging__request_id(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+    log_messages: list["Message"],
+) -> None:
+    user = await UserFactory.create(
+        session=async_db_session,
+        password=AuthService.hash_password(get_random_str()),
+        is_active=True,
+    )
+    password = get_random_str()
+
+    response = await api_client.post(
+        "/api/v1/auth/sign-in",
+        json={"username": user.username, "password": password},
+        headers={REQUEST_ID_HEADER: "test-request-id"},
+    )
+    record = next(message.record for message in log_messages if message.record["extra"].get("event"))
+
+    assert response.headers[REQUEST_ID_HEADER] == "test-request-id"
+    assert record["extra"]["event"] == "sign_in.invalid_password"
+    assert record["extra"]["request_id"] == "test-request-id"
+    assert password not in str(record)
+
+
+@pytest.mark.asyncio
+async def test__logging__generated_request_id(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    first_response = await api_client.get("/api/v1/users/me")
+    second_response = await api_client.get("/api/v1/users/me")
+
+    assert first_response.headers[REQUEST_ID_HEADER]
+    assert first_response.headers[REQUEST_ID_HEADER] != second_response.headers[REQUEST_ID_HEADER]
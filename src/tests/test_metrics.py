@@ -0,0 +1,94 @@
+import uuid as _uuid
+
+import pytest
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from db import postgres
+from services.auth import AuthService
+from tests.factories.user import UserFactory
+from tests.utils import get_random_str
+
+
+@pytest.mark.asyncio
+async def test__metrics__route_template_labels(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    await api_client.get(f"/api/v1/users/{_uuid.uuid4()}")
+    await api_client.get(f"/{get_random_str()}")
+
+    response = await api_client.get("/metrics")
+    metrics = response.text
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_requests_total{method="GET",route="/api/v1/users/{user_uuid}",status_code="401"}' in metrics
+    assert 'http_requests_total{method="GET",route="unmatched",status_code="404"}' in metrics
+
+
+@pytest.mark.asyncio
+async def test__metrics__sign_in_timings(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    user_raw_password = get_random_str()
+    user = await UserFactory.create(
+        session=async_db_session,
+        password=AuthService.hash_password(user_raw_password),
+        is_active=True,
+    )
+
+    await api_client.post("/api/v1/auth/sign-in", json={"username": user.username, "password": user_raw_password})
+
+    response = await api_client.get("/metrics")
+    metrics = response.text
+
+    assert 'password_hash_duration_seconds_count{operation="verify"}' in metrics
+    assert 'token_operation_duration_seconds_count{operation="sign"}' in metrics
+    assert 'db_statement_duration_seconds_count{operation="SELECT"}' in metrics
+    assert 'lru_cache_hits_total{cache="jwt_minter"}' in metrics
+
+
+class _SteppingClock:
+    """``perf_counter`` that moves one second per call, from where the test sets it."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def perf_counter(self) -> float:
+        self.now += 1
+        return self.now
+
+
+def _get_select_duration_samples() -> tuple[float, float]:
+    labels = {"operation": "SELECT"}
+    return (
+        REGISTRY.get_sample_value("db_statement_duration_seconds_count", labels) or 0.0,
+        REGISTRY.get_sample_value("db_statement_duration_seconds_sum", labels) or 0.0,
+    )
+
+
+@pytest.mark.asyncio
+async def test__metrics__failed_statement_start_not_in_next_duration(
+    async_db_session: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    clock = _SteppingClock()
+    monkeypatch.setattr(postgres, "time", clock)
+    count_before, sum_before = _get_select_duration_samples()
+
+    with pytest.raises(DBAPIError):
+        async with async_db_session.begin_nested():
+            await async_db_session.execute(text("SELECT 1 / 0"))
+    clock.now = 1000.0
+    await async_db_session.execute(text("SELECT 1"))
+    count_after, sum_after = _get_select_duration_samples()
+
+    # Only the successful statement is observed, timed from its own start
+    assert count_after - count_before == 1
+    assert sum_after - sum_before == 1.0
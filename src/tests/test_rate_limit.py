@@ -0,0 +1,122 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from db.redis import AsyncRedis
+from exceptions import RateLimitExceededException
+from settings import get_settings
+
+
+@pytest.fixture(scope="function", autouse=True)
+def rate_limit_enabled(mock_settings: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Autouse runs before the app fixture, which adds the middleware only when enabled
+    monkeypatch.setattr(get_settings(), "RATE_LIMIT_ENABLED", True)
+
+
+@pytest.mark.asyncio
+async def test__rate_limit__headers(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    response = await api_client.get("/api/v1/users/me")
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.headers["RateLimit-Limit"] == "100"
+    assert response.headers["RateLimit-Remaining"] == "99"
+    assert response.headers["RateLimit-Policy"] == "100;w=1"
+    assert "Retry-After" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test__rate_limit__limit_exceeded(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setitem(get_settings().RATE_LIMIT_ROUTES, "/api/v1/users/me", "2/60")
+
+    first_response = await api_client.get("/api/v1/users/me")
+    second_response = await api_client.get("/api/v1/users/me")
+    limited_response = await api_client.get("/api/v1/users/me")
+
+    assert first_response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert second_response.headers["RateLimit-Remaining"] == "0"
+    assert limited_response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert limited_response.json() == {"error": RateLimitExceededException.message}
+    assert int(limited_response.headers["Retry-After"]) == 30
+
+
+@pytest.mark.asyncio
+async def test__rate_limit__per_route_template(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setitem(get_settings().RATE_LIMIT_ROUTES, "/api/v1/users/{user_uuid}", "1/60")
+
+    await api_client.get("/api/v1/users/018b4c6e-0000-7000-8000-000000000001")
+    limited_response = await api_client.get("/api/v1/users/018b4c6e-0000-7000-8000-000000000002")
+    other_route_response = await api_client.get("/api/v1/users/me")
+
+    assert limited_response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert other_route_response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test__rate_limit__local_lease(
+    async_db_session: AsyncSession,
+    async_redis_client: AsyncRedis,
+    api_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setitem(get_settings().RATE_LIMIT_ROUTES, "/api/v1/users/me", "100/60")
+
+    responses = [await api_client.get("/api/v1/users/me") for _ in range(5)]
+    shared_tokens = await async_redis_client.hget("rate_limit:/api/v1/users/me:127.0.0.1", "tokens")
+
+    # One Redis call leased 10 tokens, the next requests were served from the lease
+    assert int(float(shared_tokens)) == 90
+    assert [response.headers["RateLimit-Remaining"] for response in responses] == ["99", "98", "97", "96", "95"]
+
+
+@pytest.mark.asyncio
+async def test__rate_limit__cors_outside_limiter(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setitem(get_settings().RATE_LIMIT_ROUTES, "/api/v1/users/me", "1/60")
+    origin = get_settings().cors_allow_origin_list[0]
+
+    preflight_responses = [
+        await api_client.options("/api/v1/users/me", headers={"Origin": origin, "Access-Control-Request-Method": "GET"})
+        for _ in range(3)
+    ]
+    first_response = await api_client.get("/api/v1/users/me", headers={"Origin": origin})
+    limited_response = await api_client.get("/api/v1/users/me", headers={"Origin": origin})
+
+    assert [response.status_code for response in preflight_responses] == [status.HTTP_200_OK] * 3
+    assert first_response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert limited_response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert limited_response.headers["Access-Control-Allow-Origin"] == origin
+    assert "Retry-After" in limited_response.headers["Access-Control-Expose-Headers"]
+
+
+@pytest.mark.asyncio
+async def test__rate_limit__trusted_proxy_hops(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setitem(get_settings().RATE_LIMIT_ROUTES, "/api/v1/users/me", "1/60")
+    monkeypatch.setattr(get_settings(), "RATE_LIMIT_TRUSTED_PROXY_HOPS", 1)
+
+    # The leftmost entry is set by the client and does not pick the bucket
+    first_client_response = await api_client.get("/api/v1/users/me", headers={"X-Forwarded-For": "1.1.1.1, 10.0.0.1"})
+    spoofed_response = await api_client.get("/api/v1/users/me", headers={"X-Forwarded-For": "2.2.2.2, 10.0.0.1"})
+    second_client_response = await api_client.get("/api/v1/users/me", headers={"X-Forwarded-For": "10.0.0.2"})
+
+    assert first_client_response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert spoofed_response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert second_client_response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,14 @@
+import pytest
+
+from utils.responses import PydanticResponse
+
+
+def test__pydantic_response__content_without_schema() -> None:
+    with pytest.raises(TypeError, match="dict content needs a schema"):
+        PydanticResponse({"count": 1})
+
+
+def test__pydantic_response__content_with_schema() -> None:
+    response = PydanticResponse([{"count": 1}], schema=list[dict[str, int]])
+
+    assert response.body == b'[{"count":1}]'
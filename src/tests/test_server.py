@@ -0,0 +1,56 @@
+import os
+import pathlib
+import stat
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
+
+import server
+from db.redis import AsyncRedis
+from settings import get_settings
+
+
+def test__get_worker_count__settings_override(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(get_settings(), "SERVER_WORKERS", 3)
+    monkeypatch.setattr(os, "sched_getaffinity", lambda _: {0}, raising=False)
+
+    assert server.get_worker_count(get_settings()) == 3
+
+
+def test__get_worker_count__cpu_affinity(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(get_settings(), "SERVER_WORKERS", 0)
+    monkeypatch.setattr(os, "sched_getaffinity", lambda _: {0, 2}, raising=False)
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+
+    assert server.get_worker_count(get_settings()) == 2
+
+
+def test__get_worker_count__cpu_count_without_affinity(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(get_settings(), "SERVER_WORKERS", 0)
+    monkeypatch.delattr(os, "sched_getaffinity", raising=False)
+    monkeypatch.setattr(os, "cpu_count", lambda: None)
+
+    assert server.get_worker_count(get_settings()) == 1
+
+
+@pytest.mark.asyncio
+async def test__provision_jwt_keys__private_key_only_in_owner_file(
+    async_redis_client: AsyncRedis,
+    jwt_private_key: RSAPrivateKey,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(server, "load_or_generate_private_key", lambda: jwt_private_key)
+    monkeypatch.setenv("TOKEN_PRIVATE_KEY", "inherited by every child process")
+    # Set through monkeypatch, so the values written by the provisioning are undone after the test
+    monkeypatch.setenv("TOKEN_PRIVATE_KEY_FILE", "")
+    monkeypatch.setenv("TOKEN_KEYS_PROVISIONED", "false")
+
+    await server.provision_jwt_keys(str(tmp_path))
+
+    key_file = pathlib.Path(os.environ["TOKEN_PRIVATE_KEY_FILE"])
+    assert key_file.parent == tmp_path
+    assert stat.S_IMODE(key_file.stat().st_mode) == 0o600
+    assert key_file.read_text() == get_settings().TOKEN_PRIVATE_KEY
+    assert "TOKEN_PRIVATE_KEY" not in os.environ
+    assert os.environ["TOKEN_KEYS_PROVISIONED"] == "true"
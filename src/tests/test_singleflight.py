@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from db.redis import AsyncRedis
+from db.repositories.jwt import JwtPublicKeyRepository
+from schemas.jwt import JwtPublicKeySchema
+from utils.singleflight import SingleFlight
+
+
+def _get_coalesced_calls(name: str) -> float:
+    return REGISTRY.get_sample_value("singleflight_calls_total", {"name": name, "role": "coalesced"}) or 0
+
+
+@pytest.mark.asyncio
+async def test__singleflight__concurrent_calls_are_coalesced() -> None:
+    single_flight: SingleFlight[str, int] = SingleFlight("test_coalesced")
+    calls = 0
+
+    async def lookup() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(single_flight.do("key", lookup) for _ in range(10)))
+
+    assert results == [1] * 10
+    assert calls == 1
+    assert _get_coalesced_calls("test_coalesced") == 9
+
+    # Nothing is cached once the call has finished
+    await asyncio.sleep(0)
+    assert await single_flight.do("key", lookup) == 2
+
+
+@pytest.mark.asyncio
+async def test__singleflight__exception_is_shared() -> None:
+    single_flight: SingleFlight[str, int] = SingleFlight("test_exception")
+
+    async def lookup() -> int:
+        await asyncio.sleep(0.01)
+        raise ValueError("lookup failed")
+
+    results = await asyncio.gather(*(single_flight.do("key", lookup) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test__singleflight__cancelled_leader_does_not_cancel_followers() -> None:
+    single_flight: SingleFlight[str, str] = SingleFlight("test_cancelled")
+
+    async def lookup() -> str:
+        await asyncio.sleep(0.01)
+        return "value"
+
+    leader = asyncio.ensure_future(single_flight.do("key", lookup))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(single_flight.do("key", lookup))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+
+    assert await follower == "value"
+
+
+@pytest.mark.asyncio
+async def test__singleflight__jwt_public_key_repository(async_redis_client: AsyncRedis) -> None:
+    repository = JwtPublicKeyRepository(redis_client=async_redis_client)
+    jwt_public_key = JwtPublicKeySchema(public_key="public key")
+    await repository.save(instance=jwt_public_key)
+
+    coalesced_before = _get_coalesced_calls("jwt_public_key")
+    results = await asyncio.gather(*(repository.get(pk=jwt_public_key.pk) for _ in range(5)))
+
+    assert results == [jwt_public_key] * 5
+    assert _get_coalesced_calls("jwt_public_key") - coalesced_before == 4
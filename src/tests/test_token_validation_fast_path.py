@@ -0,0 +1,94 @@
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+from starlette.types import Receive, Scope, Send
+
+from api.fast_path import TokenValidationMiddleware
+from enums import HeaderKeyEnum, RefreshTokenFormatEnum
+from main import message_exception_handler
+from services.auth import AuthService
+from settings import get_settings
+from tests.factories.user import UserFactory
+from tests.utils import get_access_token, get_random_str, get_refresh_token
+
+pytestmark = pytest.mark.in_memory
+
+
+@pytest.mark.asyncio
+async def test__token_validation_fast_path__same_responses_as_endpoints(
+    async_db_session: AsyncSession,
+    app: FastAPI,
+    api_client: AsyncClient,
+) -> None:
+    user = await UserFactory.create(
+        session=async_db_session,
+        password=AuthService.hash_password(get_random_str()),
+        is_active=True,
+    )
+    access_token, _ = get_access_token(user_uuid=user.uuid)
+    expired_access_token, _ = get_access_token(user_uuid=user.uuid, is_expired=True)
+    refresh_token, _ = get_refresh_token(user_uuid=user.uuid)
+
+    requests = [
+        ("/api/v1/auth/validate-access", {HeaderKeyEnum.ACCESS_TOKEN.value: access_token}),
+        ("/api/v1/auth/validate-access", {HeaderKeyEnum.ACCESS_TOKEN.value: expired_access_token}),
+        ("/api/v1/auth/validate-access", {HeaderKeyEnum.ACCESS_TOKEN.value: get_random_str()}),
+        ("/api/v1/auth/validate-access", {HeaderKeyEnum.ACCESS_TOKEN.value: ""}),
+        ("/api/v1/auth/validate-access", {HeaderKeyEnum.REFRESH_TOKEN.value: refresh_token}),
+        ("/api/v1/auth/validate-refresh", {HeaderKeyEnum.REFRESH_TOKEN.value: refresh_token}),
+        ("/api/v1/auth/validate-refresh", {HeaderKeyEnum.REFRESH_TOKEN.value: get_random_str()}),
+    ]
+
+    fast_path_app = TokenValidationMiddleware(
+        app,
+        routes=app.routes,
+        dependency_overrides_provider=app,
+        exception_handler=message_exception_handler,
+        settings=get_settings(),
+    )
+    async with AsyncClient(app=fast_path_app, base_url="http://test") as fast_path_client:
+        for path, headers in requests:
+            response = await api_client.get(path, headers=headers)
+            fast_path_response = await fast_path_client.get(path, headers=headers)
+
+            assert fast_path_response.status_code == response.status_code
+            assert fast_path_response.headers["content-type"] == response.headers["content-type"]
+            assert fast_path_response.content == response.content
+            assert fast_path_response.headers.get("etag") == response.headers.get("etag")
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test__token_validation_fast_path__passes_on_requests_it_cannot_answer(
+    async_db_session: AsyncSession,
+    app: FastAPI,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(get_settings(), "REFRESH_TOKEN_FORMAT", RefreshTokenFormatEnum.OPAQUE)
+    forwarded_paths = []
+
+    async def full_app(scope: Scope, receive: Receive, send: Send) -> None:
+        forwarded_paths.append(scope["path"])
+        await app(scope, receive, send)
+
+    fast_path_app = TokenValidationMiddleware(
+        full_app,
+        routes=app.routes,
+        dependency_overrides_provider=app,
+        exception_handler=message_exception_handler,
+        settings=get_settings(),
+    )
+    async with AsyncClient(app=fast_path_app, base_url="http://test") as client:
+        opaque_response = await client.get(
+            "/api/v1/auth/validate-refresh", headers={HeaderKeyEnum.REFRESH_TOKEN.value: get_random_str()}
+        )
+        await client.post("/api/v1/auth/validate-access")
+
+    assert forwarded_paths == [
+        "/api/v1/auth/validate-refresh",
+        "/api/v1/auth/validate-access",
+    ]
+    assert opaque_response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,111 @@
+import pytest
+from httpx import AsyncClient
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import format_span_id, format_trace_id
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from enums import HeaderKeyEnum
+from services.auth import AuthService
+from settings import get_settings
+from tests.factories.jwt_session import JwtSessionFactory
+from tests.factories.user import UserFactory
+from tests.utils import get_access_token, get_random_str, get_refresh_token
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_SPAN_ID = "00f067aa0ba902b7"
+
+
+@pytest.fixture(scope="function", autouse=True)
+def tracing_enabled(mock_settings: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Autouse runs before the app fixture, which adds the middleware only when enabled
+    monkeypatch.setattr(get_settings(), "TRACING_ENABLED", True)
+
+
+async def _get_current_user(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+    span_exporter: InMemorySpanExporter,
+    headers: dict[str, str],
+) -> int:
+    user = await UserFactory.create(
+        session=async_db_session,
+        password=AuthService.hash_password(get_random_str()),
+        is_active=True,
+    )
+    user_refresh_token, _ = get_refresh_token(user_uuid=user.uuid)
+    user_access_token, _ = get_access_token(user_uuid=user.uuid)
+
+    await JwtSessionFactory.create(
+        session=async_db_session,
+        user_uuid=user.uuid,
+        refresh_token=user_refresh_token,
+        is_denied=False,
+    )
+
+    # Only spans of the request itself, not of the fixtures
+    span_exporter.clear()
+
+    response = await api_client.get(
+        "/api/v1/users/me",
+        headers={HeaderKeyEnum.ACCESS_TOKEN.value: user_access_token, **headers},
+    )
+    return response.status_code
+
+
+@pytest.mark.asyncio
+async def test__tracing__get_current_user_span_tree(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+    span_exporter: InMemorySpanExporter,
+) -> None:
+    status_code = await _get_current_user(async_db_session, api_client, span_exporter, headers={})
+
+    assert status_code == status.HTTP_200_OK
+
+    spans = {span.name: span for span in span_exporter.get_finished_spans()}
+    server_span = spans["GET /api/v1/users/me"]
+    decode_span = spans["TokenVerifier.decode_access_token"]
+    redis_span = spans["redis GET"]
+
+    assert server_span.parent is None
+    assert server_span.attributes["http.route"] == "/api/v1/users/me"
+    assert server_span.attributes["http.status_code"] == status.HTTP_200_OK
+    assert decode_span.parent.span_id == server_span.context.span_id
+    assert spans["TokenVerifier.decode_token"].parent.span_id == decode_span.context.span_id
+    assert redis_span.parent.span_id == spans["BaseRedisRepository.get"].context.span_id
+    assert spans["UserRepository.get_active_user_with_not_denied_sessions_by_uuid"].parent.span_id == (
+        server_span.context.span_id
+    )
+    assert spans["PydanticResponse.render"].parent.span_id == server_span.context.span_id
+    assert {span.context.trace_id for span in spans.values()} == {server_span.context.trace_id}
+
+
+@pytest.mark.asyncio
+async def test__tracing__w3c_trace_context_propagation(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+    span_exporter: InMemorySpanExporter,
+) -> None:
+    await _get_current_user(
+        async_db_session, api_client, span_exporter, headers={"traceparent": f"00-{TRACE_ID}-{PARENT_SPAN_ID}-01"}
+    )
+
+    server_span = next(span for span in span_exporter.get_finished_spans() if span.name == "GET /api/v1/users/me")
+
+    assert format_trace_id(server_span.context.trace_id) == TRACE_ID
+    assert format_span_id(server_span.parent.span_id) == PARENT_SPAN_ID
+    assert server_span.parent.is_remote
+
+
+@pytest.mark.asyncio
+async def test__tracing__not_sampled_by_caller(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+    span_exporter: InMemorySpanExporter,
+) -> None:
+    await _get_current_user(
+        async_db_session, api_client, span_exporter, headers={"traceparent": f"00-{TRACE_ID}-{PARENT_SPAN_ID}-00"}
+    )
+
+    assert not span_exporter.get_finished_spans()
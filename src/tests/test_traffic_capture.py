@@ -0,0 +1,103 @@
+import pathlib
+import threading
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from benchmarks.replay import read_capture
+from enums import HeaderKeyEnum
+from monitoring.traffic import TrafficCaptureMiddleware, TrafficRecorder
+from services.auth import AuthService
+from tests.factories.user import UserFactory
+from tests.utils import get_random_str
+
+pytestmark = pytest.mark.in_memory
+
+
+@pytest.mark.asyncio
+async def test__traffic_capture__records_route_and_token_reuse_without_secrets(
+    async_db_session: AsyncSession,
+    app: FastAPI,
+    tmp_path: pathlib.Path,
+) -> None:
+    password = get_random_str()
+    user = await UserFactory.create(
+        session=async_db_session,
+        password=AuthService.hash_password(password),
+        is_active=True,
+    )
+
+    capture_path = tmp_path / "capture.jsonl"
+    recorder = TrafficRecorder(path=capture_path, key=b"key", buffer_records=100, flush_interval_seconds=60)
+    capture_app = TrafficCaptureMiddleware(app, recorder=recorder)
+
+    async with AsyncClient(app=capture_app, base_url="http://test") as client:
+        sign_in_response = await client.post(
+            "/api/v1/auth/sign-in", json={"username": user.username, "password": password}
+        )
+        access_token = sign_in_response.json()["access_token"]
+        for _ in range(2):
+            await client.get("/api/v1/users/me", headers={HeaderKeyEnum.ACCESS_TOKEN.value: access_token})
+        await client.get("/api/v1/users/me")
+        await client.get(f"/api/v1/users/{user.uuid}", headers={HeaderKeyEnum.ACCESS_TOKEN.value: access_token})
+    recorder.close()
+
+    capture = capture_path.read_bytes()
+    requests = read_capture([capture_path])
+
+    assert access_token.encode() not in capture
+    assert password.encode() not in capture
+    assert str(user.uuid).encode() not in capture
+
+    assert [(request.method, request.route, request.status_code) for request in requests] == [
+        ("POST", "/api/v1/auth/sign-in", status.HTTP_201_CREATED),
+        ("GET", "/api/v1/users/me", status.HTTP_200_OK),
+        ("GET", "/api/v1/users/me", status.HTTP_200_OK),
+        ("GET", "/api/v1/users/me", status.HTTP_401_UNAUTHORIZED),
+        ("GET", "/api/v1/users/{user_uuid}", status.HTTP_403_FORBIDDEN),
+    ]
+    assert requests[0].access_token_fingerprint is None
+    assert requests[1].access_token_fingerprint == requests[2].access_token_fingerprint is not None
+    assert requests[3].access_token_fingerprint is None
+
+
+def test__traffic_capture__replay_merges_captures_in_arrival_order(tmp_path: pathlib.Path) -> None:
+    first_path, second_path = tmp_path / "first.jsonl", tmp_path / "second.jsonl"
+    first_path.write_bytes(b'{"t":1.0,"m":"GET","r":"/health/live","s":200,"d":0.1}\n')
+    second_path.write_bytes(
+        b'{"t":0.5,"m":"GET","r":"/api/v1/users/me","s":200,"d":1.5,"a":"0011223344556677"}\n'
+        b'{"t":2.0,"m":"POST","r":"/api/v1/auth/access","s":201,"d":2.0,"f":"8899aabbccddeeff"}\n'
+    )
+
+    requests = read_capture([first_path, second_path])
+
+    assert [request.arrived_at for request in requests] == [0.5, 1.0, 2.0]
+    assert requests[0].name == "GET /users/me"
+    assert requests[0].access_token_fingerprint == "0011223344556677"
+    assert requests[2].refresh_token_fingerprint == "8899aabbccddeeff"
+
+
+def test__traffic_capture__writes_off_the_calling_thread(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    capture_path = tmp_path / "capture.jsonl"
+    recorder = TrafficRecorder(path=capture_path, key=b"key", buffer_records=1, flush_interval_seconds=60)
+    writer_threads = []
+
+    write = recorder._write
+
+    def record_writer_thread(data: bytes) -> None:
+        writer_threads.append(threading.current_thread())
+        write(data)
+
+    monkeypatch.setattr(recorder, "_write", record_writer_thread)
+    for status_code in (200, 401):
+        recorder.record({"t": 1.0, "m": "GET", "r": "/api/v1/users/me", "s": status_code, "d": 0.1})
+    recorder.close()
+
+    assert len(writer_threads) == 2
+    assert threading.current_thread() not in writer_threads
+    assert [request.status_code for request in read_capture([capture_path])] == [200, 401]
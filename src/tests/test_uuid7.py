@@ -0,0 +1,48 @@
+import types
+import uuid
+
+import pytest
+
+from utils import uuid7 as uuid7_module
+from utils.uuid7 import uuid7, uuid7_at
+
+# 2100-01-01T00:00:00Z
+TIMESTAMP_MS = 4_102_444_800_000
+
+
+def _get_timestamp_ms(value: uuid.UUID) -> int:
+    return value.int >> 80
+
+
+def test__uuid7_at__version_variant_and_timestamp() -> None:
+    value = uuid7_at(TIMESTAMP_MS, rand=0)
+
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+    assert _get_timestamp_ms(value) == TIMESTAMP_MS
+
+
+def test__uuid7_at__rand_masked_to_74_bits() -> None:
+    value = uuid7_at(TIMESTAMP_MS, rand=(1 << 80) - 1)
+
+    assert value == uuid7_at(TIMESTAMP_MS, rand=(1 << 74) - 1)
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+    assert _get_timestamp_ms(value) == TIMESTAMP_MS
+    # Every bit but the timestamp, version and variant is random
+    assert bin(value.int).count("1") == bin(TIMESTAMP_MS).count("1") + 74 + 3 + 1
+
+
+def test__uuid7__monotonic_within_one_millisecond(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(uuid7_module, "time", types.SimpleNamespace(time_ns=lambda: TIMESTAMP_MS * 1_000_000))
+    # Restored after the test, so later ids are not generated after the fixed time
+    monkeypatch.setattr(uuid7_module, "_last_timestamp_ms", 0)
+    monkeypatch.setattr(uuid7_module, "_counter", 0)
+
+    # More ids than the counter holds: the last ones borrow the next millisecond
+    values = [uuid7() for _ in range(5000)]
+
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+    assert {_get_timestamp_ms(value) for value in values} == {TIMESTAMP_MS, TIMESTAMP_MS + 1}
+    assert all(value.version == 7 and value.variant == uuid.RFC_4122 for value in values)
@@ -0,0 +1,96 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from enums import HeaderKeyEnum, UserRolesEnum
+from services.auth import AuthService
+from tests.factories.jwt_session import JwtSessionFactory
+from tests.factories.user import UserFactory
+from tests.utils import get_access_token, get_random_str, get_refresh_token
+
+pytestmark = pytest.mark.in_memory
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "is_active, expected_status_code",
+    [
+        pytest.param(False, status.HTTP_200_OK, id="deactivate"),
+        pytest.param(None, status.HTTP_422_UNPROCESSABLE_ENTITY, id="null"),
+    ],
+)
+async def test__change_user_by_uuid__is_active(
+    is_active: bool | None,
+    expected_status_code: int,
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    admin = await UserFactory.create(
+        session=async_db_session,
+        role=UserRolesEnum.SUPER_ADMIN,
+        password=AuthService.hash_password(get_random_str()),
+        is_active=True,
+    )
+    admin_refresh_token, _ = get_refresh_token(user_uuid=admin.uuid)
+    admin_access_token, _ = get_access_token(user_uuid=admin.uuid)
+    await JwtSessionFactory.create(
+        session=async_db_session,
+        user_uuid=admin.uuid,
+        refresh_token=admin_refresh_token,
+        is_denied=False,
+    )
+    user = await UserFactory.create(
+        session=async_db_session,
+        password=AuthService.hash_password(get_random_str()),
+        is_active=True,
+    )
+
+    response = await api_client.patch(
+        f"/api/v1/users/{user.uuid}",
+        json={"is_active": is_active},
+        headers={HeaderKeyEnum.ACCESS_TOKEN.value: admin_access_token},
+    )
+    user_response = await api_client.get(
+        f"/api/v1/users/{user.uuid}", headers={HeaderKeyEnum.ACCESS_TOKEN.value: admin_access_token}
+    )
+
+    assert response.status_code == expected_status_code
+    assert user_response.json()["is_active"] is (is_active is not False)
+
+
+@pytest.mark.asyncio
+async def test__change_user_by_uuid__keeps_is_active_when_not_sent(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    admin = await UserFactory.create(
+        session=async_db_session,
+        role=UserRolesEnum.SUPER_ADMIN,
+        password=AuthService.hash_password(get_random_str()),
+        is_active=True,
+    )
+    admin_refresh_token, _ = get_refresh_token(user_uuid=admin.uuid)
+    admin_access_token, _ = get_access_token(user_uuid=admin.uuid)
+    await JwtSessionFactory.create(
+        session=async_db_session,
+        user_uuid=admin.uuid,
+        refresh_token=admin_refresh_token,
+        is_denied=False,
+    )
+    user = await UserFactory.create(
+        session=async_db_session,
+        password=AuthService.hash_password(get_random_str()),
+        is_active=False,
+    )
+    full_name = get_random_str()
+
+    response = await api_client.patch(
+        f"/api/v1/users/{user.uuid}",
+        json={"full_name": full_name},
+        headers={HeaderKeyEnum.ACCESS_TOKEN.value: admin_access_token},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["full_name"] == full_name
+    assert response.json()["is_active"] is False
@@ -11,6 +11,8 @@ from tests.factories.jwt_session import JwtSessionFactory
 from tests.factories.user import UserFactory
 from tests.utils import get_access_token, get_random_str, get_refresh_token
 
+pytestmark = pytest.mark.in_memory
+
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
@@ -0,0 +1,187 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from enums import HeaderKeyEnum, UserRolesEnum, UserSearchModeEnum
+from exceptions import OperationNotPermittedException, SearchQueryTooShortException
+from schemas.user import UserOutputSchema
+from services.auth import AuthService
+from settings import get_settings
+from tests.factories.jwt_session import JwtSessionFactory
+from tests.factories.user import UserFactory
+from tests.utils import get_access_token, get_random_str, get_refresh_token
+
+pytestmark = pytest.mark.in_memory
+
+
+async def _get_admin_headers(async_db_session: AsyncSession, role: UserRolesEnum) -> dict[str, str]:
+    user = await UserFactory.create(
+        session=async_db_session,
+        role=role,
+        password=AuthService.hash_password(get_random_str()),
+        is_active=True,
+    )
+    user_refresh_token, _ = get_refresh_token(user_uuid=user.uuid)
+    user_access_token, _ = get_access_token(user_uuid=user.uuid)
+
+    await JwtSessionFactory.create(
+        session=async_db_session,
+        user_uuid=user.uuid,
+        refresh_token=user_refresh_token,
+        is_denied=False,
+    )
+
+    return {HeaderKeyEnum.ACCESS_TOKEN.value: user_access_token}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "requested_user_role",
+    [
+        pytest.param(UserRolesEnum.SUPER_ADMIN, id="super_admin"),
+        pytest.param(UserRolesEnum.ADMIN, id="admin"),
+    ],
+)
+async def test__search_users__success_case(
+    requested_user_role: UserRolesEnum,
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    headers = await _get_admin_headers(async_db_session, role=requested_user_role)
+
+    found_user = await UserFactory.create(
+        session=async_db_session,
+        username="Searchable_Alice",
+        password=AuthService.hash_password(get_random_str()),
+        is_active=True,
+    )
+    await UserFactory.create(
+        session=async_db_session,
+        password=AuthService.hash_password(get_random_str()),
+        is_active=True,
+    )
+
+    response = await api_client.get("/api/v1/users/search", params={"query": "able_ali"}, headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "items": [UserOutputSchema.model_validate(found_user).model_dump(mode="json")],
+        "next_after": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test__search_users__prefix_mode(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    headers = await _get_admin_headers(async_db_session, role=UserRolesEnum.ADMIN)
+
+    found_user = await UserFactory.create(
+        session=async_db_session,
+        username="prefix_bob",
+        password=AuthService.hash_password(get_random_str()),
+        is_active=True,
+    )
+    await UserFactory.create(
+        session=async_db_session,
+        username="not_prefix_bob",
+        password=AuthService.hash_password(get_random_str()),
+        is_active=True,
+    )
+
+    response = await api_client.get(
+        "/api/v1/users/search",
+        params={"query": "PREFIX_", "mode": UserSearchModeEnum.PREFIX.value},
+        headers=headers,
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["items"] == [UserOutputSchema.model_validate(found_user).model_dump(mode="json")]
+
+
+@pytest.mark.asyncio
+async def test__search_users__keyset_continuation(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    headers = await _get_admin_headers(async_db_session, role=UserRolesEnum.ADMIN)
+
+    users = [
+        await UserFactory.create(
+            session=async_db_session,
+            username=f"paged_{get_random_str()}",
+            password=AuthService.hash_password(get_random_str()),
+            is_active=True,
+        )
+        for _ in range(3)
+    ]
+    expected_uuids = sorted(str(user.uuid) for user in users)
+
+    first_response = await api_client.get(
+        "/api/v1/users/search", params={"query": "paged_", "limit": 2}, headers=headers
+    )
+    first_page = first_response.json()
+
+    assert first_response.status_code == status.HTTP_200_OK
+    assert [item["uuid"] for item in first_page["items"]] == expected_uuids[:2]
+    assert first_page["next_after"] == expected_uuids[1]
+
+    second_response = await api_client.get(
+        "/api/v1/users/search",
+        params={"query": "paged_", "limit": 2, "after": first_page["next_after"]},
+        headers=headers,
+    )
+    second_page = second_response.json()
+
+    assert second_response.status_code == status.HTTP_200_OK
+    assert [item["uuid"] for item in second_page["items"]] == expected_uuids[2:]
+    assert second_page["next_after"] is None
+
+
+@pytest.mark.asyncio
+async def test__search_users__wildcards_are_escaped(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    headers = await _get_admin_headers(async_db_session, role=UserRolesEnum.ADMIN)
+
+    response = await api_client.get("/api/v1/users/search", params={"query": "%_%"}, headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"items": [], "next_after": None}
+
+
+@pytest.mark.asyncio
+async def test__search_users__short_substring_query(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    headers = await _get_admin_headers(async_db_session, role=UserRolesEnum.ADMIN)
+
+    substring_response = await api_client.get("/api/v1/users/search", params={"query": "ab"}, headers=headers)
+    prefix_response = await api_client.get(
+        "/api/v1/users/search", params={"query": "ab", "mode": UserSearchModeEnum.PREFIX.value}, headers=headers
+    )
+
+    assert substring_response.status_code == status.HTTP_400_BAD_REQUEST
+    assert (
+        substring_response.json().get("error")
+        == SearchQueryTooShortException(min_length=get_settings().USERS_SEARCH_SUBSTRING_MIN_LENGTH).message
+    )
+    assert prefix_response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+async def test__search_users__not_permitted(
+    async_db_session: AsyncSession,
+    api_client: AsyncClient,
+) -> None:
+    headers = await _get_admin_headers(async_db_session, role=UserRolesEnum.STAFF)
+
+    response = await api_client.get("/api/v1/users/search", params={"query": "user"}, headers=headers)
+    response_data = response.json()
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert response_data.get("error") == OperationNotPermittedException.message
@@ -1,15 +1,22 @@
+import asyncio
 import calendar
 import datetime as dt
+import os
 import uuid
 
+import alembic.command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
 from jose import jwt
 from sqlalchemy import text
 from sqlalchemy.engine import make_url
 from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
 
 from db.postgres import get_engine
 from schemas.auth import AccessTokenPayloadSchema, RefreshTokenPayloadSchema
-from services.auth import AuthService
+from services.token import TokenVerifier
 from settings import get_settings
 
 
@@ -39,7 +46,7 @@ def get_refresh_token(
     encoded_jwt = jwt.encode(
         claims=token_payload.model_dump(),
         key=settings.TOKEN_PRIVATE_KEY,
-        algorithm=AuthService._jwt_algorithm,
+        algorithm=TokenVerifier._jwt_algorithm,
     )
 
     return encoded_jwt, refresh_token_expires_at
@@ -67,20 +74,28 @@ def get_access_token(
     encoded_jwt = jwt.encode(
         claims=token_payload.model_dump(),
         key=settings.TOKEN_PRIVATE_KEY,
-        algorithm=AuthService._jwt_algorithm,
+        algorithm=TokenVerifier._jwt_algorithm,
     )
 
     return encoded_jwt, access_token_expires_at
 
 
-async def create_database(url: str) -> None:
+# Any constant shared by all test processes: pg_advisory_lock key guarding the template database
+TEMPLATE_DATABASE_LOCK_KEY = 4_240_611
+
+
+async def create_database(url: str, template: str | None = None) -> None:
     url_object = make_url(url)
     database = url_object.database
     url_object = url_object.set(database="postgres")
 
+    statement = f'CREATE DATABASE "{database}" ENCODING "utf8"'
+    if template:
+        statement += f' TEMPLATE "{template}"'
+
     engine = get_engine(url=url_object, isolation_level="AUTOCOMMIT")
     async with engine.begin() as conn:
-        await conn.execute(text(f'CREATE DATABASE "{database}" ENCODING "utf8"'))
+        await conn.execute(text(statement))
 
     await engine.dispose()
 
@@ -124,3 +139,71 @@ async def drop_database(url: str) -> None:
         await conn.execute(text(f'DROP DATABASE "{database}"'))
 
     await engine.dispose()
+
+
+def get_alembic_config(url: str) -> Config:
+    settings = get_settings()
+
+    config = Config(os.path.join(settings.BASE_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(settings.BASE_DIR, "migrations"))
+    config.set_main_option("sqlalchemy.url", url)
+
+    return config
+
+
+async def get_database_comment(url: str) -> str | None:
+    url_object = make_url(url)
+    database = url_object.database
+    url_object = url_object.set(database="postgres")
+
+    # Read from the catalog: a session connected to a template database makes cloning it fail
+    engine = get_engine(url=url_object, isolation_level="AUTOCOMMIT")
+    async with engine.begin() as conn:
+        comment = await conn.scalar(
+            text("SELECT shobj_description(oid, 'pg_database') FROM pg_database WHERE datname = :database"),
+            {"database": database},
+        )
+
+    await engine.dispose()
+
+    return comment
+
+
+async def create_database_from_template(url: str, template_url: str) -> None:
+    """Create the database at ``url`` as a copy of a migrated template database.
+
+    The template survives between runs and is rebuilt only when the migration head changes, which is
+    stored as its comment. Parallel workers serialize on an advisory lock, so exactly one builds it.
+    """
+    config = get_alembic_config(template_url)
+    head_revision = ScriptDirectory.from_config(config).get_current_head()
+    template_database = make_url(template_url).database
+
+    lock_engine = create_async_engine(
+        make_url(url).set(database="postgres"), isolation_level="AUTOCOMMIT", poolclass=NullPool
+    )
+    try:
+        async with lock_engine.connect() as lock_conn:
+            await lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": TEMPLATE_DATABASE_LOCK_KEY})
+            try:
+                if await get_database_comment(template_url) != head_revision:
+                    if await database_exists(template_url):
+                        await drop_database(template_url)
+                    await create_database(template_url)
+
+                    # Alembic runs its own event loop. Downgrading once per migration change keeps downgrades tested
+                    await asyncio.to_thread(alembic.command.upgrade, config, "head")
+                    await asyncio.to_thread(alembic.command.downgrade, config, "base")
+                    await asyncio.to_thread(alembic.command.upgrade, config, "head")
+
+                    await lock_conn.execute(text(f"COMMENT ON DATABASE \"{template_database}\" IS '{head_revision}'"))
+
+                if await database_exists(url):
+                    await drop_database(url)
+                await create_database(url, template=template_database)
+
+            finally:
+                await lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": TEMPLATE_DATABASE_LOCK_KEY})
+
+    finally:
+        await lock_engine.dispose()
@@ -0,0 +1,58 @@
+import hashlib
+import time
+import typing
+
+from starlette import status
+from starlette.responses import Response
+
+from enums import HeaderKeyEnum
+from utils.responses import PydanticResponse
+
+
+def get_etag(*parts: typing.Any) -> str:
+    """Strong entity tag of the values a response is rendered from, without revealing them."""
+    digest = hashlib.blake2b("\x1f".join(map(str, parts)).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def is_etag_matched(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    # If-None-Match uses the weak comparison, so a W/ prefix added by a proxy still matches
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def get_cache_headers(etag: str, expires_at: int, max_age_seconds: int | None = None) -> dict[str, str]:
+    """Headers of a response that may be reused by the caller until the access token expires.
+
+    Responses depend on the access token, so they are private and vary by its header.
+    """
+    max_age = max(0, expires_at - int(time.time()))
+    if max_age_seconds is not None:
+        max_age = min(max_age, max_age_seconds)
+
+    return {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={max_age}",
+        "Vary": HeaderKeyEnum.ACCESS_TOKEN.value,
+    }
+
+
+def get_cached_response(
+    content: typing.Any,
+    etag: str,
+    expires_at: int,
+    if_none_match: str | None,
+    schema: typing.Any = None,
+    max_age_seconds: int | None = None,
+) -> Response:
+    """``304 Not Modified`` when the caller has the current representation, without rendering it."""
+    headers = get_cache_headers(etag, expires_at=expires_at, max_age_seconds=max_age_seconds)
+    if is_etag_matched(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return PydanticResponse(content, schema=schema, headers=headers)
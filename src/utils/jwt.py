@@ -0,0 +1,69 @@
+import base64
+import functools
+import typing
+
+import orjson
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey, RSAPublicKey
+
+
+def base64url_encode(value: bytes) -> bytes:
+    return base64.urlsafe_b64encode(value).replace(b"=", b"")
+
+
+class JwtMinter:
+    """RS256 token signer producing the same bytes as ``jose.jwt.encode``.
+
+    The private key is parsed once and the constant JOSE header is encoded once, so minting a token
+    costs one claims serialization and one RSA signature. Claims are serialized in insertion order
+    without whitespace, which matches python-jose for ASCII claims. The header carries ``key_id`` as
+    ``kid``, with keys sorted like python-jose does, so verifiers can pick the key from a key set.
+    """
+
+    algorithm: str = "RS256"
+
+    def __init__(self, private_key: str, key_id: str | None = None) -> None:
+        loaded_key = serialization.load_pem_private_key(private_key.encode(), password=None)
+        if not isinstance(loaded_key, RSAPrivateKey):
+            raise ValueError("Private key is not an RSA key")
+
+        header = {"alg": self.algorithm, "typ": "JWT"}
+        if key_id is not None:
+            header["kid"] = key_id
+
+        self._private_key = loaded_key
+        self._encoded_header = base64url_encode(orjson.dumps(header, option=orjson.OPT_SORT_KEYS))
+
+    def encode(self, claims: dict[str, typing.Any]) -> str:
+        signing_input = self._encoded_header + b"." + base64url_encode(orjson.dumps(claims))
+        signature = self._private_key.sign(signing_input, padding.PKCS1v15(), hashes.SHA256())
+
+        return (signing_input + b"." + base64url_encode(signature)).decode()
+
+
+@functools.lru_cache(maxsize=1)
+def get_jwt_minter(private_key: str, key_id: str | None = None) -> JwtMinter:
+    return JwtMinter(private_key=private_key, key_id=key_id)
+
+
+@functools.lru_cache(maxsize=8)
+def get_public_jwk(public_key: str, key_id: str) -> dict[str, str]:
+    """JWK (RFC 7517) of an RSA public key in PEM, the form the key set endpoint publishes."""
+    loaded_key = serialization.load_pem_public_key(public_key.encode())
+    if not isinstance(loaded_key, RSAPublicKey):
+        raise ValueError("Public key is not an RSA key")
+
+    public_numbers = loaded_key.public_numbers()
+    return {
+        "kty": "RSA",
+        "use": "sig",
+        "alg": JwtMinter.algorithm,
+        "kid": key_id,
+        "n": _encode_jwk_integer(public_numbers.n),
+        "e": _encode_jwk_integer(public_numbers.e),
+    }
+
+
+def _encode_jwk_integer(value: int) -> str:
+    return base64url_encode(value.to_bytes((value.bit_length() + 7) // 8, "big")).decode()
@@ -0,0 +1,206 @@
+import math
+import time
+import typing
+
+from fastapi.responses import ORJSONResponse
+from loguru import logger
+from redis.exceptions import RedisError
+from starlette import status
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from db.redis import get_redis_connection
+from db.repositories.rate_limit import RateLimitRepository
+from exceptions import RateLimitExceededException
+from monitoring.metrics import CACHE_REQUESTS_TOTAL, UNMATCHED_ROUTE
+from schemas.rate_limit import RateLimitRuleSchema
+from settings import Settings
+
+RATE_LIMIT_HEADERS = ("RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset", "RateLimit-Policy", "Retry-After")
+
+# Leases of clients that have gone quiet are dropped once the table grows past this size
+MAX_LOCAL_LEASES = 10_000
+
+
+class LocalLease:
+    """Tokens taken from the shared Redis bucket ahead of time, spent by this process without a round trip."""
+
+    __slots__ = ("tokens", "expires_at", "remaining", "reset_at", "denied_until")
+
+    def __init__(self, tokens: int, expires_at: float, remaining: float, reset_at: float, denied_until: float) -> None:
+        self.tokens = tokens
+        self.expires_at = expires_at
+        self.remaining = remaining
+        self.reset_at = reset_at
+        self.denied_until = denied_until
+
+
+class RateLimitDecision(typing.NamedTuple):
+    is_allowed: bool
+    remaining: int
+    reset_seconds: float
+    retry_after_seconds: float
+
+
+class RateLimiter:
+    """Token buckets shared by all workers in Redis, fronted by a per-process lease table.
+
+    A Redis call takes up to ``local_share * capacity`` tokens at once, and the following requests spend
+    them locally until the lease runs out or expires after ``lease_seconds``. A denial is cached until the
+    bucket has a token again, so a flood from one client is rejected without touching Redis either.
+    The global limit is never exceeded: leased tokens are already taken from the shared bucket.
+    """
+
+    def __init__(self, repository: RateLimitRepository, local_share: float, lease_seconds: float) -> None:
+        self._repository = repository
+        self._local_share = local_share
+        self._lease_seconds = lease_seconds
+
+        self._leases: dict[str, LocalLease] = {}
+
+    async def acquire(self, bucket: str, rule: RateLimitRuleSchema) -> RateLimitDecision:
+        now = time.monotonic()
+
+        lease = self._leases.get(bucket)
+        if lease is not None:
+            if now < lease.denied_until:
+                CACHE_REQUESTS_TOTAL.labels("rate_limit_lease", "hit").inc()
+                return RateLimitDecision(False, 0, lease.reset_at - now, lease.denied_until - now)
+
+            if lease.tokens > 0 and now < lease.expires_at:
+                CACHE_REQUESTS_TOTAL.labels("rate_limit_lease", "hit").inc()
+                lease.tokens -= 1
+                return RateLimitDecision(True, int(lease.remaining) + lease.tokens, max(lease.reset_at - now, 0), 0)
+
+        CACHE_REQUESTS_TOTAL.labels("rate_limit_lease", "miss").inc()
+
+        requested = max(1, int(rule.capacity * self._local_share))
+        grant = await self._repository.acquire(bucket=bucket, rule=rule, requested=requested)
+
+        if len(self._leases) >= MAX_LOCAL_LEASES:
+            self._drop_expired_leases(now)
+
+        if grant.granted == 0:
+            self._leases[bucket] = LocalLease(
+                tokens=0,
+                expires_at=now,
+                remaining=grant.remaining,
+                reset_at=now + grant.reset_seconds,
+                denied_until=now + grant.retry_after_seconds,
+            )
+            return RateLimitDecision(False, 0, grant.reset_seconds, grant.retry_after_seconds)
+
+        self._leases[bucket] = LocalLease(
+            tokens=grant.granted - 1,
+            expires_at=now + self._lease_seconds,
+            remaining=grant.remaining,
+            reset_at=now + grant.reset_seconds,
+            denied_until=0,
+        )
+        return RateLimitDecision(True, int(grant.remaining) + grant.granted - 1, grant.reset_seconds, 0)
+
+    def _drop_expired_leases(self, now: float) -> None:
+        self._leases = {
+            bucket: lease
+            for bucket, lease in self._leases.items()
+            if lease.expires_at > now or lease.denied_until > now
+        }
+
+
+class RateLimitMiddleware:
+    """Per-client, per-route token bucket limits with ``RateLimit-*`` response headers.
+
+    The route template is resolved from ``routes`` the same way the router does, so ``/users/{user_uuid}``
+    is one bucket per client whatever the uuid. Requests are let through if Redis is unavailable.
+
+    The client is the peer address, or with ``trusted_proxy_hops`` the ``X-Forwarded-For`` entry added by the
+    outermost trusted proxy; entries left of it can be set by the client and are ignored. Added inside the
+    CORS middleware, so rejections carry CORS headers and preflights are answered before reaching it.
+    """
+
+    def __init__(self, app: ASGIApp, routes: typing.Sequence[BaseRoute], settings: Settings) -> None:
+        self.app = app
+        self._routes = routes
+
+        self._default_rule = RateLimitRuleSchema.from_string(settings.RATE_LIMIT_DEFAULT)
+        self._route_rules = {
+            path: RateLimitRuleSchema.from_string(rule) for path, rule in settings.RATE_LIMIT_ROUTES.items()
+        }
+        self._exempt_routes = frozenset(settings.RATE_LIMIT_EXEMPT_ROUTES)
+        self._trusted_proxy_hops = settings.RATE_LIMIT_TRUSTED_PROXY_HOPS
+
+        self._rate_limiter = RateLimiter(
+            repository=RateLimitRepository(redis_client=get_redis_connection()),
+            local_share=settings.RATE_LIMIT_LOCAL_SHARE,
+            lease_seconds=settings.RATE_LIMIT_LOCAL_LEASE_SECONDS,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = self._get_route(scope)
+        route_path = getattr(route, "path", UNMATCHED_ROUTE)
+        if route_path in self._exempt_routes:
+            await self.app(scope, receive, send)
+            return
+
+        rule = self._route_rules.get(route_path, self._default_rule)
+        client_host = self._get_client_host(scope)
+
+        try:
+            decision = await self._rate_limiter.acquire(bucket=f"{route_path}:{client_host}", rule=rule)
+
+        except RedisError as e:
+            logger.error("Rate limit check failed", event="rate_limit.redis_error", error=str(e))
+            await self.app(scope, receive, send)
+            return
+
+        headers = {
+            "RateLimit-Limit": str(rule.capacity),
+            "RateLimit-Remaining": str(decision.remaining),
+            "RateLimit-Reset": str(math.ceil(decision.reset_seconds)),
+            "RateLimit-Policy": f"{rule.capacity};w={rule.period_seconds:g}",
+        }
+
+        if not decision.is_allowed:
+            # Lets the outer middlewares label the rejected request by its route template
+            if route is not None:
+                scope["route"] = route
+
+            headers["Retry-After"] = str(math.ceil(decision.retry_after_seconds))
+            response = ORJSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={"error": RateLimitExceededException.message},
+                headers=headers,
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                for key, value in headers.items():
+                    response_headers.append(key, value)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _get_client_host(self, scope: Scope) -> str:
+        if self._trusted_proxy_hops:
+            forwarded_for = Headers(scope=scope).get("x-forwarded-for", "")
+            hosts = [host.strip() for host in forwarded_for.split(",") if host.strip()]
+            if len(hosts) >= self._trusted_proxy_hops:
+                return hosts[-self._trusted_proxy_hops]
+
+        return scope["client"][0] if scope.get("client") else "unknown"
+
+    def _get_route(self, scope: Scope) -> BaseRoute | None:
+        for route in self._routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route
+
+        return None
@@ -0,0 +1,46 @@
+import functools
+import typing
+
+from pydantic import BaseModel, TypeAdapter
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+from monitoring.tracing import tracer
+
+
+@functools.lru_cache
+def get_type_adapter(schema: typing.Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+class PydanticResponse(Response):
+    """JSON response rendered by pydantic-core straight to bytes.
+
+    A pydantic model is dumped as is. Anything else (ORM objects, lists of them) needs a ``schema``: it is
+    validated once into it and dumped, which replaces FastAPI's response_model validation, ``dump_python``
+    and JSON encoding. Endpoints returning it keep ``response_model`` only for the OpenAPI schema.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: typing.Any,
+        schema: typing.Any = None,
+        status_code: int = 200,
+        headers: typing.Mapping[str, str] | None = None,
+        background: BackgroundTask | None = None,
+    ) -> None:
+        self._schema = schema
+        super().__init__(content=content, status_code=status_code, headers=headers, background=background)
+
+    def render(self, content: typing.Any) -> bytes:
+        with tracer.start_as_current_span("PydanticResponse.render"):
+            if self._schema is None:
+                if not isinstance(content, BaseModel):
+                    raise TypeError(f"{type(content).__name__} content needs a schema to be rendered")
+
+                return content.__pydantic_serializer__.to_json(content)
+
+            type_adapter = get_type_adapter(self._schema)
+            return type_adapter.dump_json(type_adapter.validate_python(content, from_attributes=True))
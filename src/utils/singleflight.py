@@ -0,0 +1,36 @@
+import asyncio
+import typing
+
+from monitoring.metrics import SINGLEFLIGHT_CALLS_TOTAL
+
+Key = typing.TypeVar("Key", bound=typing.Hashable)
+Result = typing.TypeVar("Result")
+
+
+class SingleFlight(typing.Generic[Key, Result]):
+    """Coalesces concurrent calls with the same key into one in-flight awaitable.
+
+    The first caller starts the call as a task, callers arriving before it finishes await the same task and
+    get the same result or exception. Nothing is cached: once the task is done the next call runs again.
+    The task is shielded, so a cancelled caller does not cancel the call for the others.
+
+    Results are shared between callers (and requests), so they must be treated as read-only.
+    """
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._calls: dict[Key, asyncio.Task[Result]] = {}
+
+    async def do(self, key: Key, func: typing.Callable[[], typing.Awaitable[Result]]) -> Result:
+        task = self._calls.get(key)
+        if task is not None:
+            SINGLEFLIGHT_CALLS_TOTAL.labels(self._name, "coalesced").inc()
+            return await asyncio.shield(task)
+
+        SINGLEFLIGHT_CALLS_TOTAL.labels(self._name, "leader").inc()
+
+        task = asyncio.ensure_future(func())
+        self._calls[key] = task
+        task.add_done_callback(lambda _: self._calls.pop(key, None))
+
+        return await asyncio.shield(task)
@@ -0,0 +1,55 @@
+import os
+import threading
+import time
+import uuid
+
+_lock = threading.Lock()
+_last_timestamp_ms = 0
+_counter = 0
+
+_COUNTER_BITS = 12
+_COUNTER_MAX = (1 << _COUNTER_BITS) - 1
+
+
+def uuid7() -> uuid.UUID:
+    """Time-ordered UUID (RFC 9562, version 7).
+
+    The 48-bit millisecond timestamp keeps new primary keys on the right-most B-tree pages. The 12-bit
+    ``rand_a`` field is used as a counter, so ids generated within the same millisecond stay monotonic.
+    """
+    global _last_timestamp_ms, _counter
+
+    with _lock:
+        timestamp_ms = time.time_ns() // 1_000_000
+        if timestamp_ms > _last_timestamp_ms:
+            _last_timestamp_ms = timestamp_ms
+            # Random start leaves room to increment and keeps ids unpredictable within a millisecond
+            _counter = int.from_bytes(os.urandom(2)) & (_COUNTER_MAX >> 1)
+        elif _counter < _COUNTER_MAX:
+            _counter += 1
+        else:
+            # Counter exhausted or clock moved backwards: borrow the next millisecond
+            _last_timestamp_ms += 1
+            _counter = 0
+
+        timestamp_ms, counter = _last_timestamp_ms, _counter
+
+    return _build_uuid7(timestamp_ms, rand_a=counter, rand_b=int.from_bytes(os.urandom(8)))
+
+
+def uuid7_at(timestamp_ms: int, rand: int) -> uuid.UUID:
+    """Version 7 UUID for an arbitrary millisecond timestamp, e.g. for backdated synthetic rows.
+
+    ``rand`` fills the 74 random bits; unlike ``uuid7`` ids within one millisecond are not monotonic.
+    """
+    return _build_uuid7(timestamp_ms, rand_a=rand >> 62, rand_b=rand)
+
+
+def _build_uuid7(timestamp_ms: int, rand_a: int, rand_b: int) -> uuid.UUID:
+    value = (timestamp_ms & ((1 << 48) - 1)) << 80
+    value |= 0x7 << 76
+    value |= (rand_a & _COUNTER_MAX) << 64
+    value |= 0b10 << 62
+    value |= rand_b & ((1 << 62) - 1)
+
+    return uuid.UUID(int=value)